@@ -0,0 +1,46 @@
+# core/backoff.py
+
+"""
+Exponential Backoff - Capped exponential retry delays with full jitter.
+
+Full jitter draws each delay uniformly from [0, min(cap, base * factor^attempt)],
+so many clients failing at the same moment (e.g. 30 cameras on one NVR after a
+network blip) spread their retries out instead of reconnecting in lock-step.
+
+Author: ItsOji Team
+"""
+
+import random
+
+
+class ExponentialBackoff:
+    def __init__(self, base=1.0, cap=60.0, factor=2.0, max_attempts=0, rng=None):
+        """
+        :param base: Delay ceiling of the first retry, in seconds
+        :param cap: Upper bound of any single delay, in seconds
+        :param factor: Growth of the delay ceiling per attempt
+        :param max_attempts: Give up after this many retries (0 = retry forever)
+        :param rng: Optional random.Random for deterministic tests
+        """
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.max_attempts = max_attempts
+        self.rng = rng or random.Random()
+        self.attempt = 0
+
+    def ceiling(self):
+        """Upper bound of the delay the next call to next_delay() can return."""
+        return min(self.cap, self.base * (self.factor ** self.attempt))
+
+    def next_delay(self):
+        """Return the next jittered delay in seconds and advance the attempt counter."""
+        delay = self.rng.uniform(0, self.ceiling())
+        self.attempt += 1
+        return delay
+
+    def exhausted(self):
+        return bool(self.max_attempts) and self.attempt >= self.max_attempts
+
+    def reset(self):
+        self.attempt = 0
@@ -3,8 +3,15 @@ import threading
 import time
 import platform
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from core.crash_logger import log_exception
+from core.backoff import ExponentialBackoff
+from core.capture_metrics import CaptureMetrics
+from core.industrial_camera import CameraStatus
+from core.frame_buffer import FrameRingBuffer, EMPTY_SEQ
+from core.shm_transport import SharedFrameRingBuffer
 
 
 def auto_backend(source):
@@ -15,21 +22,38 @@ def auto_backend(source):
     return cv2.CAP_ANY
 
 
-def find_working_webcams(max_index=5):
-    working = []
-    for idx in range(max_index):
-        cap = cv2.VideoCapture(idx)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                print(f"[AutoDetect] ✅ Found working webcam at index {idx}")
-                working.append(idx)
-            else:
-                print(f"[AutoDetect] ❌ No frame from index {idx}")
-            cap.release()
-        else:
+def _timeout_params(timeout_ms):
+    """Open/read timeouts understood by the FFMPEG, MSMF and GStreamer backends."""
+    return [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout_ms), cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(timeout_ms)]
+
+
+def _probe_webcam(idx, timeout_ms):
+    cap = cv2.VideoCapture(idx, cv2.CAP_ANY, _timeout_params(timeout_ms))
+    try:
+        if not cap.isOpened():
             print(f"[AutoDetect] ❌ Camera at index {idx} not opened")
-    return working
+            return False
+        ret, frame = cap.read()
+        if ret and frame is not None:
+            print(f"[AutoDetect] ✅ Found working webcam at index {idx}")
+            return True
+        print(f"[AutoDetect] ❌ No frame from index {idx}")
+        return False
+    finally:
+        cap.release()
+
+
+def find_working_webcams(max_index=5, timeout=5.0):
+    """Probe USB indexes concurrently; indexes still probing after `timeout` seconds are skipped."""
+    if max_index <= 0:
+        return []
+    pool = ThreadPoolExecutor(max_workers=max_index, thread_name_prefix="webcam-probe")
+    futures = {pool.submit(_probe_webcam, idx, timeout * 1000): idx for idx in range(max_index)}
+    done, pending = wait(futures, timeout=timeout)
+    pool.shutdown(wait=False)
+    for future in pending:
+        print(f"[AutoDetect] ⏱ Camera at index {futures[future]} timed out after {timeout}s")
+    return sorted(futures[f] for f in done if not f.exception() and f.result())
 
 
 def load_ip_cameras_from_config(config_path="config/default_settings.json"):
@@ -45,8 +69,41 @@ def load_ip_cameras_from_config(config_path="config/default_settings.json"):
         return []
 
 
+DEFAULT_CAPTURE_SETTINGS = {
+    "decode_width": 0,   # 0 = native stream resolution
+    "decode_height": 0,
+    "grab_skip": 0,      # frames grabbed (not decoded to BGR) between retrieved frames
+    "max_fps": 0,        # 0 = unlimited
+    "reconnect_base_s": 1.0,
+    "reconnect_cap_s": 60.0,
+    "max_reconnect_attempts": 0  # 0 = keep retrying forever
+}
+
+
+def load_capture_settings(config_path="config/default_settings.json"):
+    """Read the `capture_settings` block ({"default": {...}, "cameras": {cam_id: {...}}})."""
+    if not Path(config_path).exists():
+        return {}
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        return config.get("capture_settings", {})
+    except Exception as e:
+        print(f"[Config] ❌ Failed to load capture_settings: {e}")
+        return {}
+
+
+def resolve_capture_settings(capture_settings, source_id):
+    """Merge built-in defaults, the site default and the per-camera override."""
+    resolved = dict(DEFAULT_CAPTURE_SETTINGS)
+    resolved.update(capture_settings.get("default", {}))
+    resolved.update(capture_settings.get("cameras", {}).get(str(source_id), {}))
+    return resolved
+
+
 class CameraStream:
-    def __init__(self, source_id, source_type, source_value):
+    def __init__(self, source_id, source_type, source_value, buffer_size=4, shared_memory=False,
+                 capture_settings=None, open_timeout=10.0):
         self.source_id = source_id
         self.source_type = source_type
 
@@ -57,18 +114,67 @@ class CameraStream:
 
         self.capture = None
         self.running = False
-        self.frame = None
+        # Shared-memory slabs let inference worker processes read frames zero-copy
+        self.buffer = SharedFrameRingBuffer(buffer_size) if shared_memory else FrameRingBuffer(buffer_size)
         self.thread = None
 
+        settings = dict(DEFAULT_CAPTURE_SETTINGS)
+        settings.update(capture_settings or {})
+        self.capture_settings = settings
+        w, h = int(settings["decode_width"]), int(settings["decode_height"])
+        self.decode_size = (w, h) if w > 0 and h > 0 else None
+        self.grab_skip = max(0, int(settings["grab_skip"]))
+        max_fps = float(settings["max_fps"])
+        self.min_frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._scratch = None  # Reused native-resolution decode target when downscaling
+        self.open_timeout = open_timeout
+
+        # Supervision: reconnect with capped exponential backoff + full jitter
+        self.backoff = ExponentialBackoff(
+            base=float(settings["reconnect_base_s"]),
+            cap=float(settings["reconnect_cap_s"]),
+            max_attempts=int(settings["max_reconnect_attempts"])
+        )
+        self.max_failed_reads = 50
+        self.status = CameraStatus.DISCONNECTED
+        self.status_history = deque(maxlen=50)  # (timestamp, CameraStatus)
+        self.status_listeners = []
+        self.reconnect_count = 0
+        self._stop_event = threading.Event()
+        self.metrics = CaptureMetrics()
+
     def start(self):
         if self.running:
             print(f"[Camera {self.source_id}] Already running.")
             return
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self.update_frames, daemon=True)
         self.thread.start()
 
-    def update_frames(self):
+    def add_status_listener(self, callback):
+        """Register callback(source_id, old_status, new_status); called from the capture thread."""
+        self.status_listeners.append(callback)
+
+    def _set_status(self, status):
+        old = self.status
+        if old == status:
+            return
+        self.status = status
+        self.status_history.append((time.time(), status))
+        print(f"[Camera {self.source_id}] {old.name} → {status.name}")
+        for callback in list(self.status_listeners):
+            try:
+                callback(self.source_id, old, status)
+            except Exception as e:
+                log_exception(e, context="Camera status listener failed", extra_info={"camera_id": self.source_id})
+
+    def open_capture(self):
+        """
+        Open the video source with bounded open/read timeouts.
+
+        :return: True if the capture is open; the handle is kept for update_frames().
+        """
         # Use FFMPEG for IP/NVR streams, DSHOW for USB, fallback to CAP_ANY
         if self.source_type == "ip":
             backend = cv2.CAP_FFMPEG
@@ -78,118 +184,370 @@ class CameraStream:
             backend = cv2.CAP_ANY
 
         print(f"[Camera {self.source_id}] Attempting backend: {backend}")
+        params = _timeout_params(self.open_timeout * 1000)
 
-        self.capture = cv2.VideoCapture(self.source_value, backend)
+        self.capture = cv2.VideoCapture(self.source_value, backend, params)
         self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         if not self.capture.isOpened():
             print(f"[Camera {self.source_id}] ❌ Initial backend failed. Trying CAP_ANY...")
-            self.capture = cv2.VideoCapture(self.source_value, cv2.CAP_ANY)
+            self.capture = cv2.VideoCapture(self.source_value, cv2.CAP_ANY, params)
 
         if not self.capture.isOpened():
             print(f"[Camera {self.source_id}] ❌ Failed to open video stream for {self.source_id}")
-            self.running = False
-            return
+            return False
 
         print(f"[Camera {self.source_id}] ✅ Successfully opened using backend: {backend}")
+        self._apply_decode_size()
+        return True
+
+    def update_frames(self):
+        """Supervised capture loop: stream until the source fails, then reconnect with backoff."""
+        # Attached after a failed initial connect: back off before trying again
+        if self.status == CameraStatus.RECONNECTING and not self._wait_before_reconnect("initial connect failed"):
+            self.running = False
+        while self.running:
+            # Sources attached by CameraManager.connect_async arrive already opened
+            if not (self.capture is not None and self.capture.isOpened()):
+                if not self.open_capture():
+                    if not self._wait_before_reconnect("open failed"):
+                        break
+                    continue
+            self._set_status(CameraStatus.CONNECTED)
+
+            self._stream()
+            if self.capture:
+                self.capture.release()
+                self.capture = None
+            if self.running and not self._wait_before_reconnect("stream lost"):
+                break
 
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+        if self.status != CameraStatus.FAULT:
+            self._set_status(CameraStatus.DISCONNECTED)
+        self.running = False
+        print(f"[Camera {self.source_id}] Capture thread stopped.")
+
+    def _wait_before_reconnect(self, reason):
+        """Sleep for the next backoff delay. Returns False if the stream should give up."""
+        if self.backoff.exhausted():
+            self._set_status(CameraStatus.FAULT)
+            log_exception(
+                context=f"Camera gave up after {self.backoff.attempt} reconnect attempts",
+                extra_info={"camera_id": self.source_id, "type": self.source_type, "source": self.source_value}
+            )
+            return False
+        self._set_status(CameraStatus.RECONNECTING)
+        delay = self.backoff.next_delay()
+        self.reconnect_count += 1
+        print(f"[Camera {self.source_id}] 🔁 {reason}; reconnecting in {delay:.1f}s (attempt {self.backoff.attempt})")
+        return not self._stop_event.wait(delay)
+
+    def _stream(self):
+        """Read frames until `max_failed_reads` consecutive failures, an exception, or stop()."""
         frame_attempts = 0
         first_frame_logged = False
+        last_retrieved = 0.0
 
         while self.running:
             try:
-                ret, frame = self.capture.read()
+                # Over the FPS cap: keep the stream drained with grab() but skip retrieve()
+                if self.min_frame_interval and time.time() - last_retrieved < self.min_frame_interval:
+                    started = time.perf_counter()
+                    if self.capture.grab():
+                        continue
+                    self.metrics.record_read(time.perf_counter() - started, False)
+                    ret, frame = False, None
+                else:
+                    for _ in range(self.grab_skip):
+                        self.capture.grab()
+                    started = time.perf_counter()
+                    ret, frame = self._read_frame()
+                    ok = ret and frame is not None
+                    self.metrics.record_read(time.perf_counter() - started, ok, frame.nbytes if ok else 0)
                 if ret and frame is not None:
-                    self.frame = frame
+                    self.buffer.commit(frame)
+                    last_retrieved = time.time()
                     frame_attempts = 0
                     if not first_frame_logged:
                         print(f"[Camera {self.source_id}] ✅ First frame captured.")
                         first_frame_logged = True
+                        self.backoff.reset()
+                        self._set_status(CameraStatus.STREAMING)
                 else:
                     frame_attempts += 1
                     if frame_attempts == 10:
                         print(f"[Camera {self.source_id}] ⚠️ Retried 10 times. Still no frame.")
-                    elif frame_attempts >= 50:
+                    elif frame_attempts >= self.max_failed_reads:
                         log_exception(
-                            context="Camera stopped after 50 failed frame reads",
+                            context=f"Camera stream lost after {self.max_failed_reads} failed frame reads",
                             extra_info={"camera_id": self.source_id, "type": self.source_type, "source": self.source_value}
                         )
-                        break
-                    time.sleep(0.1)
+                        return
+                    self._stop_event.wait(0.1)
             except Exception as e:
                 log_exception(
                     e,
                     context="Exception during camera read loop",
                     extra_info={"camera_id": self.source_id}
                 )
-                break
+                return
 
-        if self.capture:
-            self.capture.release()
-        print(f"[Camera {self.source_id}] Capture thread stopped.")
+    def _apply_decode_size(self):
+        """Ask the driver to decode at the configured size (honoured by most USB/V4L2/DSHOW sources)."""
+        if not self.decode_size:
+            return
+        w, h = self.decode_size
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+
+    def _read_frame(self):
+        """Read one frame straight into the next ring slot, downscaling if the source ignored decode_size."""
+        slot = self.buffer.next_slot()
+        if not self.decode_size:
+            return self.capture.read(slot) if slot is not None else self.capture.read()
+
+        w, h = self.decode_size
+        if slot is not None and slot.shape[:2] == (h, w) and self._scratch is None:
+            ret, frame = self.capture.read(slot)
+            if not ret or frame is None or frame.shape[:2] == (h, w):
+                return ret, frame
+        else:
+            ret, frame = self.capture.read(self._scratch) if self._scratch is not None else self.capture.read()
+            if not ret or frame is None:
+                return ret, frame
+            if frame.shape[:2] == (h, w):
+                return ret, frame
+
+        # Source decodes at native resolution (typical for RTSP): downscale into the ring slot
+        self._scratch = frame
+        if slot is not None and slot.shape[:2] == (h, w) and slot.shape[2:] == frame.shape[2:]:
+            return ret, cv2.resize(frame, (w, h), dst=slot, interpolation=cv2.INTER_AREA)
+        return ret, cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
 
     def stop(self):
         self.running = False
+        self._stop_event.set()
         if self.thread:
             try:
                 self.thread.join(timeout=3)
             except RuntimeError:
                 print(f"[Camera {self.source_id}] ⚠️ Could not join thread cleanly.")
+        if isinstance(self.buffer, SharedFrameRingBuffer) and not (self.thread and self.thread.is_alive()):
+            self.buffer.close()
+
+    @property
+    def frame(self):
+        return self.buffer.get_frame()
+
+    @property
+    def latest_seq(self):
+        return self.buffer.latest_seq
 
     def get_frame(self):
-        return self.frame
+        return self.buffer.get_frame()
 
+    def get_latest(self, since_seq=EMPTY_SEQ, copy=False):
+        """Return FramePacket(seq, timestamp, frame) newer than since_seq, or None."""
+        return self.buffer.get_latest(since_seq, copy)
 
-class CameraManager:
-    def __init__(self):
-        self.cameras = {}
+    def is_current(self, seq):
+        """True while frame `seq` has not been overwritten in the ring."""
+        return self.buffer.is_current(seq)
 
-    def auto_initialize_all_cameras(self, webcam_max=4):
-        print("[CameraManager] 🔍 Auto-initialising all cameras...")
+    def describe_buffer(self):
+        """Shared-memory attach descriptor for worker processes (None if not shared or no frame yet)."""
+        if isinstance(self.buffer, SharedFrameRingBuffer):
+            return self.buffer.describe()
+        return None
 
-        ip_cameras = load_ip_cameras_from_config()
-        for i, url in enumerate(ip_cameras):
-            self.add_camera(f"ip_{i}", "ip", url)
 
-        usb_indexes = find_working_webcams(webcam_max)
-        for i, idx in enumerate(usb_indexes):
-            self.add_camera(f"usb_{i}", "usb", idx)
+class CameraManager:
+    def __init__(self, shared_memory=False, capture_settings=None):
+        self.cameras = {}
+        self.shared_memory = shared_memory
+        self.capture_settings = capture_settings if capture_settings is not None else load_capture_settings()
+        self.lock = threading.Lock()
+        self.generation = 0      # Bumped whenever cameras are attached/removed so views can refresh
+        self.startup_report = {}  # cam_id → {"source", "status", "elapsed_s"}
+
+    def auto_initialize_all_cameras(self, webcam_max=4, timeout=10.0, wait_for_all=True):
+        """
+        Discover and open all configured IP cameras and USB webcams concurrently.
+
+        USB indexes are probed in parallel first (up to `timeout` seconds), then
+        each source gets `timeout` seconds to connect. With wait_for_all=False this
+        returns immediately and cameras attach in the background as they connect.
+        """
+        print("[CameraManager] 🔍 Auto-initialising all cameras...")
 
-        if not self.cameras:
+        if wait_for_all:
+            self._discover(webcam_max, timeout)
+        else:
+            threading.Thread(target=self._discover, args=(webcam_max, timeout), daemon=True).start()
+
+    def _discover(self, webcam_max, timeout):
+        sources = [(f"ip_{i}", "ip", url) for i, url in enumerate(load_ip_cameras_from_config())]
+        # Working webcams are numbered in index order (usb_0, usb_1, ...) whatever their OS index
+        sources += [(f"usb_{i}", "usb", idx) for i, idx in enumerate(find_working_webcams(webcam_max, timeout))]
+        return self.connect_async(sources, timeout=timeout, wait_for_all=True)
+
+    def connect_async(self, sources, timeout=10.0, wait_for_all=False):
+        """
+        Open (source_id, source_type, source_value) sources on a thread pool and
+        attach each one the moment it connects. Returns the startup report.
+        """
+        if not sources:
+            return self.startup_report
+        started = time.time()
+        for source_id, _, source_value in sources:
+            self.startup_report[source_id] = {"source": str(source_value), "status": "connecting", "elapsed_s": None}
+
+        pool = ThreadPoolExecutor(max_workers=min(32, len(sources)), thread_name_prefix="camera-connect")
+        futures = [pool.submit(self._connect_source, *source, timeout) for source in sources]
+        pool.shutdown(wait=False)
+        if not wait_for_all:
+            return self.startup_report
+
+        wait(futures, timeout=timeout + 1.0)
+        source_ids = [source[0] for source in sources]
+        for source_id in source_ids:
+            entry = self.startup_report[source_id]
+            if entry["status"] == "connecting":
+                entry["status"] = "timeout"  # Still attaches later if the source eventually answers
+        self._print_startup_report(source_ids, time.time() - started)
+        return self.startup_report
+
+    def _connect_source(self, source_id, source_type, source_value, timeout):
+        started = time.time()
+        cam = self._create_stream(source_id, source_type, source_value, open_timeout=timeout)
+        try:
+            opened = cam.open_capture()
+            if opened and source_type == "usb":
+                # A USB index can open without delivering frames; don't attach dead indexes
+                ret, frame = cam.capture.read()
+                opened = ret and frame is not None
+                if not opened:
+                    cam.capture.release()
+        except Exception as e:
+            log_exception(e, context="Camera connect failed", extra_info={"camera_id": source_id})
+            opened = False
+
+        entry = self.startup_report.setdefault(source_id, {"source": str(source_value)})
+        entry["elapsed_s"] = round(time.time() - started, 2)
+        if opened:
+            entry["status"] = "attached"
+            self._attach(cam)
+        elif source_type != "usb":
+            # Configured network sources stay attached and keep reconnecting in the background
+            entry["status"] = "retrying"
+            if cam.capture is not None:
+                cam.capture.release()
+                cam.capture = None
+            cam._set_status(CameraStatus.RECONNECTING)
+            self._attach(cam)
+        else:
+            entry["status"] = "failed"
+
+    def _print_startup_report(self, source_ids, elapsed):
+        attached = [cid for cid in source_ids if self.startup_report[cid]["status"] == "attached"]
+        print(f"[CameraManager] ⏱ Discovery finished in {elapsed:.1f}s — {len(attached)}/{len(source_ids)} attached")
+        for cam_id in source_ids:
+            entry = self.startup_report[cam_id]
+            print(f" - {cam_id}: {entry['status']} ({entry['elapsed_s']}s) {entry['source']}")
+        if not attached:
             print("[CameraManager] ⚠️ No cameras successfully initialized.")
 
-        print(f"[CameraManager] ✅ Total cameras initialized: {len(self.cameras)}")
-        for cam_id in self.cameras:
-            print(f" - Camera ID: {cam_id}")
+    def _create_stream(self, source_id, source_type, source_value, open_timeout=10.0):
+        return CameraStream(
+            source_id, source_type, source_value,
+            shared_memory=self.shared_memory,
+            capture_settings=resolve_capture_settings(self.capture_settings, source_id),
+            open_timeout=open_timeout
+        )
+
+    def _attach(self, cam):
+        with self.lock:
+            if cam.source_id in self.cameras:
+                print(f"[CameraManager] Camera {cam.source_id} already exists.")
+                return False
+            self.cameras[cam.source_id] = cam
+            self.generation += 1
+        cam.start()
+        print(f"[CameraManager] 📷 Camera {cam.source_id} attached.")
+        return True
 
     def add_camera(self, source_id, source_type, source_value):
         if source_id in self.cameras:
             print(f"[CameraManager] Camera {source_id} already exists.")
             return
-        cam = CameraStream(source_id, source_type, source_value)
-        self.cameras[source_id] = cam
-        cam.start()
+        self._attach(self._create_stream(source_id, source_type, source_value))
 
     def remove_camera(self, source_id):
-        if source_id in self.cameras:
-            self.cameras[source_id].stop()
-            del self.cameras[source_id]
+        with self.lock:
+            cam = self.cameras.pop(source_id, None)
+            if cam:
+                self.generation += 1
+        if cam:
+            cam.stop()
             print(f"[CameraManager] Camera {source_id} removed.")
 
-    def get_frame(self, source):
+    def _resolve(self, source):
         if isinstance(source, int):
             cam_keys = list(self.cameras.keys())
             if source < len(cam_keys):
-                return self.cameras[cam_keys[source]].get_frame()
-        elif isinstance(source, str) and source in self.cameras:
-            return self.cameras[source].get_frame()
+                return self.cameras[cam_keys[source]]
+        elif isinstance(source, str):
+            return self.cameras.get(source)
         return None
 
+    def get_frame(self, source):
+        cam = self._resolve(source)
+        return cam.get_frame() if cam else None
+
+    def get_latest(self, source, since_seq=EMPTY_SEQ, copy=False):
+        """
+        Return the newest FramePacket for a camera if newer than since_seq, else None.
+
+        Without `copy` the frame is a view into the ring: check is_current() after reading it.
+        """
+        cam = self._resolve(source)
+        return cam.get_latest(since_seq, copy) if cam else None
+
+    def is_current(self, source, seq):
+        """True while frame `seq` of a camera has not been overwritten in its ring."""
+        cam = self._resolve(source)
+        return bool(cam and cam.is_current(seq))
+
+    def describe_buffer(self, source):
+        cam = self._resolve(source)
+        return cam.describe_buffer() if cam else None
+
+    def get_metrics(self):
+        """Return {cam_id: capture metrics snapshot} including status and reconnect count."""
+        metrics = {}
+        for cam_id, cam in list(self.cameras.items()):
+            snapshot = cam.metrics.snapshot()
+            snapshot["status"] = cam.status.name
+            snapshot["reconnects"] = cam.reconnect_count
+            metrics[cam_id] = snapshot
+        return metrics
+
+    def get_status(self):
+        """Return {cam_id: {"status", "reconnects", "since"}} for every camera."""
+        report = {}
+        for cam_id, cam in list(self.cameras.items()):
+            since = cam.status_history[-1][0] if cam.status_history else None
+            report[cam_id] = {"status": cam.status.name, "reconnects": cam.reconnect_count, "since": since}
+        return report
+
     def start_all_cameras(self):
-        for cam in self.cameras.values():
+        for cam in list(self.cameras.values()):
             cam.start()
 
     def stop_all_cameras(self):
-        for cam in self.cameras.values():
+        for cam in list(self.cameras.values()):
             cam.stop()
         print("[CameraManager] All cameras stopped.")
@@ -0,0 +1,65 @@
+# core/capture_metrics.py
+
+"""
+Capture Metrics - Cheap per-camera counters for the capture loop.
+
+Recording is O(1) (deque appends and integer increments) so it can stay on in
+production; percentiles and rates are only computed when a snapshot is taken
+by the dashboard or the OPC UA exporter.
+
+Author: ItsOji Team
+"""
+
+import time
+from collections import deque
+
+
+class CaptureMetrics:
+    def __init__(self, window=256):
+        self.read_latencies = deque(maxlen=window)   # seconds per successful/failed read()
+        self.frame_times = deque(maxlen=window)      # capture timestamps of successful reads
+        self.frames_total = 0
+        self.failed_reads = 0
+        self.bytes_per_frame = 0
+        self.last_frame_time = None
+
+    def record_read(self, latency, ok, nbytes=0):
+        self.read_latencies.append(latency)
+        if ok:
+            now = time.time()
+            self.frame_times.append(now)
+            self.last_frame_time = now
+            self.frames_total += 1
+            self.bytes_per_frame = nbytes
+        else:
+            self.failed_reads += 1
+
+    @staticmethod
+    def _percentile(sorted_values, pct):
+        if not sorted_values:
+            return None
+        idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+        return sorted_values[idx]
+
+    def decode_fps(self):
+        """Rolling decode rate over the retained window of successful reads."""
+        times = list(self.frame_times)
+        if len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def snapshot(self):
+        """Return a plain dict suitable for the dashboard, JSON or OPC UA."""
+        latencies = sorted(self.read_latencies)
+        p50 = self._percentile(latencies, 50)
+        p99 = self._percentile(latencies, 99)
+        age = time.time() - self.last_frame_time if self.last_frame_time else None
+        return {
+            "decode_fps": round(self.decode_fps(), 2),
+            "read_p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "read_p99_ms": round(p99 * 1000, 2) if p99 is not None else None,
+            "frames_total": self.frames_total,
+            "failed_reads": self.failed_reads,
+            "bytes_per_frame": self.bytes_per_frame,
+            "frame_age_s": round(age, 3) if age is not None else None
+        }
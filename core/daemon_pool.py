@@ -0,0 +1,81 @@
+# core/daemon_pool.py
+
+"""
+Daemon Thread Pool - A minimal executor whose workers never block app exit.
+
+concurrent.futures.ThreadPoolExecutor joins its worker threads at interpreter
+shutdown, so one plugin call hung inside native code (a stuck decoder, a
+deadlocked driver) keeps the process alive after the window is closed. This
+pool runs the same submit()/Future API on daemon threads, which the
+interpreter abandons on exit.
+
+Author: ItsOji Team
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class DaemonThreadPool:
+    def __init__(self, max_workers, thread_name_prefix="pool"):
+        self.max_workers = max(1, int(max_workers))
+        self.thread_name_prefix = thread_name_prefix
+        self.tasks = queue.SimpleQueue()
+        self.threads = []
+        self.idle = threading.Semaphore(0)  # Released by every worker waiting for a task
+        self.lock = threading.Lock()
+        self.shutting_down = False
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) and return its concurrent.futures.Future."""
+        future = Future()
+        with self.lock:
+            if self.shutting_down:
+                raise RuntimeError("cannot schedule new calls after shutdown")
+            self.tasks.put((future, fn, args, kwargs))
+            # Start threads lazily, only when no worker is free to take the task
+            if not self.idle.acquire(blocking=False) and len(self.threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._worker, name=f"{self.thread_name_prefix}_{len(self.threads)}", daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+        return future
+
+    def _worker(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, fn, args, kwargs = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            del task, future  # Drop references to the finished call before waiting again
+            self.idle.release()
+
+    def shutdown(self, wait=False, cancel_futures=True, timeout=None):
+        """
+        Stop accepting work and let idle workers exit.
+
+        :param cancel_futures: Cancel calls that have not started yet
+        :param wait: Join the workers (up to `timeout` each); a hung call is left behind
+        """
+        with self.lock:
+            self.shutting_down = True
+            if cancel_futures:
+                while True:
+                    try:
+                        task = self.tasks.get_nowait()
+                    except queue.Empty:
+                        break
+                    if task is not None:
+                        task[0].cancel()
+            for _ in self.threads:
+                self.tasks.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join(timeout)
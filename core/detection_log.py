@@ -0,0 +1,151 @@
+# core/detection_log.py
+
+"""
+Detection Log - Structured JSON-lines plugin logs with a sidecar time index.
+
+With "log_format": "jsonl" (or "both") in a plugin's logging config, every
+logged result is also appended to logs/<plugin>/YYYY-MM-DD.jsonl as one JSON
+object per line:
+    {"ts": 1715000000123, "plugin": "fire_detection", "camera_id": "ip_1",
+     "level": "INFO", "source": "FIRE_DETECTION", "fields": {"fire_detected": true, ...}}
+
+Next to it, YYYY-MM-DD.jsonl.idx holds fixed-size (timestamp_ms, byte offset)
+entries, at most one per second of log time. A time-range query binary-searches
+the index, seeks straight to the first candidate line and stops reading once it
+is past the range, instead of parsing the whole day. Lines carry their own
+timestamp, so a missing or stale index only costs speed, never results.
+
+Author: ItsOji Team
+"""
+
+import bisect
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+
+INDEX_ENTRY = struct.Struct("<qq")  # timestamp_ms, byte offset of the line
+INDEX_SLACK_MS = 5000               # Lines are written in arrival order; allow this much disorder
+TEXT_FIELDS_SEPARATOR = " | "
+
+
+def index_path(log_path):
+    return log_path + ".idx"
+
+
+def pack_index_entry(timestamp_ms, offset):
+    return INDEX_ENTRY.pack(int(timestamp_ms), int(offset))
+
+
+def day_path(folder, day):
+    return os.path.join(folder, f"{day.strftime('%Y-%m-%d')}.jsonl")
+
+
+def make_record(plugin_name, timestamp_ms, camera_id, level, source, fields):
+    """One JSON line (with trailing newline) for the structured log."""
+    return json.dumps({
+        "ts": timestamp_ms, "plugin": plugin_name, "camera_id": camera_id,
+        "level": level, "source": source, "fields": fields
+    }, separators=(",", ":"), default=str) + "\n"
+
+
+def format_text(record):
+    """The classic text log line for a record, for viewers that show text."""
+    timestamp = datetime.fromtimestamp(record["ts"] / 1000).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    fields = record.get("fields") or {}
+    meta_info = TEXT_FIELDS_SEPARATOR.join(f"{k}:{v}" for k, v in fields.items()) or "NO_DATA"
+    return f"[{timestamp}] [{record.get('level', 'INFO')}] [{record.get('source', '')}] :: {meta_info}"
+
+
+def read_index(log_path):
+    """(timestamps, offsets) of a log's index; empty lists if it has none."""
+    timestamps, offsets = [], []
+    try:
+        with open(index_path(log_path), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return timestamps, offsets
+    usable = len(data) - len(data) % INDEX_ENTRY.size  # Ignore a torn last entry
+    for timestamp_ms, offset in INDEX_ENTRY.iter_unpack(data[:usable]):
+        timestamps.append(timestamp_ms)
+        offsets.append(offset)
+    return timestamps, offsets
+
+
+def _start_offset(log_path, start_ms):
+    timestamps, offsets = read_index(log_path)
+    position = bisect.bisect_right(timestamps, start_ms - INDEX_SLACK_MS) - 1
+    return offsets[position] if position >= 0 else 0
+
+
+def _parse(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None  # Torn line at the end of a file still being written
+
+
+def scan_file(log_path, start_ms=None, end_ms=None, camera_id=None):
+    """Yield the records of one .jsonl file in [start_ms, end_ms], seeking via the index."""
+    try:
+        f = open(log_path, 'rb')
+    except OSError:
+        return
+    with f:
+        if start_ms is not None:
+            f.seek(_start_offset(log_path, start_ms))
+        for line in f:
+            record = _parse(line)
+            if record is None:
+                continue
+            ts = record.get("ts", 0)
+            if end_ms is not None and ts > end_ms + INDEX_SLACK_MS:
+                break
+            if start_ms is not None and ts < start_ms or end_ms is not None and ts > end_ms:
+                continue
+            if camera_id is not None and str(record.get("camera_id")) != str(camera_id):
+                continue
+            yield record
+
+
+def query(folder, start_ms, end_ms, camera_id=None, limit=None):
+    """
+    Records of one plugin's structured log between two times, oldest first.
+
+    :param folder: The plugin's log output folder
+    :param start_ms: Range start, epoch milliseconds
+    :param end_ms: Range end, epoch milliseconds (inclusive)
+    :param camera_id: Only this camera's records (optional)
+    :param limit: Stop after this many records (optional)
+    """
+    records = []
+    day = datetime.fromtimestamp(start_ms / 1000).date()
+    last_day = datetime.fromtimestamp(end_ms / 1000).date()
+    while day <= last_day:
+        for record in scan_file(day_path(folder, day), start_ms, end_ms, camera_id):
+            records.append(record)
+            if limit and len(records) >= limit:
+                return records
+        day += timedelta(days=1)
+    return records
+
+
+def tail(log_path, limit=30, chunk_size=64 * 1024):
+    """The last `limit` records of one .jsonl file, read backwards from the end."""
+    try:
+        f = open(log_path, 'rb')
+    except OSError:
+        return []
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position, data = end, b""
+        while position > 0 and data.count(b"\n") <= limit:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.split(b"\n")
+    if position > 0:
+        lines = lines[1:]  # First piece may be a partial line
+    records = [r for r in (_parse(line) for line in lines if line.strip()) if r is not None]
+    return records[-limit:]
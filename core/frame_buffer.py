@@ -0,0 +1,120 @@
+# core/frame_buffer.py
+
+"""
+Frame Ring Buffer - Fixed-capacity store of the most recent frames of one camera.
+
+Slots are preallocated numpy arrays that the capture thread decodes into
+directly, so a running stream does not allocate a new ndarray per read. Every
+published frame carries a monotonic sequence ID and its capture timestamp so
+consumers can skip frames they have already processed.
+
+The buffer is single-writer / multi-reader and takes no lock: the writer
+invalidates a slot before reusing it and publishes the new sequence ID only
+after the pixels are in place. Frames returned by get_latest() are views into
+the ring and stay valid until `capacity - 1` newer frames have been written;
+a consumer that works on a view checks is_current() once it is done reading
+(and drops its work if the slot was reused), or asks for a copy.
+
+Author: ItsOji Team
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+FramePacket = namedtuple("FramePacket", ["seq", "timestamp", "frame"])
+
+EMPTY_SEQ = -1
+
+
+class FrameRingBuffer:
+    """Lock-free ring of preallocated frame slots for a single camera."""
+
+    def __init__(self, capacity=4):
+        if capacity < 2:
+            raise ValueError("FrameRingBuffer capacity must be at least 2")
+        self.capacity = capacity
+        self.slots = None
+        self.seqs = np.full(capacity, EMPTY_SEQ, dtype=np.int64)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.latest_seq = EMPTY_SEQ
+        self._next_seq = 0
+
+    def _allocate(self, shape, dtype):
+        self.slots = np.empty((self.capacity,) + tuple(shape), dtype=dtype)
+        self.seqs.fill(EMPTY_SEQ)
+
+    def next_slot(self):
+        """
+        Reserve the slot the next frame will be written to.
+
+        :return: Writable ndarray view (suitable as the `image` argument of
+                 cv2.VideoCapture.read) or None until the first frame has
+                 fixed the frame shape.
+        """
+        if self.slots is None:
+            return None
+        idx = self._next_seq % self.capacity
+        self.seqs[idx] = EMPTY_SEQ  # Invalidate before the writer touches the pixels
+        return self.slots[idx]
+
+    def commit(self, frame, timestamp=None):
+        """
+        Publish a captured frame and return its sequence ID.
+
+        If `frame` is the slot handed out by next_slot() it is published as-is;
+        otherwise it is copied into the ring (reallocating when the stream
+        resolution changes).
+        """
+        idx = self._next_seq % self.capacity
+        if self.slots is None or self.slots.shape[1:] != frame.shape or self.slots.dtype != frame.dtype:
+            self._allocate(frame.shape, frame.dtype)
+        slot = self.slots[idx]
+        if not np.shares_memory(slot, frame):
+            np.copyto(slot, frame)
+
+        seq = self._next_seq
+        self.timestamps[idx] = time.time() if timestamp is None else timestamp
+        self.seqs[idx] = seq
+        self.latest_seq = seq
+        self._next_seq = seq + 1
+        return seq
+
+    def put(self, frame, timestamp=None):
+        """Copy a frame into the ring. Alias of commit() for frames not read into a slot."""
+        return self.commit(frame, timestamp)
+
+    def get_latest(self, since_seq=EMPTY_SEQ, copy=False):
+        """
+        Return the newest frame if it is newer than `since_seq`.
+
+        :param since_seq: Sequence ID the caller has already processed
+        :param copy: Return a private copy instead of a view into the ring.
+                     A view is only checked here, before the caller reads it:
+                     call is_current(seq) after reading to rule out a torn frame.
+        :return: FramePacket(seq, timestamp, frame) or None when nothing new
+        """
+        seq = self.latest_seq
+        if seq == EMPTY_SEQ or seq <= since_seq:
+            return None
+        idx = seq % self.capacity
+        slots = self.slots
+        frame = slots[idx].copy() if copy else slots[idx]
+        timestamp = self.timestamps[idx]
+        if self.seqs[idx] != seq:
+            return None  # Overwritten while reading; caller retries on its next tick
+        return FramePacket(seq, float(timestamp), frame)
+
+    def is_current(self, seq):
+        """True while the slot of `seq` has not been reused by the writer."""
+        return self.seqs[seq % self.capacity] == seq
+
+    def get_frame(self):
+        """Return a copy of the newest frame or None."""
+        packet = self.get_latest(copy=True)
+        return packet.frame if packet else None
+
+    def clear(self):
+        self.seqs.fill(EMPTY_SEQ)
+        self.latest_seq = EMPTY_SEQ
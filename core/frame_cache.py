@@ -0,0 +1,68 @@
+# core/frame_cache.py
+
+"""
+Frame Cache - Per-frame derived data and process-wide model objects shared by plugins.
+
+A FrameContext wraps one prepared frame. Its grayscale, histogram-equalized
+and resized variants are computed on first access and then handed to every
+plugin that runs on the frame, instead of each plugin recomputing them.
+Haar cascades are loaded once per thread: CascadeClassifier keeps mutable
+per-image buffers, so one instance must never run on two threads at once.
+
+Author: ItsOji Team
+"""
+
+import threading
+
+import cv2
+
+
+class FrameContext:
+    def __init__(self, frame, camera_id=None):
+        self.frame = frame
+        self.camera_id = camera_id
+        self._cache = {}
+
+    def get(self, key, factory):
+        """Return a cached derived value, computing it with factory(self) on first use."""
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = factory(self)
+        return value
+
+    @property
+    def gray(self):
+        return self.get("gray", lambda ctx: cv2.cvtColor(ctx.frame, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def equalized(self):
+        return self.get("equalized", lambda ctx: cv2.equalizeHist(ctx.gray))
+
+    def resized(self, size):
+        """BGR frame resized to size=(width, height)."""
+        size = tuple(size)
+        if size == (self.frame.shape[1], self.frame.shape[0]):
+            return self.frame
+        return self.get(("resized", size), lambda ctx: cv2.resize(ctx.frame, size))
+
+
+_cascades = threading.local()  # Per thread: {name: CascadeClassifier}
+
+
+def get_cascade(name="haarcascade_frontalface_default.xml"):
+    """
+    The calling thread's CascadeClassifier, parsed from OpenCV's data directory on first use.
+
+    Call it where detectMultiScale runs rather than keeping the result, so every
+    thread (plugin calls, gallery rebuilds, recovery) uses its own instance.
+    """
+    cascades = getattr(_cascades, "by_name", None)
+    if cascades is None:
+        cascades = _cascades.by_name = {}
+    cascade = cascades.get(name)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(cv2.data.haarcascades + name)
+        if cascade.empty():
+            raise IOError(f"Failed to load cascade: {name}")
+        cascades[name] = cascade
+    return cascade
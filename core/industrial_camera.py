@@ -9,6 +9,7 @@ class CameraStatus(Enum):
     CONNECTED = 1
     STREAMING = 2
     FAULT = 3
+    RECONNECTING = 4
 
 class IndustrialCamera:
     def __init__(self, source_id, source_type, source_value):
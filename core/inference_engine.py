@@ -0,0 +1,328 @@
+# core/inference_engine.py
+
+"""
+Inference Engine - Shared ONNX Runtime sessions for model-backed plugins.
+
+Plugins declare a `model_spec` instead of loading their own model. The engine
+loads each ONNX file once and keeps a small pool of CPU sessions per model.
+A global run budget (cpu_count // intra_op_threads concurrent runs) stops
+several plugins and cameras from oversubscribing the cores.
+
+Vectorized numpy pre/post-processing for YOLO-style detectors (letterbox,
+output decoding, NMS) also lives here so plugins only map detections to results.
+
+Config lives under "inference_engine" in config/default_settings.json.
+
+Author: ItsOji Team
+"""
+
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core.crash_logger import log_exception
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Plugins fall back to their simulated path without it
+    ort = None
+
+DEFAULT_ENGINE_SETTINGS = {
+    "intra_op_threads": 0,       # Threads per session run (0 = min(4, cpu_count))
+    "inter_op_threads": 1,
+    "max_concurrent_runs": 0,    # Across all models (0 = cpu_count // intra_op_threads)
+    "sessions_per_model": 0      # Idle sessions kept per model (0 = max_concurrent_runs)
+}
+
+
+def load_engine_settings(config_path="config/default_settings.json"):
+    settings = dict(DEFAULT_ENGINE_SETTINGS)
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                settings.update(json.load(f).get("inference_engine", {}))
+        except Exception as e:
+            log_exception(e, context="Failed to load inference engine settings")
+    return settings
+
+
+# ---------------------------------------------------------------------------
+# Pre/post-processing
+# ---------------------------------------------------------------------------
+
+def letterbox(image, new_shape=(640, 640), color=114):
+    """
+    Resize keeping aspect ratio and pad to new_shape (h, w).
+
+    :return: (padded image, scale ratio, (pad_x, pad_y))
+    """
+    h, w = image.shape[:2]
+    ratio = min(new_shape[0] / h, new_shape[1] / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_x, pad_y = (new_shape[1] - new_w) / 2, (new_shape[0] - new_h) / 2
+
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(color, color, color))
+    return image, ratio, (left, top)
+
+
+def preprocess_batch(frames, input_size=(640, 640)):
+    """
+    Letterbox BGR frames into one NCHW float32 RGB blob scaled to [0, 1].
+
+    :return: (blob, metas) where metas[i] = (ratio, (pad_x, pad_y), (h, w)) of frame i
+    """
+    blob = np.empty((len(frames), 3, input_size[0], input_size[1]), dtype=np.float32)
+    metas = []
+    for i, frame in enumerate(frames):
+        padded, ratio, pad = letterbox(frame, input_size)
+        # BGR HWC uint8 → RGB CHW float32, written straight into the batch
+        np.multiply(padded[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=blob[i], casting="unsafe")
+        metas.append((ratio, pad, frame.shape[:2]))
+    return blob, metas
+
+
+def nms(boxes, scores, iou_threshold=0.45):
+    """
+    Greedy non-maximum suppression.
+
+    :param boxes: (N, 4) array of x1, y1, x2, y2
+    :param scores: (N,) array
+    :return: Indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def postprocess_detections(output, metas, conf_threshold=0.25, iou_threshold=0.45, output_format="yolov8"):
+    """
+    Decode a YOLO-style batch output into per-frame detections in original frame pixels.
+
+    :param output: (N, 4 + classes, anchors) for "yolov8", (N, anchors, 5 + classes) for "yolov5"
+    :param metas: As returned by preprocess_batch()
+    :return: List (one per frame) of (K, 6) arrays: x1, y1, x2, y2, score, class_id
+    """
+    if output_format == "yolov8":
+        output = output.transpose(0, 2, 1)
+
+    detections = []
+    for pred, (ratio, (pad_x, pad_y), (h, w)) in zip(output, metas):
+        if output_format == "yolov5":
+            class_scores = pred[:, 5:] * pred[:, 4:5]
+        else:
+            class_scores = pred[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_scores)), class_ids]
+        mask = scores >= conf_threshold
+        if not mask.any():
+            detections.append(np.empty((0, 6), dtype=np.float32))
+            continue
+
+        cx, cy, bw, bh = pred[mask, :4].T
+        boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+        boxes -= (pad_x, pad_y, pad_x, pad_y)
+        boxes /= ratio
+        np.clip(boxes, 0, (w, h, w, h), out=boxes)
+
+        scores, class_ids = scores[mask], class_ids[mask]
+        # Offset boxes per class so one NMS pass never suppresses across classes
+        offsets = class_ids[:, None].astype(boxes.dtype) * (max(h, w) + 1)
+        keep = nms(boxes + offsets, scores, iou_threshold)
+        detections.append(np.column_stack([boxes[keep], scores[keep], class_ids[keep]]).astype(np.float32))
+    return detections
+
+
+# ---------------------------------------------------------------------------
+# Session pooling
+# ---------------------------------------------------------------------------
+
+class SessionPool:
+    """Up to `size` ONNX Runtime sessions for one model, created lazily and reused."""
+
+    def __init__(self, model_path, size, session_options, providers):
+        self.model_path = model_path
+        self.size = size
+        self.session_options = session_options
+        self.providers = providers
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+        first = self._create()  # Fail fast on a bad model file
+        self.input_name = first.get_inputs()[0].name
+        self.input_shape = first.get_inputs()[0].shape
+        self.idle.put(first)
+
+    def _create(self):
+        session = ort.InferenceSession(self.model_path, sess_options=self.session_options, providers=self.providers)
+        self.created += 1
+        return session
+
+    @contextmanager
+    def session(self):
+        try:
+            session = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                session = self._create() if self.created < self.size else None
+            if session is None:
+                session = self.idle.get()
+        try:
+            yield session
+        finally:
+            self.idle.put(session)
+
+
+class ModelHandle:
+    """What a plugin gets back for its model_spec: run a batch through the shared pool."""
+
+    def __init__(self, engine, pool, spec):
+        self.engine = engine
+        self.pool = pool
+        self.spec = spec
+
+    @property
+    def input_size(self):
+        return tuple(self.spec.get("input_size", (640, 640)))
+
+    @property
+    def static_batch(self):
+        """Batch size the model was exported with, or None if its batch dimension is dynamic."""
+        dim = self.pool.input_shape[0] if self.pool.input_shape else None
+        return dim if isinstance(dim, int) and dim > 0 else None
+
+    def run(self, blob):
+        """
+        Run one preprocessed batch; returns the first model output.
+
+        Models with a static batch dimension (most YOLO exports are fixed at 1)
+        get the batch in chunks of that size, the last one zero-padded.
+        """
+        with self.engine.run_slot(), self.pool.session() as session:
+            size = self.static_batch
+            if size is None or size == len(blob):
+                return session.run(None, {self.pool.input_name: blob})[0]
+            outputs = []
+            for start in range(0, len(blob), size):
+                chunk = blob[start:start + size]
+                count = len(chunk)
+                if count < size:
+                    chunk = np.concatenate([chunk, np.zeros((size - count,) + chunk.shape[1:], dtype=chunk.dtype)])
+                outputs.append(session.run(None, {self.pool.input_name: chunk})[0][:count])
+            return np.concatenate(outputs)
+
+    def detect(self, frames):
+        """Letterbox, infer and decode a batch of BGR frames into per-frame (K, 6) detection arrays."""
+        blob, metas = preprocess_batch(frames, self.input_size)
+        output = self.run(blob)
+        return postprocess_detections(
+            output, metas,
+            conf_threshold=self.spec.get("conf_threshold", 0.25),
+            iou_threshold=self.spec.get("iou_threshold", 0.45),
+            output_format=self.spec.get("output_format", "yolov8")
+        )
+
+
+class InferenceEngine:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_ENGINE_SETTINGS)
+        self.settings.update(settings if settings is not None else load_engine_settings())
+
+        cpus = os.cpu_count() or 1
+        self.intra_op_threads = int(self.settings["intra_op_threads"]) or min(4, cpus)
+        self.max_concurrent_runs = int(self.settings["max_concurrent_runs"]) or max(1, cpus // self.intra_op_threads)
+        self.sessions_per_model = int(self.settings["sessions_per_model"]) or self.max_concurrent_runs
+
+        self.run_budget = threading.BoundedSemaphore(self.max_concurrent_runs)
+        self.pools = {}  # absolute model path → SessionPool
+        self.pool_mtimes = {}  # absolute model path → st_mtime_ns the pool was built from
+        self.lock = threading.Lock()
+
+    @property
+    def available(self):
+        return ort is not None
+
+    def _session_options(self):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = int(self.settings["inter_op_threads"])
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return options
+
+    @contextmanager
+    def run_slot(self):
+        with self.run_budget:
+            yield
+
+    def load(self, spec):
+        """
+        Return a ModelHandle for a plugin's model_spec, loading the model on first use.
+
+        :param spec: {"path": ..., "input_size": (h, w), "conf_threshold", "iou_threshold", "output_format"}
+        :return: ModelHandle, or None if onnxruntime or the model file is missing.
+        """
+        if not self.available:
+            print("[InferenceEngine] ⚠️ onnxruntime not installed; model-backed plugins run simulated.")
+            return None
+        path = os.path.abspath(spec["path"])
+        if not os.path.exists(path):
+            print(f"[InferenceEngine] ⚠️ Model not found: {path}")
+            return None
+
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self.lock:
+            pool = self.pools.get(path)
+            if pool is None or self.pool_mtimes.get(path) != mtime_ns:
+                # New model, or the file was replaced: handles already given out keep the old pool
+                try:
+                    pool = SessionPool(path, self.sessions_per_model, self._session_options(), ["CPUExecutionProvider"])
+                except Exception as e:
+                    log_exception(e, context="Failed to load ONNX model", extra_info={"model": path})
+                    return None
+                self.pools[path] = pool
+                self.pool_mtimes[path] = mtime_ns
+                print(f"[InferenceEngine] ✅ Loaded {os.path.basename(path)} "
+                      f"({self.intra_op_threads} intra-op threads, up to {self.sessions_per_model} sessions)")
+        return ModelHandle(self, pool, spec)
+
+    def unload_all(self):
+        with self.lock:
+            self.pools.clear()
+            self.pool_mtimes.clear()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_inference_engine(settings=None):
+    """Process-wide engine; `settings` only applies to the first call."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = InferenceEngine(settings)
+        return _engine
@@ -0,0 +1,181 @@
+# core/inference_pipeline.py
+
+"""
+Inference Pipeline - The single place where frames are run through the plugins.
+
+One dispatcher thread polls every camera's ring buffer for new frames, asks the
+scheduler which plugins are due and runs them (on a thread pool, or on the
+InferenceWorkerPool in process mode). In thread mode, frames that become ready
+together are grouped by PluginManager.batcher and run as one batch. Each result set is logged and
+published once on a ResultBus; alerting and the LiveView overlays both subscribe
+to it instead of calling PluginManager.apply_plugins themselves.
+
+Author: ItsOji Team
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from core.crash_logger import log_exception
+
+InferenceEvent = namedtuple("InferenceEvent", ["camera_id", "seq", "timestamp", "results"])
+
+
+class Subscription:
+    """Bounded per-consumer queue; the oldest event is dropped when the consumer falls behind."""
+
+    def __init__(self, name, maxsize=256):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def push(self, event):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def poll(self, max_items=None):
+        """Return all pending events (or up to max_items) without blocking."""
+        events = []
+        while max_items is None or len(events) < max_items:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class ResultBus:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def subscribe(self, name, maxsize=256):
+        with self.lock:
+            sub = self.subscriptions.get(name)
+            if sub is None:
+                sub = self.subscriptions[name] = Subscription(name, maxsize)
+            return sub
+
+    def unsubscribe(self, name):
+        with self.lock:
+            self.subscriptions.pop(name, None)
+
+    def publish(self, event):
+        with self.lock:
+            subs = list(self.subscriptions.values())
+        for sub in subs:
+            sub.push(event)
+
+
+class InferencePipeline:
+    def __init__(self, camera_manager, plugin_manager, inference_pool=None, workers=4, bus=None):
+        self.camera_manager = camera_manager
+        self.plugin_manager = plugin_manager
+        self.inference_pool = inference_pool
+        self.bus = bus or ResultBus()
+        self.executor = None if inference_pool else ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="inference"
+        )
+        self.last_seq = {}          # camera_id → last frame seq handed to inference
+        self.in_flight = set()      # camera_ids with a thread-mode frame batched or running
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="inference-dispatch", daemon=True)
+        self.thread.start()
+        print("[InferencePipeline] ✅ Started.")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=3)
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        print("[InferencePipeline] 🛑 Stopped.")
+
+    def _run(self):
+        while self.running:
+            started = time.time()
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                log_exception(e, context="InferencePipeline dispatch loop")
+            tick = self.plugin_manager.scheduler.tick_ms / 1000.0
+            time.sleep(max(0.0, tick - (time.time() - started)))
+
+    def dispatch_once(self):
+        """Hand every camera's newest unseen frame to inference if the scheduler has plugins due."""
+        for cam_id in list(self.camera_manager.cameras):
+            if cam_id in self.in_flight or (self.inference_pool and cam_id in self.inference_pool.in_flight):
+                continue
+            packet = self.camera_manager.get_latest(cam_id, self.last_seq.get(cam_id, -1))
+            if packet is None:
+                continue
+            descriptor = None
+            if self.inference_pool:
+                descriptor = self.camera_manager.describe_buffer(cam_id)
+                if descriptor is None:
+                    continue
+            # Only charged to the scheduler once the frame is actually handed off
+            due = self.plugin_manager.due_plugins(cam_id, packet.frame, mark=False, seq=packet.seq)
+            if not due:
+                self.last_seq[cam_id] = packet.seq  # Static scene or rate-limited: wait for the next frame
+                continue
+            if self.inference_pool:
+                if not self.inference_pool.submit(cam_id, descriptor, packet.seq, due):
+                    continue  # Workers busy: retry on the next tick with the rate budget intact
+                self.last_seq[cam_id] = packet.seq
+            else:
+                # Resize/crop out of the ring before handing off so the slot can be reused
+                job = self.plugin_manager.prepare_job(cam_id, packet.frame, due)
+                if not self.camera_manager.is_current(cam_id, packet.seq) or job[1] is packet.frame:
+                    continue  # Slot was reused while we read it (torn frame); retry on the next tick
+                self.last_seq[cam_id] = packet.seq
+                with self.lock:
+                    self.in_flight.add(cam_id)
+                self.plugin_manager.batcher.add((packet.seq, packet.timestamp, job))
+            self.plugin_manager.mark_dispatched(cam_id, due)
+
+        batcher = self.plugin_manager.batcher
+        while batcher.ready():
+            self.executor.submit(self._run_batch, batcher.drain())
+
+        if self.inference_pool:
+            for cam_id, seq, results in self.inference_pool.poll_results():
+                if results:
+                    self._publish(cam_id, seq, time.time(), results)
+
+    def _run_batch(self, batch):
+        jobs = [job for _, _, job in batch]
+        cam_ids = [job[0] for job in jobs]
+        try:
+            for (seq, timestamp, job), results in zip(batch, self.plugin_manager.run_batch(jobs)):
+                if results:
+                    self._publish(job[0], seq, timestamp, results)
+        except Exception as e:
+            log_exception(e, context="InferencePipeline batch failed", extra_info={"camera_ids": cam_ids})
+        finally:
+            with self.lock:
+                self.in_flight.difference_update(cam_ids)
+
+    def _publish(self, cam_id, seq, timestamp, results):
+        # Logged here, in this process, whichever mode ran the plugins: one logger, one writer per file
+        self.plugin_manager.log_results(cam_id, results)
+        self.plugin_manager.scheduler.observe_results(cam_id, results)
+        self.bus.publish(InferenceEvent(cam_id, seq, timestamp, results))
@@ -0,0 +1,191 @@
+# core/inference_pool.py
+
+"""
+Inference Worker Pool - Runs plugin inference in separate processes.
+
+Cameras publish frames into SharedFrameRingBuffer slabs. The UI process submits
+small jobs (camera ID, slab descriptor, frame seq) and each worker attaches to
+the slab zero-copy, runs the plugins and sends back only the result dicts. This
+keeps the GIL-bound Haar/LBPH work off the GUI process and spreads it across cores.
+
+Author: ItsOji Team
+"""
+
+import os
+import queue
+import multiprocessing as mp
+
+from core.crash_logger import log_exception
+from core.shm_transport import SharedFrameView
+
+
+def run_job(plugin_manager, views, job):
+    """
+    Run one submitted job inside a worker and return its (camera_id, seq, results) reply.
+
+    The frame is read zero-copy from the camera's slab; results is None when the
+    slot was reused before or while it was read.
+
+    :param views: camera_id → SharedFrameView cache of this worker
+    """
+    camera_id, descriptor, seq, plugin_names = job
+    view = views.get(camera_id)
+    if view is None or view.name != descriptor["name"]:
+        if view is not None:
+            view.close()
+        view = views[camera_id] = SharedFrameView(descriptor)
+
+    frame = view.frame_at(seq)
+    if frame is None:
+        return camera_id, seq, None
+
+    prepared = plugin_manager.prepare_job(camera_id, frame, plugin_names)
+    if not view.is_current(seq) or prepared[1] is frame:
+        # Slot was reused while we were reading it (or no resize copy was made)
+        return camera_id, seq, None
+    return camera_id, seq, plugin_manager.run_batch([prepared])[0]
+
+
+def _worker_main(worker_id, job_queue, result_queue, plugin_folder):
+    """Entry point of an inference worker process; replies are (worker_id, camera_id, seq, results)."""
+    from core.inference_engine import get_inference_engine, load_engine_settings
+    from core.plugin_manager import PluginManager
+
+    # Every worker is its own process: one ONNX run at a time, single-threaded,
+    # so N workers use about N cores in total.
+    get_inference_engine(dict(load_engine_settings(), intra_op_threads=1, max_concurrent_runs=1))
+    plugin_manager = PluginManager(plugin_folder=plugin_folder)
+    plugin_manager.load_all_plugins()
+    views = {}  # camera_id → SharedFrameView
+
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        camera_id, seq = job[0], job[2]
+        try:
+            result_queue.put((worker_id,) + run_job(plugin_manager, views, job))
+        except Exception as e:
+            log_exception(e, context="Inference worker job failed", extra_info={"camera_id": camera_id, "pid": os.getpid()})
+            result_queue.put((worker_id, camera_id, seq, None))
+
+    for view in views.values():
+        view.close()
+
+
+class InferenceWorkerPool:
+    """
+    Pool of plugin inference processes fed from shared-memory frame slabs.
+
+    Each worker has its own job queue, so the pool knows which cameras' jobs a
+    worker holds. A worker that dies (segfault in a native library, OOM kill)
+    is noticed on the next poll_results(): its cameras are released for
+    dispatch again and a replacement process is started.
+    """
+
+    queue_depth = 2  # Jobs queued per worker
+
+    def __init__(self, workers=0, plugin_folder="plugins"):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.plugin_folder = plugin_folder
+        self.ctx = mp.get_context("spawn")
+        self.job_queues = []
+        self.result_queue = None
+        self.processes = []
+        self.outstanding = []   # worker index → {camera_id: seq} of jobs sent to it
+        self.in_flight = set()  # camera IDs with a job outstanding
+        self.respawns = 0
+
+    def start(self):
+        if self.processes:
+            return
+        self.result_queue = self.ctx.Queue()
+        for worker_id in range(self.workers):
+            self.job_queues.append(None)
+            self.processes.append(None)
+            self.outstanding.append({})
+            self._spawn(worker_id)
+        print(f"[InferencePool] ✅ Started {self.workers} inference worker(s).")
+
+    def _spawn(self, worker_id):
+        self.job_queues[worker_id] = self.ctx.Queue(maxsize=self.queue_depth)
+        proc = self.ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.job_queues[worker_id], self.result_queue, self.plugin_folder),
+            daemon=True
+        )
+        proc.start()
+        self.processes[worker_id] = proc
+
+    def submit(self, camera_id, descriptor, seq, plugin_names=None):
+        """
+        Queue a frame for inference on the least loaded worker.
+
+        :param plugin_names: Plugins to run (None = all enabled), as chosen by the scheduler
+        :return: False if the camera already has a job in flight or all workers are busy.
+        """
+        if descriptor is None or camera_id in self.in_flight:
+            return False
+        for worker_id in sorted(range(len(self.processes)), key=lambda i: len(self.outstanding[i])):
+            if len(self.outstanding[worker_id]) >= self.queue_depth:
+                break
+            try:
+                self.job_queues[worker_id].put_nowait((camera_id, descriptor, seq, plugin_names))
+            except queue.Full:
+                continue
+            self.outstanding[worker_id][camera_id] = seq
+            self.in_flight.add(camera_id)
+            return True
+        return False
+
+    def poll_results(self):
+        """
+        Drain finished jobs as (camera_id, seq, results) tuples; results is None for dropped frames.
+
+        Also replaces dead workers; the frames they held are dropped and their
+        cameras dispatch again from their next frame.
+        """
+        finished = []
+        while True:
+            try:
+                worker_id, camera_id, seq, results = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.outstanding[worker_id].get(camera_id) != seq:
+                continue  # Late reply from a worker already written off
+            del self.outstanding[worker_id][camera_id]
+            self.in_flight.discard(camera_id)
+            finished.append((camera_id, seq, results))
+        self._replace_dead_workers()
+        return finished
+
+    def _replace_dead_workers(self):
+        for worker_id, proc in enumerate(self.processes):
+            if proc is None or proc.is_alive():
+                continue
+            lost = self.outstanding[worker_id]
+            self.outstanding[worker_id] = {}
+            self.in_flight.difference_update(lost)
+            log_exception(
+                context="Inference worker died; restarting it",
+                extra_info={"worker": worker_id, "pid": proc.pid, "exitcode": proc.exitcode, "cameras": sorted(lost)}
+            )
+            self.job_queues[worker_id].close()
+            self._spawn(worker_id)
+            self.respawns += 1
+
+    def stop(self):
+        processes, self.processes = self.processes, []
+        for job_queue in self.job_queues:
+            try:
+                job_queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+        for proc in processes:
+            proc.join(timeout=3)
+            if proc.is_alive():
+                proc.terminate()
+        self.job_queues.clear()
+        self.outstanding.clear()
+        self.in_flight.clear()
+        print("[InferencePool] 🛑 Inference workers stopped.")
@@ -7,84 +7,177 @@ if __name__ == "__main__" or __package__ is None:
 import os
 import json
 import threading
+import time
 import gzip
 from datetime import datetime, timedelta
 from core.crash_logger import log_exception
+from core.log_writer import get_log_writer
+from core import detection_log
+
+# Fields that differ on every result and so never count towards "distinct"
+VOLATILE_FIELDS = ("timestamp_ms",)
+
+
+def dedup_key(data, meta_fields=None):
+    """
+    Cheap structural identity of a result (no copy, no hashing).
+
+    With meta_fields, only those fields count - the ones that end up in the log
+    line; otherwise every value does. Volatile fields never count.
+    """
+    if not isinstance(data, dict):
+        return data
+    if meta_fields:
+        return tuple(data.get(key) for key in meta_fields if key not in VOLATILE_FIELDS)
+    return tuple(value for key, value in data.items() if key not in VOLATILE_FIELDS)
 
 
 class LogManager:
     """
     Smart Log Manager — controls AI plugin logging dynamically.
     Supports: event vs continuous vs sensor, compression, retention, frequency, meta fields, filters.
+
+    A plugin's "log_format" picks the sink: "text" (default) daily .log lines,
+    "jsonl" the structured, time-indexed core.detection_log files, or "both".
+
+    Use get_log_manager() for the process-wide instance. The config is re-read
+    when the file's mtime changes (checked at most every `reload_check_s`), so
+    edits from the logging dialog apply without a restart.
     """
 
-    def __init__(self, config_path="config/logging_config.json", log_dir="logs"):
+    def __init__(self, config_path="config/logging_config.json", log_dir="logs", reload_check_s=1.0,
+                 state_ttl_s=3600.0):
         self.config_path = config_path
         self.log_dir = log_dir
         self.lock = threading.Lock()
+        self.state_lock = threading.Lock()  # Inference threads log concurrently; dedup state is check-then-set
+        self.writer = get_log_writer()  # File I/O happens on its thread, never the caller's
         self.plugin_configs = {}
-        self.last_logged = {}  # plugin: timestamp_ms
-        self.last_data = {}    # plugin: last_meta snapshot
+        self.config_mtime = None
+        self.reload_check_s = reload_check_s
+        self.next_reload_check = 0.0
+        # Dedup / rate-limit state per (plugin, camera_id); entries idle for state_ttl_s are pruned
+        self.last_logged = {}  # (plugin, camera_id): timestamp_ms of the last written line
+        self.last_data = {}    # (plugin, camera_id): dedup_key() of the last logged result
+        self.last_seen = {}    # (plugin, camera_id): timestamp_ms of the last log() call
+        self.state_ttl_ms = int(state_ttl_s * 1000)
+        self.next_prune_ms = 0
         self._load_config()
         os.makedirs(self.log_dir, exist_ok=True)
 
-    def _load_config(self):
+    def _config_mtime(self):
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    self.plugin_configs = json.load(f)
-            else:
-                self.plugin_configs = {}
-        except Exception as e:
-            log_exception(e, context="Failed to load log config")
-            self.plugin_configs = {}
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_config(self):
+        """Parse the config and swap it in as one snapshot; a broken file keeps the previous one."""
+        with self.lock:
+            mtime = self._config_mtime()
+            try:
+                if mtime is not None:
+                    with open(self.config_path, 'r') as f:
+                        configs = json.load(f)
+                else:
+                    configs = {}
+            except Exception as e:
+                log_exception(e, context="Failed to load log config")
+                return False
+            self.plugin_configs = configs
+            self.config_mtime = mtime
+            self.last_data = {}  # meta_fields may have changed; keys built from the old ones don't compare
+            return True
+
+    def reload_config(self, force=False):
+        """Re-read the config if the file changed (or always with force); returns True if reloaded."""
+        if not force and self._config_mtime() == self.config_mtime:
+            return False
+        reloaded = self._load_config()
+        if reloaded:
+            print("[LogManager] 🔄 Logging config reloaded.")
+        return reloaded
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now >= self.next_reload_check:
+            self.next_reload_check = now + self.reload_check_s
+            self.reload_config()
 
-    def log(self, plugin_name, data: dict):
+    def _prune_state(self, now_ms):
+        """Drop dedup/rate-limit state of (plugin, camera) pairs not seen for state_ttl_s."""
+        self.next_prune_ms = now_ms + min(self.state_ttl_ms, 60_000)
+        cutoff = now_ms - self.state_ttl_ms
+        for state_key in [k for k, seen in list(self.last_seen.items()) if seen < cutoff]:
+            self.last_seen.pop(state_key, None)
+            self.last_logged.pop(state_key, None)
+            self.last_data.pop(state_key, None)
+
+    def log(self, plugin_name, data: dict, camera_id=None):
+        """
+        Log one result, subject to the plugin's mode, frequency and trigger filter.
+
+        "continuous" rate limits and "distinct_only" comparisons are tracked per
+        (plugin, camera), so cameras never suppress each other's lines.
+
+        :param camera_id: Camera the result is for (default: data["camera_id"])
+        """
+        self._maybe_reload()
         cfg = self.plugin_configs.get(plugin_name, {})
         if not cfg.get("enabled", False):
             return
+        with self.state_lock:
+            self._log(plugin_name, cfg, data, camera_id)
 
+    def _log(self, plugin_name, cfg, data, camera_id):
         now = datetime.now()
         timestamp_ms = int(now.timestamp() * 1000)
         freq = cfg.get("frequency_ms", 1000)
+        if camera_id is None and isinstance(data, dict):
+            camera_id = data.get("camera_id")
+        state_key = (plugin_name, camera_id)
+        self.last_seen[state_key] = timestamp_ms
+        if timestamp_ms >= self.next_prune_ms:
+            self._prune_state(timestamp_ms)
 
         mode = cfg.get("mode", "event")
-        last_time = self.last_logged.get(plugin_name, 0)
+        last_time = self.last_logged.get(state_key, 0)
 
         if mode == "continuous" and (timestamp_ms - last_time < freq):
             return
 
+        meta_fields = cfg.get("meta_fields", [])
         if cfg.get("log_trigger_filter") == "distinct_only":
-            if data == self.last_data.get(plugin_name):
+            key = dedup_key(data, meta_fields)
+            if key == self.last_data.get(state_key):
                 return
             if data:
-                self.last_data[plugin_name] = data.copy()
+                self.last_data[state_key] = key
 
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        meta_fields = cfg.get("meta_fields", [])
         log_level = cfg.get("log_level", "INFO")
         source_name = cfg.get("source_name", plugin_name.upper())
+        output_path = cfg.get("output_path", f"logs/{plugin_name}/")
+        log_format = cfg.get("log_format", "text")
 
-        if not data or not isinstance(data, dict):
-            meta_info = "NO_DATA"
-        else:
-            meta_info = " | ".join(f"{k}:{data.get(k, '')}" for k in meta_fields)
+        if log_format in ("jsonl", "both"):
+            fields = {k: data.get(k) for k in meta_fields} if isinstance(data, dict) else {}
+            record = detection_log.make_record(plugin_name, timestamp_ms, camera_id, log_level, source_name, fields)
+            self.writer.write_record(detection_log.day_path(output_path, now), timestamp_ms, record)
 
-        log_line = f"[{timestamp}] [{log_level}] [{source_name}] :: {meta_info}\n"
+        if log_format != "jsonl":
+            timestamp = now.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            if not data or not isinstance(data, dict):
+                meta_info = "NO_DATA"
+            else:
+                meta_info = " | ".join(f"{k}:{data.get(k, '')}" for k in meta_fields)
 
-        output_path = cfg.get("output_path", f"logs/{plugin_name}/")
-        os.makedirs(output_path, exist_ok=True)
+            log_line = f"[{timestamp}] [{log_level}] [{source_name}] :: {meta_info}\n"
 
-        file_name = f"{now.strftime('%Y-%m-%d')}.log"
-        full_path = os.path.join(output_path, file_name)
+            file_name = f"{now.strftime('%Y-%m-%d')}.log"
+            full_path = os.path.join(output_path, file_name)
 
-        try:
-            with self.lock:
-                with open(full_path, "a", encoding="utf-8") as f:
-                    f.write(log_line)
-            self.last_logged[plugin_name] = timestamp_ms
-        except Exception as e:
-            log_exception(e, context=f"Failed to log data for {plugin_name}", extra_info={"file": full_path})
+            self.writer.write(full_path, log_line)
+        self.last_logged[state_key] = timestamp_ms
 
     def _should_compress(self, fname, compress_rule, now):
         try:
@@ -106,6 +199,7 @@ class LogManager:
 
     def cleanup_logs(self):
         """Compress and delete old logs based on config."""
+        self.writer.flush(close_files=True)  # Release handles before files are compressed or removed
         now = datetime.now()
         for plugin, cfg in self.plugin_configs.items():
             folder = cfg.get("output_path", f"logs/{plugin}/")
@@ -140,11 +234,18 @@ class LogManager:
     def get_recent_logs(self, plugin_name=None, limit=30):
         """Read last N lines from plugin logs (all or specific)."""
         lines = []
+        self.writer.flush()
         today = datetime.now().strftime("%Y-%m-%d")
         plugins_to_read = [plugin_name] if plugin_name else list(self.plugin_configs.keys())
 
         for plugin in plugins_to_read:
             cfg = self.plugin_configs.get(plugin, {})
+            if cfg.get("log_format") == "jsonl":
+                # Structured only: read the records directly, shown as classic lines
+                jsonl_path = detection_log.day_path(cfg.get("output_path", f"logs/{plugin}/"), datetime.now())
+                lines.extend(f"[{plugin}] {detection_log.format_text(record)}"
+                             for record in detection_log.tail(jsonl_path, limit))
+                continue
             log_path = os.path.join(cfg.get("output_path", f"logs/{plugin}/"), f"{today}.log")
 
             if os.path.exists(log_path):
@@ -157,6 +258,20 @@ class LogManager:
                     lines.append(f"[{plugin}] Error reading log: {e}")
         return lines[-limit:]
 
+    def query_logs(self, plugin_name, start, end, camera_id=None, limit=None):
+        """
+        Structured records of a plugin between two times (needs "log_format" jsonl or both).
+
+        :param start: datetime or epoch milliseconds
+        :param end: datetime or epoch milliseconds (inclusive)
+        :return: List of record dicts (see core.detection_log), oldest first
+        """
+        self.writer.flush()
+        cfg = self.plugin_configs.get(plugin_name, {})
+        start_ms, end_ms = (int(t.timestamp() * 1000) if isinstance(t, datetime) else int(t) for t in (start, end))
+        return detection_log.query(cfg.get("output_path", f"logs/{plugin_name}/"),
+                                   start_ms, end_ms, camera_id=camera_id, limit=limit)
+
     def get_recent_logs_all(self, limit=10):
         """Return recent logs from all plugins."""
         all_logs = []
@@ -165,8 +280,20 @@ class LogManager:
             all_logs.extend(logs)
         return all_logs
 
+_log_manager = None
+_log_manager_lock = threading.Lock()
+
+
+def get_log_manager():
+    """Process-wide LogManager: one config snapshot and one set of dedup state for every caller."""
+    global _log_manager
+    with _log_manager_lock:
+        if _log_manager is None:
+            _log_manager = LogManager()
+        return _log_manager
+
 # ─── Optional Direct Execution ───────────────────────────────────────────────
 if __name__ == "__main__":
     print("[LogManager] Standalone execution started...")
-    manager = LogManager()
+    manager = get_log_manager()
     manager.cleanup_logs()
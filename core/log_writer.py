@@ -0,0 +1,234 @@
+# core/log_writer.py
+
+"""
+Async Log Writer - Moves plugin log file I/O off the inference threads.
+
+LogManager.log() only formats the line and appends it to a bounded in-memory
+queue. One background thread drains the queue, keeps a handle open per log
+file (i.e. per plugin and day) and flushes them as a group once `flush_lines`
+lines are pending or `flush_interval_s` has passed. Handles unused for
+`idle_close_s` are closed, so yesterday's file is released after midnight.
+
+When the queue is full the oldest line is dropped and counted: logging never
+blocks the caller, however slow the disk is.
+
+Structured lines (write_record) go to a JSON-lines file written in binary, so
+the writer knows each line's byte offset, and feed its sparse time index
+(see core.detection_log).
+
+Config lives under "log_writer" in config/default_settings.json.
+
+Author: ItsOji Team
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from core.crash_logger import log_exception
+from core.detection_log import index_path, pack_index_entry
+
+DEFAULT_LOG_WRITER_SETTINGS = {
+    "max_queue": 10000,          # Lines held in memory before the oldest are dropped
+    "flush_lines": 200,          # Flush once this many lines are pending...
+    "flush_interval_s": 0.5,     # ...or this long after the last flush
+    "idle_close_s": 60.0         # Close a file not written to for this long
+}
+
+
+def load_log_writer_settings(config_path="config/default_settings.json"):
+    settings = dict(DEFAULT_LOG_WRITER_SETTINGS)
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                settings.update(json.load(f).get("log_writer", {}))
+        except Exception as e:
+            log_exception(e, context="Failed to load log writer settings")
+    return settings
+
+
+class AsyncLogWriter:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_LOG_WRITER_SETTINGS)
+        self.settings.update(settings if settings is not None else load_log_writer_settings())
+        self.max_queue = max(1, int(self.settings["max_queue"]))
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.handles = {}        # path → _OpenFile; writer thread only
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+        self.flush_requests = [] # Events set once everything queued before them is on disk
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.written = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, path, line):
+        """Queue one line for `path`; never blocks on I/O."""
+        self._enqueue((path, line, None))
+
+    def write_record(self, path, timestamp_ms, line):
+        """Queue one JSON line for a structured log; its offset is indexed under `timestamp_ms`."""
+        self._enqueue((path, line, timestamp_ms))
+
+    def _enqueue(self, item):
+        with self.condition:
+            if len(self.queue) >= self.max_queue:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(item)
+            if len(self.queue) >= self.settings["flush_lines"]:
+                self.condition.notify()
+
+    def flush(self, close_files=False, timeout=5.0):
+        """
+        Block until every line queued so far is written and flushed.
+
+        :param close_files: Also close the open handles (e.g. before compressing old logs)
+        :return: False if the writer did not catch up within `timeout`
+        """
+        done = threading.Event()
+        with self.condition:
+            if not self.running:
+                return True
+            self.flush_requests.append((done, close_files))
+            self.condition.notify()
+        return done.wait(timeout)
+
+    def close(self):
+        self.flush(close_files=True)
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join(timeout=2)
+
+    def get_stats(self):
+        with self.condition:
+            return {"queued": len(self.queue), "dropped": self.dropped, "written": self.written,
+                    "open_files": len(self.handles)}
+
+    def _run(self):
+        interval = float(self.settings["flush_interval_s"])
+        while True:
+            with self.condition:
+                if self.running and not self.flush_requests and len(self.queue) < self.settings["flush_lines"]:
+                    self.condition.wait(timeout=interval)
+                batch, self.queue = self.queue, deque()
+                requests, self.flush_requests = self.flush_requests, []
+                running = self.running
+                dropped = self.dropped
+
+            try:
+                self._write_batch(batch)
+                now = time.monotonic()
+                if requests or not running or self.unflushed >= self.settings["flush_lines"] \
+                        or (self.unflushed and now - self.last_flush >= interval):
+                    self._flush_all(now)
+                self._close_idle(now, close_all=not running or any(close for _, close in requests))
+            except Exception as e:
+                log_exception(e, context="Log writer failure")
+            finally:
+                for done, _ in requests:
+                    done.set()
+
+            if dropped != self.reported_dropped:
+                print(f"[LogWriter] ⚠️ Log queue full; {dropped - self.reported_dropped} lines dropped "
+                      f"({dropped} total).")
+                self.reported_dropped = dropped
+            if not running:
+                return
+
+    def _write_batch(self, batch):
+        now = time.monotonic()
+        for path, line, timestamp_ms in batch:
+            handle = self.handles.get(path)
+            try:
+                if handle is None:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    handle = self.handles[path] = _OpenFile(path, structured=timestamp_ms is not None)
+                handle.write(line, timestamp_ms)
+                handle.last_write = now
+                self.unflushed += 1
+                self.written += 1
+            except Exception as e:
+                log_exception(e, context="Failed to write log line", extra_info={"file": path})
+
+    def _flush_all(self, now):
+        for path, handle in list(self.handles.items()):
+            try:
+                handle.flush()
+            except Exception as e:
+                log_exception(e, context="Failed to flush log file", extra_info={"file": path})
+                self._close(path)
+        self.unflushed = 0
+        self.last_flush = now
+
+    def _close_idle(self, now, close_all=False):
+        idle_close = float(self.settings["idle_close_s"])
+        for path, handle in list(self.handles.items()):
+            if close_all or now - handle.last_write >= idle_close:
+                self._close(path)
+
+    def _close(self, path):
+        self.handles.pop(path).close()
+
+
+class _OpenFile:
+    """An open log file; structured ones also track byte offsets and append to their time index."""
+
+    def __init__(self, path, structured=False):
+        self.structured = structured
+        self.last_write = 0.0
+        self.index = None
+        if structured:
+            self.file = open(path, "ab")
+            self.offset = self.file.seek(0, os.SEEK_END)
+            self.index = open(index_path(path), "ab")
+            self.last_indexed_ts = None
+        else:
+            self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, line, timestamp_ms=None):
+        if not self.structured:
+            self.file.write(line)
+            return
+        data = line.encode("utf-8")
+        if timestamp_ms is not None and (self.last_indexed_ts is None or timestamp_ms >= self.last_indexed_ts + 1000):
+            # Sparse: at most one entry per second of log time
+            self.index.write(pack_index_entry(timestamp_ms, self.offset))
+            self.last_indexed_ts = timestamp_ms
+        self.file.write(data)
+        self.offset += len(data)
+
+    def flush(self):
+        self.file.flush()  # Data before index, so an index entry never points past the data
+        if self.index:
+            self.index.flush()
+
+    def close(self):
+        for f in (self.file, self.index):
+            try:
+                if f:
+                    f.close()
+            except Exception:
+                pass
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer(settings=None):
+    """Process-wide writer, so every file has one open handle; `settings` only applies to the first call."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AsyncLogWriter(settings)
+            atexit.register(_writer.close)
+        return _writer
@@ -0,0 +1,161 @@
+# core/motion_gate.py
+
+"""
+Motion Gate - Skips plugin inference while a camera's scene is static.
+
+Each new frame is downscaled to a small grayscale thumbnail and compared with
+a running-average background. If the share of changed pixels inside the
+camera's ROI mask stays below a threshold, the heavy plugins are not
+dispatched. Plugins can opt out with an idle rate (e.g. fire detection at
+idle_fps 0.05, every 20 s on a static scene). After motion the gate stays open
+for `hold_s`, so detection does not stop the moment someone stands still.
+
+Config lives under "motion_gate" in config/default_settings.json.
+
+Author: ItsOji Team
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core.crash_logger import log_exception
+
+DEFAULT_MOTION_SETTINGS = {
+    "enabled": True,
+    "width": 160,                # Thumbnail width the comparison runs at
+    "pixel_threshold": 25,       # Grey-level change that counts a pixel as changed
+    "min_changed_ratio": 0.005,  # Share of ROI pixels that must change to open the gate
+    "background_alpha": 0.05,    # Running-average update rate of the background
+    "hold_s": 3.0,               # Keep the gate open this long after the last motion
+    "cameras": {},               # cam_id → {"roi": [[x, y], ...] normalised polygon, overrides...}
+    "plugins": {}                # plugin → {"idle_fps": rate while the scene is static}
+}
+
+
+def load_motion_settings(config_path="config/default_settings.json"):
+    settings = dict(DEFAULT_MOTION_SETTINGS)
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                settings.update(json.load(f).get("motion_gate", {}))
+        except Exception as e:
+            log_exception(e, context="Failed to load motion gate settings")
+    return settings
+
+
+def polygon_mask(polygon, width, height):
+    """uint8 mask (255 inside) of a polygon given in normalised [0, 1] coordinates."""
+    mask = np.zeros((height, width), dtype=np.uint8)
+    points = np.round(np.asarray(polygon, dtype=np.float32) * (width - 1, height - 1)).astype(np.int32)
+    cv2.fillPoly(mask, [points], 255)
+    return mask
+
+
+class _CameraState:
+    __slots__ = ("background", "mask", "mask_pixels", "last_motion", "changed_ratio", "last_seq")
+
+    def __init__(self):
+        self.background = None
+        self.mask = None
+        self.mask_pixels = 0
+        self.last_motion = 0.0
+        self.changed_ratio = 0.0
+        self.last_seq = None
+
+
+class MotionGate:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_MOTION_SETTINGS)
+        self.settings.update(settings if settings is not None else load_motion_settings())
+        self.lock = threading.Lock()
+        self.cameras = {}        # camera_id → _CameraState
+        self.idle_runs = {}      # (camera_id, plugin) → timestamp of last idle run
+
+    def _camera_setting(self, camera_id, key):
+        return self.settings["cameras"].get(str(camera_id), {}).get(key, self.settings.get(key))
+
+    def _thumbnail(self, frame):
+        h, w = frame.shape[:2]
+        width = min(int(self.settings["width"]), w)
+        height = max(1, round(h * width / w))
+        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def update(self, camera_id, frame, now=None, seq=None):
+        """
+        Feed a new frame and report whether the scene is active.
+
+        :param seq: Frame sequence ID; a frame offered again (e.g. a dispatch retried
+                    after the worker pool was full) is not blended into the background twice.
+        :return: True if motion was seen within the last hold_s seconds.
+        """
+        now = now or time.time()
+        with self.lock:
+            state = self.cameras.get(camera_id)
+            if state is not None and seq is not None and seq == state.last_seq:
+                return now - state.last_motion <= self._camera_setting(camera_id, "hold_s")
+        small = self._thumbnail(frame)
+        with self.lock:
+            state = self.cameras.get(camera_id)
+            if state is None:
+                state = self.cameras[camera_id] = _CameraState()
+            state.last_seq = seq
+
+            if state.background is None or state.background.shape != small.shape:
+                # First frame (or resolution change): nothing to compare against, so run
+                state.background = small.astype(np.float32)
+                roi = self._camera_setting(camera_id, "roi")
+                state.mask = polygon_mask(roi, small.shape[1], small.shape[0]) if roi else None
+                state.mask_pixels = cv2.countNonZero(state.mask) if roi else small.size
+                state.last_motion = now
+                return True
+
+            diff = cv2.absdiff(small, cv2.convertScaleAbs(state.background))
+            _, changed = cv2.threshold(diff, self.settings["pixel_threshold"], 255, cv2.THRESH_BINARY)
+            if state.mask is not None:
+                changed = cv2.bitwise_and(changed, state.mask)
+            state.changed_ratio = cv2.countNonZero(changed) / max(1, state.mask_pixels)
+            cv2.accumulateWeighted(small, state.background, self.settings["background_alpha"])
+
+            if state.changed_ratio >= self._camera_setting(camera_id, "min_changed_ratio"):
+                state.last_motion = now
+            return now - state.last_motion <= self._camera_setting(camera_id, "hold_s")
+
+    def filter_plugins(self, camera_id, plugin_names, frame, now=None, seq=None):
+        """Plugins allowed to be scheduled for this frame: all of them on motion, else only idle-rate ones."""
+        if not self.settings["enabled"] or frame is None:
+            return list(plugin_names)
+        now = now or time.time()
+        if self.update(camera_id, frame, now, seq):
+            return list(plugin_names)
+
+        allowed = []
+        for name in plugin_names:
+            idle_fps = float(self.settings["plugins"].get(name, {}).get("idle_fps", 0))
+            if idle_fps > 0 and now - self.idle_runs.get((camera_id, name), 0) >= 1.0 / idle_fps:
+                allowed.append(name)
+        return allowed
+
+    def mark_run(self, camera_id, plugin_names, now=None):
+        """Record plugins that were actually dispatched, so idle rates count real runs."""
+        now = now or time.time()
+        for name in plugin_names:
+            self.idle_runs[(camera_id, name)] = now
+
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            return {
+                cam_id: {
+                    "active": now - state.last_motion <= self._camera_setting(cam_id, "hold_s"),
+                    "changed_ratio": round(state.changed_ratio, 4)
+                }
+                for cam_id, state in self.cameras.items()
+            }
@@ -1,18 +1,59 @@
 import importlib
 import os
+import queue
 import threading
 from datetime import datetime
 import time
+from concurrent.futures import TimeoutError as FutureTimeout
 import cv2
 from PyQt5.QtWidgets import QMessageBox  # ✅ NEW: for popup alerts
 from core.crash_logger import log_exception
-from core.log_manager import LogManager
+from core.daemon_pool import DaemonThreadPool
+from core.frame_cache import FrameContext
+from core.inference_engine import get_inference_engine
+from core.log_manager import get_log_manager
+from core.motion_gate import MotionGate
+from core.plugin_recovery import PluginRecoverySupervisor
+from core.plugin_reloader import PluginHotReloader, reload_plugin_modules
+from core.profiler import get_profiler
+from core.zones import ZoneMap
+from core.scheduler import InferenceScheduler
 from core.watchdog import (
     report_plugin_result,
     reset_plugin_health,
     get_plugin_status
 )
-from PyQt5.QtCore import QTimer
+
+
+class FrameBatcher:
+    """Collects frames from several cameras that become ready within a short window into one batch."""
+
+    def __init__(self, window_ms=0, max_size=8):
+        self.window = window_ms / 1000.0
+        self.max_size = max(1, int(max_size))
+        self.pending = []
+        self.opened_at = None
+
+    def add(self, item, now=None):
+        if not self.pending:
+            self.opened_at = now or time.time()
+        self.pending.append(item)
+
+    def ready(self, now=None):
+        """True once the batch is full or its oldest frame has waited out the window."""
+        if not self.pending:
+            return False
+        now = now or time.time()
+        return len(self.pending) >= self.max_size or now - self.opened_at >= self.window
+
+    def drain(self, now=None):
+        """Remove and return up to max_size pending items."""
+        batch, self.pending = self.pending[:self.max_size], self.pending[self.max_size:]
+        self.opened_at = (now or time.time()) if self.pending else None
+        return batch
+
+    def __len__(self):
+        return len(self.pending)
 
 
 class PluginManager:
@@ -21,19 +62,69 @@ class PluginManager:
         self.plugins = {}
         self.plugin_locks = {}
         self.plugin_status = {}
-        self.logger = LogManager()
-        self.last_process_time = {}
+        self._logger = None
+        self.scheduler = InferenceScheduler()
+        self.motion_gate = MotionGate()
+        self.zones = ZoneMap()
+        # Plugins of one frame run concurrently here, each against its own deadline;
+        # daemon threads, so a call hung past its deadline cannot block app exit
+        self.plugin_executor = DaemonThreadPool(
+            max_workers=int(self.scheduler.settings["plugin_workers"]), thread_name_prefix="plugin"
+        )
+        self.execution_stats = {}  # plugin → {"runs", "deadline_misses", "late_dropped", "skipped_busy", "last_ms"}
+        # Call lock → start time of the call holding it. Keyed by lock, not plugin name: after
+        # recovery a call hung in the old instance must not mark the new instance busy
+        self.running_since = {}
+        self.batcher = FrameBatcher(
+            window_ms=self.scheduler.settings["batch_window_ms"],
+            max_size=self.scheduler.settings["max_batch_size"]
+        )
+        self.swap_lock = threading.Lock()  # Keeps plugins[name] and plugin_locks[name] consistent
+        self.recovery = PluginRecoverySupervisor(self)
+        self.reloader = PluginHotReloader(self)
+        self.profiler = get_profiler()
+        self.ui_events = queue.Queue()  # Filled off the Qt thread, drained by drain_ui_events()
         self.parent_ui = parent_ui  # ✅ Context for UI interaction
 
+    @property
+    def logger(self):
+        """The shared LogManager, created on first use: inference worker processes never log."""
+        if self._logger is None:
+            self._logger = get_log_manager()
+        return self._logger
+
+    @logger.setter
+    def logger(self, logger):
+        self._logger = logger
+
+    def _create_plugin(self, plugin_name):
+        """Import and construct a plugin instance (slow: may load models). Raises on failure."""
+        module_path = f"{self.plugin_folder}.{plugin_name}.plugin"
+        module = importlib.import_module(module_path)
+        plugin_class = getattr(module, "Plugin")
+        plugin_instance = plugin_class()
+        if getattr(plugin_instance, "model_spec", None):
+            # Shared, pooled ONNX sessions instead of one model per plugin
+            plugin_instance.model_handle = get_inference_engine().load(plugin_instance.model_spec)
+        return plugin_instance
+
+    def _install_plugin(self, plugin_name, plugin_instance, lock=None):
+        """
+        Atomically make plugin_instance the live one; returns the instance it replaced (or None).
+
+        :param lock: Call lock to keep (a hot reload hands the old instance's lock over
+                     together with its state); a fresh one by default
+        """
+        with self.swap_lock:
+            previous = self.plugins.get(plugin_name)
+            self.plugins[plugin_name] = plugin_instance
+            self.plugin_locks[plugin_name] = lock or threading.Lock()
+            self.plugin_status[plugin_name] = self.plugin_status.get(plugin_name, True)
+        return previous
+
     def load_plugin(self, plugin_name):
         try:
-            module_path = f"{self.plugin_folder}.{plugin_name}.plugin"
-            module = importlib.import_module(module_path)
-            plugin_class = getattr(module, "Plugin")
-            plugin_instance = plugin_class()
-            self.plugins[plugin_name] = plugin_instance
-            self.plugin_locks[plugin_name] = threading.Lock()
-            self.plugin_status[plugin_name] = True
+            self._install_plugin(plugin_name, self._create_plugin(plugin_name))
             print(f"[PluginManager] ✅ Loaded plugin: {plugin_name} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
             # ✅ Update dashboard
@@ -48,80 +139,282 @@ class PluginManager:
             )
 
     def attempt_plugin_recovery(self, plugin_name):
+        """Hand a STALLED plugin to the background recovery supervisor; never blocks the caller."""
+        self.recovery.request(plugin_name)
+
+    def recover_plugin(self, plugin_name):
+        """
+        Build a fresh instance and swap it in (runs on the recovery supervisor thread).
+
+        The stalled instance keeps serving until the swap; raises if the rebuild fails.
+        """
         print(f"[PluginManager] ♻️ Retrying plugin: {plugin_name}")
-        self.unload_plugin(plugin_name)
-        time.sleep(5)
-        self.load_plugin(plugin_name)
+        previous = self._install_plugin(plugin_name, self._create_plugin(plugin_name))
         reset_plugin_health(plugin_name)
         print(f"[PluginManager] 🔁 Plugin {plugin_name} reloaded and health reset.")
+        if previous is not None:
+            try:
+                previous.release()
+            except Exception as e:
+                log_exception(e, context=f"⚠️ Release failed for replaced plugin: {plugin_name}")
+        self.ui_events.put(("recovered", plugin_name))
 
-        # ✅ Dashboard hook
-        if hasattr(self.parent_ui, "update_plugin_status_label"):
-            self.parent_ui.update_plugin_status_label(plugin_name, True)
+    def reload_plugin(self, plugin_name, changed_paths=()):
+        """
+        Hot-swap a plugin after its files changed (runs on the reloader thread).
+
+        The old instance keeps serving while the new one is imported, built and
+        warmed up. The handover then waits for the old instance's current call:
+        holding its call lock, the new instance adopts its warm state and goes
+        live with that same lock, so the shared state is never used by two calls
+        at once. Raises if any step fails (TimeoutError if the old instance stays
+        busy past its deadline), leaving the old instance live.
+        """
+        package = f"{self.plugin_folder}.{plugin_name}"
+        reloaded = reload_plugin_modules(package, os.path.join(self.plugin_folder, plugin_name), changed_paths)
+        plugin_instance = self._create_plugin(plugin_name)
+        plugin_instance.warmup()
+
+        with self.swap_lock:
+            previous = self.plugins.get(plugin_name)
+            lock = self.plugin_locks.get(plugin_name)
+        if previous is None or lock is None:
+            self._install_plugin(plugin_name, plugin_instance)
+        else:
+            if not lock.acquire(timeout=self.plugin_timeout(plugin_name)):
+                raise TimeoutError(f"Plugin '{plugin_name}' is still busy; hot reload deferred")
+            try:
+                plugin_instance.adopt(previous)
+                self._install_plugin(plugin_name, plugin_instance, lock)
+            finally:
+                lock.release()
+        print(f"[PluginManager] 🔁 Hot-reloaded plugin: {plugin_name} (modules: {', '.join(reloaded) or 'none'})")
+        if previous is not None:
+            try:
+                previous.release()
+            except Exception as e:
+                log_exception(e, context=f"⚠️ Release failed for replaced plugin: {plugin_name}")
+
+    def drain_ui_events(self):
+        """Show dashboard updates and popups queued by background threads (call from the Qt thread)."""
+        while True:
+            try:
+                event, plugin_name = self.ui_events.get_nowait()
+            except queue.Empty:
+                return
+            if event != "recovered":
+                continue
+
+            # ✅ Dashboard hook
+            if hasattr(self.parent_ui, "update_plugin_status_label"):
+                self.parent_ui.update_plugin_status_label(plugin_name, True)
 
-        # ✅ Safe popup
-        def show_popup():
+            # ✅ Safe popup
             try:
                 if self.parent_ui:
                     QMessageBox.critical(
                         self.parent_ui,
                         "Plugin Auto-Recovered",
-                        f"⚠️ Plugin '{plugin_name}' failed 3 times and was auto-recovered successfully."
+                        f"⚠️ Plugin '{plugin_name}' failed repeatedly and was auto-recovered successfully."
                     )
             except Exception as e:
                 log_exception(e, context=f"❌ Popup failed for plugin: {plugin_name}")
 
-        QTimer.singleShot(0, show_popup)
+    def due_plugins(self, camera_id, frame=None, mark=True, seq=None):
+        """
+        Enabled plugins that should run on this camera now (all of them without a camera_id).
 
-    def apply_plugins(self, frame, camera_id=None):
-        results = {}
+        With a frame, the motion gate first drops plugins while the scene is static
+        (except those with an idle rate); the scheduler then applies its rate limits.
+        With mark=False the returned plugins are not charged against those limits
+        until mark_dispatched() is called, so a dispatch that fails costs nothing;
+        pass the frame's seq so retrying that frame does not feed the motion gate twice.
+        """
+        names = [name for name in list(self.plugins) if self.plugin_status.get(name, False)]
+        if not camera_id:
+            return names
+        names = self.motion_gate.filter_plugins(camera_id, names, frame, seq=seq)
+        if not names:
+            return []
+        due = self.scheduler.due_plugins(camera_id, names, mark=mark)
+        if mark:
+            self.motion_gate.mark_run(camera_id, due)
+        return due
+
+    def mark_dispatched(self, camera_id, plugin_names):
+        """Charge plugins from due_plugins(mark=False) to the scheduler and motion gate once dispatched."""
         now = time.time()
-        if camera_id:
-            last = self.last_process_time.get(camera_id, 0)
-            if now - last < 1.0:
-                return {}
-            self.last_process_time[camera_id] = now
+        self.scheduler.mark_run(camera_id, plugin_names, now)
+        self.motion_gate.mark_run(camera_id, plugin_names, now)
 
+    def prepare_frame(self, frame):
+        """Downscale a captured frame to the resolution plugins run at."""
         try:
-            resized = cv2.resize(frame, (640, 360))
+            return cv2.resize(frame, (640, 360))
         except Exception:
-            resized = frame
+            return frame
+
+    def prepare_job(self, camera_id, frame, plugin_names=None):
+        """
+        Build a run_batch() job from a native-resolution frame.
+
+        Unzoned plugins get the downscaled frame; plugins with a zone on this camera
+        get the zone cropped at native resolution (see core.zones).
+        """
+        with self.profiler.measure("resize", camera=camera_id):
+            prepared = self.prepare_frame(frame)
+        names = list(self.plugins) if plugin_names is None else plugin_names
+        zone_crops = self.zones.crops(camera_id, frame, names, (prepared.shape[1], prepared.shape[0]))
+        return (camera_id, prepared, plugin_names, zone_crops)
+
+    def apply_plugins(self, frame, camera_id=None):
+        due = self.due_plugins(camera_id, frame)
+        if not due:
+            return {}
+        results = self.run_batch([self.prepare_job(camera_id, frame, due)])[0]
+        self.log_results(camera_id, results)
+        self.scheduler.observe_results(camera_id, results)
+        return results
+
+    def log_results(self, camera_id, results):
+        """
+        Log one frame's {plugin_name: result} set; plugins never log themselves.
 
-        plugin_items = list(self.plugins.items())
+        Only called in the UI process (InferencePipeline publishes every result
+        set once), never from run_batch: in process mode run_batch runs in each
+        worker, and per-worker loggers would split the dedup/rate-limit state and
+        interleave writes to the same files.
+        """
+        for name, result in results.items():
+            with self.profiler.measure("log", plugin=name, camera=camera_id):
+                self.logger.log(name, result, camera_id=camera_id)
 
-        for name, plugin in plugin_items:
+    def run_plugins(self, resized, camera_id=None, only=None):
+        """Run the enabled plugins (or just those in `only`) on an already prepared frame."""
+        return self.run_batch([(camera_id, resized, only)])[0]
+
+    def run_batch(self, jobs):
+        """
+        Run plugins over prepared frames from several cameras.
+
+        Each plugin gets a single process_contexts() call covering every frame
+        that wants it, so model-backed plugins can infer the whole batch at once.
+        The FrameContexts are shared, so derived data (grayscale etc.) is
+        computed once per frame however many plugins use it.
+
+        :param jobs: List of (camera_id, prepared_frame, plugin_names or None for all[, zone_crops]),
+                     as built by prepare_job()
+        :return: List of {plugin_name: result} dicts, aligned with jobs
+        """
+        batch_results = [{} for _ in jobs]
+        contexts = [FrameContext(job[1], job[0]) for job in jobs]
+        zone_crops = [job[3] if len(job) > 3 and job[3] else {} for job in jobs]
+        zone_contexts = {}  # id(ZoneCrop) → FrameContext, shared by plugins on the same zone
+        wanted = {}  # plugin_name → indices of the jobs that want it
+        for idx, job in enumerate(jobs):
+            for name in (list(self.plugins) if job[2] is None else job[2]):
+                wanted.setdefault(name, []).append(idx)
+
+        def context_for(idx, name):
+            crop = zone_crops[idx].get(name)
+            if crop is None:
+                return contexts[idx]
+            ctx = zone_contexts.get(id(crop))
+            if ctx is None:
+                ctx = zone_contexts[id(crop)] = FrameContext(crop.frame, jobs[idx][0])
+            return ctx
+
+        pending = {}  # plugin_name → (future, indices, camera_ids, deadline)
+        for name, indices in wanted.items():
+            with self.swap_lock:
+                plugin = self.plugins.get(name)
+                lock = self.plugin_locks.get(name)
+            if plugin is None or lock is None:
+                continue
             if get_plugin_status(name) == "STALLED":
-                try:
-                    self.attempt_plugin_recovery(name)
-                    continue
-                except Exception as e:
-                    log_exception(e, context=f"❌ Retry failed for plugin: {name}")
-                    continue
+                # Skip it for now; a fresh instance is swapped in by the recovery supervisor
+                self.attempt_plugin_recovery(name)
+                continue
 
             if not self.plugin_status.get(name, False):
                 continue
 
-            try:
-                with self.plugin_locks[name]:
-                    result = plugin.process(resized)
-                    results[name] = result
+            started = self.running_since.get(lock)
+            if started is not None and time.time() - started > self.plugin_timeout(name):
+                # Previous call is still running past its deadline: skip rather than queue behind it
+                self._record_execution(name, "skipped_busy")
+                report_plugin_result(name, False)
+                continue
 
-                    if result is None:
-                        report_plugin_result(name, False)
-                    else:
-                        report_plugin_result(name, True)
+            inputs = [context_for(i, name) for i in indices]
+            future = self.plugin_executor.submit(self._call_plugin, name, plugin, lock, inputs)
+            pending[name] = (future, indices, [jobs[i][0] for i in indices], time.time() + self.plugin_timeout(name))
 
-                    self.logger.log(name, result)
-                    print(f"[PluginManager] Applied {name} on Cam {camera_id} at {datetime.now().strftime('%H:%M:%S')}")
+        for name, (future, indices, camera_ids, deadline) in pending.items():
+            try:
+                results = future.result(timeout=max(0.0, deadline - time.time()))
+                if len(results) != len(indices):
+                    raise ValueError(f"process_contexts returned {len(results)} results for {len(indices)} frames")
+            except FutureTimeout:
+                self._record_execution(name, "deadline_misses")
+                future.add_done_callback(lambda _, n=name: self._record_execution(n, "late_dropped"))
+                print(f"[PluginManager] ⏱️ {name} missed its {self.plugin_timeout(name)}s deadline on Cam {camera_ids}; result dropped.")
+                report_plugin_result(name, False)
+                continue
             except Exception as e:
                 log_exception(
                     e,
-                    context=f"⚠️ Plugin '{name}' failed on camera {camera_id}",
-                    extra_info={"plugin": name, "camera_id": camera_id}
+                    context=f"⚠️ Plugin '{name}' failed on cameras {camera_ids}",
+                    extra_info={"plugin": name, "camera_ids": camera_ids}
                 )
                 report_plugin_result(name, False)
+                continue
 
-        return results
+            for idx, camera_id, result in zip(indices, camera_ids, results):
+                crop = zone_crops[idx].get(name)
+                if crop is not None:
+                    result = crop.map_result(result)
+                batch_results[idx][name] = result
+                report_plugin_result(name, result is not None)
+                print(f"[PluginManager] Applied {name} on Cam {camera_id} at {datetime.now().strftime('%H:%M:%S')}")
+
+        return batch_results
+
+    def plugin_timeout(self, plugin_name):
+        """Deadline in seconds: scheduler.plugin_timeouts, else the plugin's `timeout`, else plugin_timeout_s."""
+        override = self.scheduler.settings["plugin_timeouts"].get(plugin_name)
+        if override is not None:
+            return float(override)
+        own = getattr(self.plugins.get(plugin_name), "timeout", None)
+        return float(own if own is not None else self.scheduler.settings["plugin_timeout_s"])
+
+    def _call_plugin(self, name, plugin, lock, contexts):
+        with lock:
+            if self.plugin_locks.get(name) is lock:
+                # Hot-reloaded while this call waited: the lock (and state) now belong to the new instance
+                plugin = self.plugins.get(name, plugin)
+            self.running_since[lock] = time.time()
+            started = time.perf_counter()
+            try:
+                return plugin.process_contexts(contexts)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.running_since.pop(lock, None)
+                self._record_execution(name, "runs", last_ms=elapsed * 1000)
+                # A batched call's latency is what each of its cameras waited
+                for camera_id in {ctx.camera_id for ctx in contexts}:
+                    self.profiler.record("process", elapsed, plugin=name, camera=camera_id)
+
+    def _record_execution(self, name, counter, last_ms=None):
+        stats = self.execution_stats.setdefault(
+            name, {"runs": 0, "deadline_misses": 0, "late_dropped": 0, "skipped_busy": 0, "last_ms": None}
+        )
+        stats[counter] += 1
+        if last_ms is not None:
+            stats["last_ms"] = round(last_ms, 2)
+
+    def get_execution_stats(self):
+        return {name: dict(stats) for name, stats in self.execution_stats.items()}
 
     def unload_plugin(self, plugin_name):
         if plugin_name in self.plugins:
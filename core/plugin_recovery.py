@@ -0,0 +1,91 @@
+# core/plugin_recovery.py
+
+"""
+Plugin Recovery Supervisor - Rebuilds STALLED plugins off the inference path.
+
+The inference path only calls request(); it then skips the stalled plugin and
+carries on with the others. A background thread waits out a jittered
+exponential backoff, builds a fresh plugin instance and has the PluginManager
+swap it in atomically. Failed rebuilds back off further instead of retrying in
+a tight loop.
+
+Author: ItsOji Team
+"""
+
+import threading
+import time
+
+from core.backoff import ExponentialBackoff
+from core.crash_logger import log_exception
+
+
+class PluginRecoverySupervisor:
+    def __init__(self, plugin_manager, base=5.0, cap=120.0):
+        self.plugin_manager = plugin_manager
+        self.base = base
+        self.cap = cap
+        self.pending = {}      # plugin → (next attempt time, ExponentialBackoff)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="plugin-recovery", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def request(self, plugin_name):
+        """Queue a plugin for recovery; returns immediately. Repeat calls while pending are no-ops."""
+        with self.condition:
+            if plugin_name in self.pending:
+                return
+            backoff = ExponentialBackoff(base=self.base, cap=self.cap)
+            self.pending[plugin_name] = (time.time() + backoff.next_delay(), backoff)
+            self.condition.notify_all()
+        print(f"[PluginRecovery] ♻️ Recovery scheduled for plugin: {plugin_name}")
+        self.start()
+
+    def is_pending(self, plugin_name):
+        with self.condition:
+            return plugin_name in self.pending
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    now = time.time()
+                    due = [name for name, (at, _) in self.pending.items() if at <= now]
+                    if due:
+                        break
+                    next_at = min((at for at, _ in self.pending.values()), default=None)
+                    self.condition.wait(timeout=None if next_at is None else next_at - now)
+                if not self.running:
+                    return
+
+            for name in due:
+                self._attempt(name)
+
+    def _attempt(self, name):
+        try:
+            self.plugin_manager.recover_plugin(name)
+        except Exception as e:
+            log_exception(e, context=f"❌ Retry failed for plugin: {name}", extra_info={"plugin": name})
+            with self.condition:
+                entry = self.pending.get(name)
+                if entry:
+                    delay = entry[1].next_delay()
+                    self.pending[name] = (time.time() + delay, entry[1])
+                    print(f"[PluginRecovery] ⚠️ {name} rebuild failed; retrying in {delay:.1f}s")
+            return
+        with self.condition:
+            self.pending.pop(name, None)
@@ -0,0 +1,224 @@
+# core/profiler.py
+
+"""
+Profiler - Latency histograms per pipeline stage, plugin and camera.
+
+Every measured step (resize, a plugin's process call, logging, overlay render,
+Qt emit/display) is recorded into an HDR-style histogram keyed by
+(stage, plugin, camera). Buckets are log-linear - 2^precision_bits linear
+sub-buckets per power of two - so recording is a bit_length(), a shift and a
+list increment, memory is fixed (~1k counters per key), and any percentile is
+reported within a few percent from 1 µs up to hours.
+
+The dashboard's "Latency Profile" window reads snapshot(); dump() writes the
+same rows to JSON (also done on shutdown when "dump_path" is set).
+
+Config lives under "profiler" in config/default_settings.json.
+
+Author: ItsOji Team
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from core.crash_logger import log_exception
+
+DEFAULT_PROFILER_SETTINGS = {
+    "enabled": True,
+    "precision_bits": 5,                  # 32 sub-buckets per power of two: ≤ ~3% relative error
+    "dump_path": "logs/profile.json"      # Written on shutdown ("" = don't)
+}
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def load_profiler_settings(config_path="config/default_settings.json"):
+    settings = dict(DEFAULT_PROFILER_SETTINGS)
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                settings.update(json.load(f).get("profiler", {}))
+        except Exception as e:
+            log_exception(e, context="Failed to load profiler settings")
+    return settings
+
+
+class LatencyHistogram:
+    """Log-linear histogram of integer microsecond latencies."""
+
+    def __init__(self, precision_bits=5):
+        self.bits = precision_bits
+        self.sub_count = 1 << precision_bits
+        self.half = self.sub_count >> 1
+        self.counts = [0] * ((64 - precision_bits) * self.half + self.sub_count)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value):
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.bits
+        return shift * self.half + (value >> shift)
+
+    def _bounds(self, index):
+        """[low, high) value range of a bucket."""
+        if index < self.sub_count:
+            return index, index + 1
+        shift = index // self.half - 1
+        mantissa = index - shift * self.half
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, value_us):
+        value = max(0, int(value_us))
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum_us += value
+        if self.min_us is None or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile(self, pct):
+        """Latency (µs) at or below which `pct` percent of samples fall; None when empty."""
+        if not self.total:
+            return None
+        target = max(1, int(round(self.total * pct / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    low, high = self._bounds(index)
+                    return min(self.max_us, max(self.min_us, (low + high - 1) // 2))
+        return self.max_us
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def summary(self):
+        """count/mean/min/max and percentiles, in milliseconds."""
+        summary = {
+            "count": self.total,
+            "mean_ms": round(self.sum_us / self.total / 1000, 3) if self.total else None,
+            "min_ms": round(self.min_us / 1000, 3) if self.min_us is not None else None,
+            "max_ms": round(self.max_us / 1000, 3) if self.total else None
+        }
+        for pct in PERCENTILES:
+            value = self.percentile(pct)
+            summary[f"p{pct:g}_ms"] = round(value / 1000, 3) if value is not None else None
+        return summary
+
+
+class Profiler:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_PROFILER_SETTINGS)
+        self.settings.update(settings if settings is not None else load_profiler_settings())
+        self.enabled = bool(self.settings["enabled"])
+        self.histograms = {}  # (stage, plugin, camera) → LatencyHistogram
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, stage, seconds, plugin=None, camera=None):
+        if not self.enabled:
+            return
+        key = (stage, plugin, None if camera is None else str(camera))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram(int(self.settings["precision_bits"]))
+            histogram.record(seconds * 1_000_000)
+
+    @contextmanager
+    def measure(self, stage, plugin=None, camera=None):
+        """Time the with-block into the (stage, plugin, camera) histogram."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, plugin, camera)
+
+    def snapshot(self, stage=None, plugin=None, camera=None):
+        """
+        Summary rows, optionally filtered, busiest total time first.
+
+        :return: List of {"stage", "plugin", "camera", "count", "mean_ms", "p50_ms", ...}
+        """
+        with self.lock:
+            items = [
+                (key, histogram.summary()) for key, histogram in self.histograms.items()
+                if (stage is None or key[0] == stage) and (plugin is None or key[1] == plugin)
+                and (camera is None or key[2] == str(camera))
+            ]
+        rows = [{"stage": key[0], "plugin": key[1], "camera": key[2], **summary} for key, summary in items]
+        rows.sort(key=lambda row: (row["mean_ms"] or 0) * row["count"], reverse=True)
+        return rows
+
+    def totals_by(self, field, stage=None):
+        """Histograms merged over everything but `field` ("stage", "plugin" or "camera")."""
+        position = ("stage", "plugin", "camera").index(field)
+        merged = {}
+        with self.lock:
+            for key, histogram in self.histograms.items():
+                if stage is not None and key[0] != stage:
+                    continue
+                total = merged.get(key[position])
+                if total is None:
+                    total = merged[key[position]] = LatencyHistogram(histogram.bits)
+                total.merge(histogram)
+        return {name: histogram.summary() for name, histogram in merged.items()}
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def dump(self, path=None):
+        """Write the snapshot as JSON; returns the path written (None if there was nowhere to write)."""
+        path = path or self.settings.get("dump_path")
+        if not path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            report = {
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "window_s": round(time.time() - self.started_at, 1),
+                "by_plugin": self.totals_by("plugin", stage="process"),
+                "rows": self.snapshot()
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"[Profiler] ✅ Latency profile written to {path}")
+            return path
+        except Exception as e:
+            log_exception(e, context="Failed to write latency profile", extra_info={"path": path})
+            return None
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler(settings=None):
+    """Process-wide profiler; `settings` only applies to the first call."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler(settings)
+        return _profiler
@@ -0,0 +1,141 @@
+# core/scheduler.py
+
+"""
+Inference Scheduler - Decides which plugins run on which camera, and when.
+
+Replaces the fixed one-frame-per-second-per-camera throttle with:
+  - configurable target rates per camera and per plugin,
+  - a priority boost for cameras that produced a detection recently,
+  - AIMD back-off of every rate when the CPU is saturated, recovering
+    gradually once load drops.
+
+Config lives under "scheduler" in config/default_settings.json.
+
+Author: ItsOji Team
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from core.crash_logger import log_exception
+
+DEFAULT_SCHEDULER_SETTINGS = {
+    "tick_ms": 100,              # How often the app polls cameras for due work
+    "default_camera_fps": 1.0,   # Inference rate per camera
+    "cameras": {},               # cam_id → fps override
+    "plugins": {},               # plugin → max fps on any single camera
+    "priority_boost": 3.0,       # Rate multiplier after a detection on that camera
+    "priority_hold_s": 10.0,     # How long the boost lasts
+    "cpu_high": 85.0,            # Above this, scale all rates down
+    "cpu_low": 60.0,             # Below this, scale rates back up
+    "min_scale": 0.1,
+    "cpu_sample_s": 1.0,
+    "batch_window_ms": 0,        # Extra wait to group frames from several cameras (0 = one tick)
+    "max_batch_size": 8,         # Most frames handed to a plugin's process_batch() at once
+    "plugin_timeout_s": 5.0,     # Default per-plugin deadline for one call
+    "plugin_timeouts": {},       # plugin → deadline override in seconds
+    "plugin_workers": 8          # Threads running the plugins of a batch concurrently
+}
+
+
+def load_scheduler_settings(config_path="config/default_settings.json"):
+    settings = dict(DEFAULT_SCHEDULER_SETTINGS)
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                settings.update(json.load(f).get("scheduler", {}))
+        except Exception as e:
+            log_exception(e, context="Failed to load scheduler settings")
+    return settings
+
+
+def has_detection(result):
+    """True if a plugin result reports something present (any truthy *_detected / face_recognized flag)."""
+    if not isinstance(result, dict):
+        return False
+    return any(v is True and (k.endswith("_detected") or k == "face_recognized") for k, v in result.items())
+
+
+class InferenceScheduler:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_SCHEDULER_SETTINGS)
+        self.settings.update(settings if settings is not None else load_scheduler_settings())
+        self.lock = threading.Lock()
+        self.last_run = {}        # (camera_id, plugin) → timestamp
+        self.boost_until = {}     # camera_id → timestamp
+        self.load_scale = 1.0
+        self.last_cpu_sample = 0.0
+        self.latest_cpu = 0.0
+
+    @property
+    def tick_ms(self):
+        return int(self.settings["tick_ms"])
+
+    def _update_load_scale(self, now):
+        """AIMD: halve on saturation, recover by 10% of full rate per sample when idle enough."""
+        if now - self.last_cpu_sample < self.settings["cpu_sample_s"]:
+            return
+        self.last_cpu_sample = now
+        try:
+            self.latest_cpu = psutil.cpu_percent(interval=None)
+        except Exception:
+            return
+        if self.latest_cpu > self.settings["cpu_high"]:
+            self.load_scale = max(self.settings["min_scale"], self.load_scale * 0.5)
+        elif self.latest_cpu < self.settings["cpu_low"]:
+            self.load_scale = min(1.0, self.load_scale + 0.1)
+
+    def target_fps(self, camera_id, plugin_name, now=None):
+        now = now or time.time()
+        fps = float(self.settings["cameras"].get(str(camera_id), self.settings["default_camera_fps"]))
+        if self.boost_until.get(camera_id, 0) > now:
+            fps *= self.settings["priority_boost"]
+        plugin_cap = self.settings["plugins"].get(plugin_name)
+        if plugin_cap is not None:
+            fps = min(fps, float(plugin_cap))
+        return fps * self.load_scale
+
+    def due_plugins(self, camera_id, plugin_names, now=None, mark=True):
+        """
+        Return the plugins that should run on this camera now.
+
+        :param mark: Also record them as run. Pass False when the dispatch may
+                     still fail, and call mark_run() once it has succeeded.
+        :return: List of plugin names (empty when nothing is due).
+        """
+        now = now or time.time()
+        due = []
+        with self.lock:
+            self._update_load_scale(now)
+            for name in plugin_names:
+                fps = self.target_fps(camera_id, name, now)
+                if fps <= 0:
+                    continue
+                if now - self.last_run.get((camera_id, name), 0) >= 1.0 / fps:
+                    if mark:
+                        self.last_run[(camera_id, name)] = now
+                    due.append(name)
+        return due
+
+    def mark_run(self, camera_id, plugin_names, now=None):
+        """Record plugins as run on this camera, starting their next rate interval."""
+        now = now or time.time()
+        with self.lock:
+            for name in plugin_names:
+                self.last_run[(camera_id, name)] = now
+
+    def observe_results(self, camera_id, results, now=None):
+        """Boost a camera's rate for `priority_hold_s` after any plugin reports a detection."""
+        if any(has_detection(result) for result in (results or {}).values()):
+            self.boost_until[camera_id] = (now or time.time()) + self.settings["priority_hold_s"]
+
+    def get_stats(self):
+        return {
+            "load_scale": round(self.load_scale, 2),
+            "cpu": self.latest_cpu,
+            "boosted_cameras": [cid for cid, until in self.boost_until.items() if until > time.time()]
+        }
@@ -0,0 +1,106 @@
+# core/shm_transport.py
+
+"""
+Shared-Memory Frame Transport - Ring buffer slabs that worker processes can attach to.
+
+SharedFrameRingBuffer is a drop-in FrameRingBuffer whose slots, sequence IDs and
+timestamps live in one multiprocessing.shared_memory block. The capture thread
+writes into it exactly as before; inference workers attach to the block by name
+through SharedFrameView and read frames zero-copy.
+
+Author: ItsOji Team
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+
+from core.frame_buffer import FrameRingBuffer, EMPTY_SEQ
+from core.crash_logger import log_exception
+
+
+def _map_layout(buf, capacity, shape, dtype):
+    """Map (seqs, timestamps, slots) arrays onto a shared buffer."""
+    seqs = np.ndarray((capacity,), dtype=np.int64, buffer=buf, offset=0)
+    timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=buf, offset=capacity * 8)
+    slots = np.ndarray((capacity,) + tuple(shape), dtype=dtype, buffer=buf, offset=capacity * 16)
+    return seqs, timestamps, slots
+
+
+class SharedFrameRingBuffer(FrameRingBuffer):
+    """FrameRingBuffer backed by a shared-memory slab."""
+
+    def __init__(self, capacity=4):
+        super().__init__(capacity)
+        self.shm = None
+        self._descriptor = None
+
+    def _allocate(self, shape, dtype):
+        self.close()
+        dtype = np.dtype(dtype)
+        size = self.capacity * 16 + self.capacity * int(np.prod(shape)) * dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.seqs, self.timestamps, self.slots = _map_layout(self.shm.buf, self.capacity, shape, dtype)
+        self.seqs.fill(EMPTY_SEQ)
+        self._descriptor = {
+            "name": self.shm.name,
+            "capacity": self.capacity,
+            "shape": tuple(shape),
+            "dtype": dtype.str,
+        }
+
+    def describe(self):
+        """Return the attach descriptor for worker processes, or None before the first frame."""
+        return self._descriptor
+
+    def close(self):
+        """Release and unlink the current slab."""
+        if self.shm is None:
+            return
+        shm = self.shm
+        self.shm = None
+        self._descriptor = None
+        self.slots = None
+        self.seqs = np.full(self.capacity, EMPTY_SEQ, dtype=np.int64)
+        self.timestamps = np.zeros(self.capacity, dtype=np.float64)
+        self.latest_seq = EMPTY_SEQ
+        try:
+            shm.close()
+        except BufferError:
+            pass  # A reader still holds a view; the mapping goes away with it
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log_exception(e, context="SharedFrameRingBuffer unlink failed")
+
+
+class SharedFrameView:
+    """Read-only, zero-copy view of a SharedFrameRingBuffer from another process."""
+
+    def __init__(self, descriptor):
+        self.name = descriptor["name"]
+        # Workers are spawned by multiprocessing and share the owner's resource tracker,
+        # so attaching here does not register a second unlink.
+        self.shm = shared_memory.SharedMemory(name=self.name)
+        self.seqs, self.timestamps, self.slots = _map_layout(
+            self.shm.buf, descriptor["capacity"], descriptor["shape"], np.dtype(descriptor["dtype"])
+        )
+
+    def frame_at(self, seq):
+        """Return the frame published as `seq`, or None if it was already overwritten."""
+        idx = seq % len(self.seqs)
+        if self.seqs[idx] != seq:
+            return None
+        return self.slots[idx]
+
+    def is_current(self, seq):
+        """True while the slot of `seq` has not been reused by the writer."""
+        return self.seqs[seq % len(self.seqs)] == seq
+
+    def close(self):
+        self.seqs = self.timestamps = self.slots = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
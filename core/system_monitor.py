@@ -3,7 +3,7 @@ import time
 import psutil
 import os
 from datetime import datetime
-from core.log_manager import LogManager
+from core.log_manager import get_log_manager
 from core.crash_logger import log_exception
 
 FALLBACK_LOG = "logs/system_health.log"
@@ -25,7 +25,7 @@ class SystemMonitor:
         self.latest_status = "OK"
 
         try:
-            self.log_manager = LogManager()
+            self.log_manager = get_log_manager()
         except Exception as e:
             log_exception(e, "SystemMonitor: Failed to load LogManager")
 
@@ -0,0 +1,152 @@
+# core/zones.py
+
+"""
+Zones - Per-camera, per-plugin polygon regions of interest.
+
+A plugin with a zone on a camera does not get the whole downscaled frame.
+It gets the zone's bounding box, cropped from the native-resolution frame,
+so small far-away objects keep their pixels. Pixels outside the polygon are
+blanked. Boxes in the plugin's result are mapped back into the coordinates of
+the normal prepared frame, so consumers see one coordinate system.
+
+Config lives under "zones" in config/default_settings.json:
+    "zones": {"ip_1": {"intrusion_detection": {"name": "gate", "polygon": [[0.1, 0.2], ...]}}}
+Polygons use normalised [0, 1] coordinates; a bare point list is also accepted.
+The plugin key "*" applies a zone to every plugin on that camera.
+
+Author: ItsOji Team
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core.crash_logger import log_exception
+
+
+def load_zone_settings(config_path="config/default_settings.json"):
+    if Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f).get("zones", {})
+        except Exception as e:
+            log_exception(e, context="Failed to load zone settings")
+    return {}
+
+
+class Zone:
+    def __init__(self, name, polygon, mask_outside=True):
+        self.name = name
+        self.polygon = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+        self.mask_outside = mask_outside
+
+    def pixel_polygon(self, width, height):
+        return np.round(self.polygon * (width - 1, height - 1)).astype(np.int32)
+
+    def bbox(self, width, height):
+        """(x0, y0, x1, y1) pixel bounding box, clipped to the frame."""
+        points = self.pixel_polygon(width, height)
+        x0, y0 = np.clip(points.min(axis=0), 0, (width - 1, height - 1))
+        x1, y1 = np.clip(points.max(axis=0) + 1, 1, (width, height))
+        return int(x0), int(y0), int(x1), int(y1)
+
+
+class ZoneCrop:
+    """A zone's crop of one frame plus the affine map back to prepared-frame coordinates."""
+
+    __slots__ = ("zone", "frame", "sx", "sy", "ox", "oy")
+
+    def __init__(self, zone, frame, sx, sy, ox, oy):
+        self.zone = zone
+        self.frame = frame
+        self.sx, self.sy, self.ox, self.oy = sx, sy, ox, oy
+
+    def map_point(self, x, y):
+        return x * self.sx + self.ox, y * self.sy + self.oy
+
+    def map_result(self, result):
+        """Copy of a plugin result with its boxes moved into prepared-frame coordinates."""
+        if not isinstance(result, dict):
+            return result
+        mapped = dict(result)
+        mapped["zone"] = self.zone.name
+        if isinstance(result.get("boxes"), list):
+            # [x1, y1, x2, y2, ...extra] (inference engine detections)
+            mapped["boxes"] = [
+                [*self.map_point(b[0], b[1]), *self.map_point(b[2], b[3]), *b[4:]]
+                for b in result["boxes"]
+            ]
+        if isinstance(result.get("faces"), list):
+            # box = [x, y, w, h] (face recognition)
+            faces = []
+            for face in result["faces"]:
+                face = dict(face)
+                x, y, w, h = face["box"]
+                fx, fy = self.map_point(x, y)
+                face["box"] = [int(round(fx)), int(round(fy)), int(round(w * self.sx)), int(round(h * self.sy))]
+                faces.append(face)
+            mapped["faces"] = faces
+        return mapped
+
+
+class ZoneMap:
+    def __init__(self, settings=None):
+        self.zones = {}  # cam_id → {plugin: Zone}
+        for cam_id, plugins in (settings if settings is not None else load_zone_settings()).items():
+            for plugin, spec in plugins.items():
+                if isinstance(spec, dict):
+                    zone = Zone(spec.get("name", plugin), spec["polygon"], spec.get("mask_outside", True))
+                else:
+                    zone = Zone(plugin, spec)
+                self.zones.setdefault(str(cam_id), {})[plugin] = zone
+
+    def get(self, camera_id, plugin_name):
+        cam_zones = self.zones.get(str(camera_id))
+        if not cam_zones:
+            return None
+        return cam_zones.get(plugin_name) or cam_zones.get("*")
+
+    def crops(self, camera_id, frame, plugin_names, prepared_size, max_size=None):
+        """
+        Crop the native frame for every zoned plugin.
+
+        :param prepared_size: (width, height) of the frame unzoned plugins get
+        :param max_size: (width, height) a crop is shrunk to fit if larger (default prepared_size)
+        :return: {plugin_name: ZoneCrop}; plugins sharing a zone share the crop
+        """
+        if str(camera_id) not in self.zones:
+            return {}
+        height, width = frame.shape[:2]
+        max_w, max_h = max_size or prepared_size
+        to_prep_x, to_prep_y = prepared_size[0] / width, prepared_size[1] / height
+
+        crops, by_zone = {}, {}
+        for name in plugin_names:
+            zone = self.get(camera_id, name)
+            if zone is None:
+                continue
+            crop = by_zone.get(id(zone))
+            if crop is None:
+                x0, y0, x1, y1 = zone.bbox(width, height)
+                region = frame[y0:y1, x0:x1]
+                if zone.mask_outside:
+                    mask = np.zeros(region.shape[:2], dtype=np.uint8)
+                    cv2.fillPoly(mask, [(zone.pixel_polygon(width, height) - (x0, y0)).astype(np.int32)], 255)
+                    region = cv2.bitwise_and(region, region, mask=mask)
+                else:
+                    region = region.copy()  # Never hand plugins a view into the camera ring
+
+                crop_w, crop_h = region.shape[1], region.shape[0]
+                scale = min(1.0, max_w / crop_w, max_h / crop_h)
+                if scale < 1.0:
+                    size = (max(1, int(crop_w * scale)), max(1, int(crop_h * scale)))
+                    region = cv2.resize(region, size, interpolation=cv2.INTER_AREA)
+                crop = by_zone[id(zone)] = ZoneCrop(
+                    zone, region,
+                    sx=to_prep_x * crop_w / region.shape[1], sy=to_prep_y * crop_h / region.shape[0],
+                    ox=x0 * to_prep_x, oy=y0 * to_prep_y
+                )
+            crops[name] = crop
+        return crops
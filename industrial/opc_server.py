@@ -25,6 +25,8 @@ class OPCUAServer:
         self.idx = None
         self.objects = None
         self.variables = {}  # OPC variable storage
+        self.camera_metrics_obj = None
+        self.camera_nodes = {}  # cam_id → (camera object node, {metric: variable node})
 
     def setup(self):
         """Set up OPC UA server with EyeQ nodes."""
@@ -51,10 +53,31 @@ class OPCUAServer:
         self.variables["FaceRecognized"] = plugin_obj.add_variable(self.idx, "FaceRecognized", False)
         self.variables["IntrusionDetected"] = plugin_obj.add_variable(self.idx, "IntrusionDetected", False)
 
+        # Per-camera capture metrics (nodes are created as cameras appear)
+        self.camera_metrics_obj = self.objects.add_object(self.idx, "CameraMetrics")
+        self.camera_nodes = {}
+
         # Make all writable
         for var in self.variables.values():
             var.set_writable()
 
+    def publish_camera_metrics(self, metrics):
+        """Mirror CameraManager.get_metrics() under CameraMetrics/<cam_id>/<metric>."""
+        if self.camera_metrics_obj is None:
+            return
+        for cam_id, values in metrics.items():
+            if cam_id not in self.camera_nodes:
+                self.camera_nodes[cam_id] = (self.camera_metrics_obj.add_object(self.idx, str(cam_id)), {})
+            cam_obj, nodes = self.camera_nodes[cam_id]
+            for key, value in values.items():
+                if value is None:
+                    continue
+                node = nodes.get(key)
+                if node is None:
+                    node = nodes[key] = cam_obj.add_variable(self.idx, key, value)
+                else:
+                    node.set_value(value)
+
     def set_variable(self, name, value):
         if name in self.variables:
             self.variables[name].set_value(value)
@@ -5,6 +5,7 @@ import sys
 import os
 import subprocess
 import threading
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from datetime import datetime
@@ -22,6 +23,8 @@ from core.report_manager import ReportManager
 from core.crash_logger import log_exception
 from industrial.opc_server import OPCUAServer
 from core.nvr_manager import NVRManager  # ✅ NVR Manager
+from core.inference_pool import InferenceWorkerPool
+from core.inference_pipeline import InferencePipeline
 
 class EyeQEnterpriseApp:
 
@@ -37,8 +40,16 @@ class EyeQEnterpriseApp:
         except FileNotFoundError:
             print("[UI] Theme file not found. Proceeding with default style.")
 
-        self.camera_manager = CameraManager()
+        self.settings = self._load_settings()
+        inference_cfg = self.settings.get("inference", {})
+        use_workers = inference_cfg.get("mode") == "process"
+
+        self.camera_manager = CameraManager(shared_memory=use_workers)
         self.plugin_manager = PluginManager(parent_ui=None)  # ⏳ temp placeholder
+        self.inference_pool = None
+        if use_workers:
+            self.inference_pool = InferenceWorkerPool(workers=inference_cfg.get("workers", 0))
+            self.inference_pool.start()
         self.alert_manager = AlertManager()
         self.report_manager = ReportManager()
 
@@ -55,9 +66,10 @@ class EyeQEnterpriseApp:
         self.live_view = LiveView()
 
         self.plugin_manager.load_all_plugins()
+        self.plugin_manager.reloader.start()  # Swap in edited plugins without restarting
         self._setup_all_cameras()
+        self.camera_generation = self.camera_manager.generation
 
-        working_cams = sum(1 for cam in self.camera_manager.cameras.values() if cam.frame is not None)
         live_cams = self.live_view.camera_labels if hasattr(self.live_view, "camera_labels") else {}
 
         self.dashboard.set_camera_count(len(live_cams))
@@ -66,8 +78,17 @@ class EyeQEnterpriseApp:
             live_cams
         )
 
+        # One inference pipeline feeds both alerting and the LiveView overlays
+        self.pipeline = InferencePipeline(
+            self.camera_manager, self.plugin_manager,
+            inference_pool=self.inference_pool,
+            workers=inference_cfg.get("threads", 4)
+        )
+        self.alert_subscription = self.pipeline.bus.subscribe("alerts")
+
         self.live_view.set_camera_manager(self.camera_manager)
         self.live_view.set_plugin_manager(self.plugin_manager)
+        self.live_view.set_result_bus(self.pipeline.bus)
         self.live_view.set_alert_manager(self.alert_manager)
         self.live_view.set_alerts_page(self.alerts_page)
 
@@ -100,11 +121,17 @@ class EyeQEnterpriseApp:
 
         self.opc_server = OPCUAServer()
         threading.Thread(target=self.opc_server.start, daemon=True).start()
+        self.dashboard.set_camera_manager(self.camera_manager)
+
+        self.metrics_timer = QTimer()
+        self.metrics_timer.timeout.connect(self.export_camera_metrics)
+        self.metrics_timer.start(5000)
 
         self.heartbeat_timer = QTimer()
         self.heartbeat_timer.timeout.connect(self.log_heartbeat)
         self.heartbeat_timer.start(600_000)
 
+        self.pipeline.start()
         self.timer = QTimer()
         self.timer.timeout.connect(self.process_frames)
         self.timer.start(500)
@@ -112,8 +139,17 @@ class EyeQEnterpriseApp:
         self.run_log_maintenance()
 
 
+    def _load_settings(self):
+        try:
+            with open("config/default_settings.json", "r") as f:
+                return json.load(f)
+        except Exception as e:
+            log_exception(e, context="Failed to load default_settings.json")
+            return {}
+
     def _setup_all_cameras(self):
-        self.camera_manager.auto_initialize_all_cameras()
+        # Discovery runs in the background; cameras attach as they connect
+        self.camera_manager.auto_initialize_all_cameras(wait_for_all=False)
 
         # ✅ NVR Support via Config
         try:
@@ -122,10 +158,11 @@ class EyeQEnterpriseApp:
             nvr_cfg = config.get("nvr_settings", {})
             self.nvr_manager = NVRManager(nvr_cfg)
             if self.nvr_manager.connect_to_nvr():
-                for ch in range(nvr_cfg.get("channel_count", 0)):
-                    stream_url = self.nvr_manager.get_channel_stream_url(ch)
-                    cam_id = f"nvr_{ch}"
-                    self.camera_manager.add_camera(cam_id, "nvr", stream_url)
+                channels = [
+                    (f"nvr_{ch}", "nvr", self.nvr_manager.get_channel_stream_url(ch))
+                    for ch in range(nvr_cfg.get("channel_count", 0))
+                ]
+                self.camera_manager.connect_async(channels)
         except Exception as e:
             log_exception(e, context="NVR camera load failure")
 
@@ -137,35 +174,54 @@ class EyeQEnterpriseApp:
             print(f"[MainApp] ⚠️ Failed to show LiveView: {e}")
         self.live_view.refresh_camera_grid()
 
+    def _refresh_camera_views(self):
+        """Rebuild the grid and dashboard overview after cameras attached or were removed."""
+        self.camera_generation = self.camera_manager.generation
+        self.live_view.refresh_camera_grid()
+        live_cams = self.live_view.camera_labels
+        self.dashboard.set_camera_count(len(live_cams))
+        self.dashboard.update_cameras_overview(dict(self.camera_manager.cameras), live_cams)
+        self.window.camera_labels = {idx: label for idx, label in enumerate(live_cams.values())}
+
     def process_frames(self):
-        for cam_id in self.camera_manager.cameras:
-            frame = self.camera_manager.get_frame(cam_id)
-            if frame is None:
-                continue
+        """Qt-thread tick: refresh views on camera changes and publish alerts from the pipeline."""
+        if self.camera_manager.generation != self.camera_generation:
+            self._refresh_camera_views()
+        self.plugin_manager.drain_ui_events()  # Recovery notices from the background supervisor
+
+        for event in self.alert_subscription.poll():
             try:
-                plugin_results = self.plugin_manager.apply_plugins(frame, camera_id=cam_id)
-                self.alert_manager.handle_plugin_results(cam_id, plugin_results)
-
-                for plugin, result in plugin_results.items():
-                    alert = {
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "camera_id": cam_id,
-                        "plugin_name": plugin,
-                        "detection_info": str(result),
-                        "severity": "High"
-                    }
-                    if self.alerts_page:
-                        self.alerts_page.add_alert_entry(alert)
-                    if self.dashboard:
-                        self.dashboard.add_alert_entry(alert)
+                self._handle_plugin_results(event.camera_id, event.results)
             except Exception as e:
                 log_exception(
                     e,
                     context="Plugin frame processing failure",
-                    extra_info={"camera_id": cam_id}
+                    extra_info={"camera_id": event.camera_id}
                 )
                 if self.window:
-                    self.window.update_status(f"⚠️ Plugin crash for Cam {cam_id}")
+                    self.window.update_status(f"⚠️ Plugin crash for Cam {event.camera_id}")
+
+    def _handle_plugin_results(self, cam_id, plugin_results):
+        self.alert_manager.handle_plugin_results(cam_id, plugin_results)
+
+        for plugin, result in plugin_results.items():
+            alert = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "camera_id": cam_id,
+                "plugin_name": plugin,
+                "detection_info": str(result),
+                "severity": "High"
+            }
+            if self.alerts_page:
+                self.alerts_page.add_alert_entry(alert)
+            if self.dashboard:
+                self.dashboard.add_alert_entry(alert)
+
+    def export_camera_metrics(self):
+        try:
+            self.opc_server.publish_camera_metrics(self.camera_manager.get_metrics())
+        except Exception as e:
+            log_exception(e, context="Camera metrics OPC UA export failure")
 
     def log_heartbeat(self):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -195,8 +251,15 @@ class EyeQEnterpriseApp:
 
     def shutdown(self):
         print("[EyeQEnterpriseApp] Shutting down...")
+        self.pipeline.stop()
+        self.plugin_manager.recovery.stop()
+        self.plugin_manager.reloader.stop()
+        self.plugin_manager.plugin_executor.shutdown(wait=False, cancel_futures=True)
         self.camera_manager.stop_all_cameras()
+        if self.inference_pool:
+            self.inference_pool.stop()
         self.plugin_manager.unload_all_plugins()
+        self.plugin_manager.profiler.dump()
 
     def _init_system_monitoring(self):
         try:
@@ -210,6 +273,7 @@ class EyeQEnterpriseApp:
         print("[Industrial] Placeholder for OPC/Modbus setup.")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Inference workers under PyInstaller builds
     try:
         app = EyeQEnterpriseApp()
         app.run()
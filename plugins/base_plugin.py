@@ -4,12 +4,25 @@ Base Plugin Class - Defines the standard interface for all AI plugins.
 Author: ItsOji Team
 """
 
+import numpy as np
+
+
 class BasePlugin:
     """Abstract base class for all AI plugins."""
 
+    # Model-backed plugins declare their ONNX model here instead of loading it
+    # themselves, e.g. {"path": "models/x.onnx", "input_size": (640, 640)}.
+    # PluginManager attaches a shared core.inference_engine.ModelHandle as
+    # self.model_handle (None when onnxruntime or the model file is missing).
+    model_spec = None
+
+    # Seconds a process call may take before its result is dropped and counted
+    # as a failure (None = scheduler "plugin_timeout_s").
+    timeout = None
+
     def __init__(self):
         """Initialise the plugin."""
-        pass
+        self.model_handle = None
 
     def load_model(self):
         """
@@ -18,15 +31,66 @@ class BasePlugin:
         """
         raise NotImplementedError("Plugins must implement load_model() method.")
 
-    def process(self, frame):
+    def process(self, frame, camera_id=None):
         """
         Process a video frame and return detection results.
         
         :param frame: Input video frame (OpenCV BGR format)
+        :param camera_id: Camera the frame came from (optional)
         :return: Detection results (dict or list depending on plugin)
         """
         raise NotImplementedError("Plugins must implement process() method.")
 
+    def process_batch(self, frames, camera_ids):
+        """
+        Process frames from several cameras in one call.
+
+        Model-backed plugins can override this to run a single vectorized
+        inference over the whole batch. The default loops over process().
+        Frames may differ in shape: a plugin with a zone on a camera gets that
+        zone's crop (see core.zones), so resize or group frames before stacking
+        them into one tensor.
+
+        :param frames: List of input frames; full frames share the prepared size, zone crops do not
+        :param camera_ids: Camera ID of each frame, in the same order
+        :return: List of detection results, one per frame, in the same order
+        """
+        return [self.process(frame, camera_id) for frame, camera_id in zip(frames, camera_ids)]
+
+    def process_contexts(self, contexts):
+        """
+        Process a batch of core.frame_cache.FrameContext objects.
+
+        Override this to reuse the shared per-frame grayscale/equalized/resized
+        variants instead of recomputing them. The default calls process_batch().
+
+        :param contexts: List of FrameContext (frame + camera_id + derived-data cache)
+        :return: List of detection results, one per context, in the same order
+        """
+        return self.process_batch([ctx.frame for ctx in contexts], [ctx.camera_id for ctx in contexts])
+
+    def adopt(self, previous):
+        """
+        Take over warm state from the instance this one replaces on a hot reload.
+
+        Called after warmup(), just before this instance goes live, with the
+        call lock of `previous` held: no call is running on it, and this
+        instance inherits the same lock. The default keeps nothing.
+
+        :param previous: Plugin instance being replaced
+        """
+        pass  # Optional to implement
+
+    def warmup(self):
+        """
+        Run once in the background before a hot-reloaded instance goes live,
+        so its first real frame does not pay for lazy initialisation.
+        The default pushes one blank batch through the shared model, if any.
+        """
+        if self.model_handle is not None:
+            height, width = self.model_handle.input_size
+            self.model_handle.run(np.zeros((1, 3, height, width), dtype=np.float32))
+
     def release(self):
         """
         Release any resources (e.g., model, session) when the plugin is unloaded.
@@ -0,0 +1,291 @@
+"""
+Face Gallery - Embedding matrix with vectorized nearest-neighbour search.
+
+Every known face is one L2-normalised float32 row in a contiguous matrix, so
+matching a batch of faces against the whole watchlist is a single BLAS matmul
+plus a top-k partition. Identities can be added or removed at any time without
+retraining. Large galleries can switch on a coarse IVF index (k-means cells,
+probe the nearest few) to search only a fraction of the rows.
+
+The default embedding is a spatial histogram of uniform LBP codes (the same
+features LBPH uses), square-rooted so cosine similarity approximates the
+Hellinger kernel. Any callable mapping a grayscale face to a 1-D vector can
+be passed instead, e.g. a DNN embedder served by core.inference_engine.
+
+Author: ItsOji Team
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+
+def _uniform_lbp_table():
+    """Map each 8-bit LBP code to one of 58 uniform patterns, or bin 58 for the rest."""
+    table = np.full(256, 58, dtype=np.uint8)
+    next_bin = 0
+    for code in range(256):
+        bits = [(code >> i) & 1 for i in range(8)]
+        transitions = sum(bits[i] != bits[(i + 1) % 8] for i in range(8))
+        if transitions <= 2:
+            table[code] = next_bin
+            next_bin += 1
+    return table
+
+
+_UNIFORM_LBP = _uniform_lbp_table()
+
+
+def lbp_embedding(gray_face, size=(64, 64), grid=(4, 4)):
+    """Grid of uniform-LBP histograms of a grayscale face crop, as a unit float32 vector."""
+    face = cv2.resize(gray_face, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+    center = face[1:-1, 1:-1]
+    h, w = center.shape
+    codes = np.zeros((h, w), dtype=np.uint8)
+    neighbours = ((0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0))
+    for bit, (dy, dx) in enumerate(neighbours):
+        codes |= (face[dy:dy + h, dx:dx + w] >= center).astype(np.uint8) << bit
+    codes = _UNIFORM_LBP[codes]
+
+    gy, gx = grid
+    cell_h, cell_w = h // gy, w // gx
+    cells = codes[:cell_h * gy, :cell_w * gx].reshape(gy, cell_h, gx, cell_w).transpose(0, 2, 1, 3)
+    cells = cells.reshape(gy * gx, cell_h * cell_w).astype(np.int64)
+    # One bincount over all cells at once: offset each cell's codes into its own 59-bin range
+    hist = np.bincount((cells + np.arange(gy * gx)[:, None] * 59).ravel(), minlength=gy * gx * 59)
+
+    vector = np.sqrt(hist.astype(np.float32))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class IVFIndex:
+    """Coarse inverted-file index: rows are bucketed by nearest k-means centroid."""
+
+    def __init__(self, nlist=64, nprobe=8, iterations=10, seed=0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.rng = np.random.default_rng(seed)
+        self.centroids = None
+        self.assignments = np.empty(0, dtype=np.int32)  # cell of each gallery row
+        self.trained_size = 0
+
+    def train(self, vectors):
+        """Spherical k-means on the current gallery."""
+        k = min(self.nlist, len(vectors))
+        centroids = vectors[self.rng.choice(len(vectors), k, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignments = (vectors @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            occupied = norms[:, 0] > 0
+            centroids[occupied] = sums[occupied] / norms[occupied]
+        self.centroids = centroids
+        self.assignments = self.assign(vectors)
+        self.trained_size = len(vectors)
+
+    def assign(self, vectors):
+        return (vectors @ self.centroids.T).argmax(axis=1).astype(np.int32)
+
+    def add(self, vectors):
+        self.assignments = np.concatenate([self.assignments, self.assign(vectors)])
+
+    def move_row(self, src, dst):
+        self.assignments[dst] = self.assignments[src]
+
+    def truncate(self, size):
+        self.assignments = self.assignments[:size]
+
+    def candidates(self, query):
+        """Gallery row indices in the nprobe cells closest to the query."""
+        cells = np.argpartition(-(self.centroids @ query), min(self.nprobe, len(self.centroids)) - 1)[:self.nprobe]
+        return np.flatnonzero(np.isin(self.assignments, cells))
+
+
+class FaceGallery:
+    def __init__(self, dim=None, embedder=lbp_embedding, ivf_threshold=20000, ivf_nlist=None, ivf_nprobe=8):
+        """
+        :param dim: Embedding size (inferred from the first add when None)
+        :param embedder: Callable(gray_face) → 1-D float vector
+        :param ivf_threshold: Build the IVF index once the gallery has this many rows (0 = never)
+        """
+        self.embedder = embedder
+        self.dim = dim
+        self.matrix = np.empty((0, dim or 0), dtype=np.float32)  # Capacity grows by doubling
+        self.size = 0
+        self.labels = np.empty(0, dtype=np.int32)               # Identity id of each row
+        self.names = {}                                         # identity id → name
+        self.ids = {}                                           # name → identity id
+        self.next_id = 0
+        self.ivf_threshold = ivf_threshold
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.index = None
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def embeddings(self):
+        return self.matrix[:self.size]
+
+    def embed(self, gray_faces):
+        """Embed a list of grayscale face crops into an (N, dim) float32 matrix."""
+        if not gray_faces:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        vectors = np.stack([self.embedder(face) for face in gray_faces]).astype(np.float32, copy=False)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def load_rows(self, matrix, row_names, names=()):
+        """
+        Replace the gallery contents with a prebuilt matrix, e.g. a read-only memmap.
+
+        :param matrix: (N, dim) normalised embeddings, or None for an empty gallery
+        :param row_names: Identity name of each row
+        :param names: Extra identities to register even if they have no rows
+        """
+        with self.lock:
+            self.names, self.ids, self.next_id = {}, {}, 0
+            for name in list(names) + list(row_names):
+                if name not in self.ids:
+                    self.ids[name] = self.next_id
+                    self.names[self.next_id] = name
+                    self.next_id += 1
+            if matrix is None or len(matrix) == 0:
+                self.matrix = np.empty((0, self.dim or 0), dtype=np.float32)
+                self.labels = np.empty(0, dtype=np.int32)
+                self.size = 0
+            else:
+                self.matrix = matrix
+                self.dim = matrix.shape[1]
+                self.size = len(matrix)
+                self.labels = np.array([self.ids[name] for name in row_names], dtype=np.int32)
+            self.index = None
+            if self.ivf_threshold and self.size >= self.ivf_threshold:
+                self._update_index(self.embeddings)
+
+    def _ensure_writable(self):
+        # A memmapped gallery is read-only; copy it into memory before the first in-place edit
+        if not self.matrix.flags.writeable:
+            self.matrix = np.array(self.matrix[:self.size])
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed <= len(self.matrix):
+            return
+        capacity = max(needed, 2 * len(self.matrix), 64)
+        grown = np.empty((capacity, self.dim), dtype=np.float32)
+        grown[:self.size] = self.matrix[:self.size]
+        self.matrix = grown
+        labels = np.empty(capacity, dtype=np.int32)
+        labels[:self.size] = self.labels[:self.size]
+        self.labels = labels
+
+    def add(self, name, vectors):
+        """
+        Append embeddings for an identity (created if new). No retraining needed.
+
+        :param vectors: (N, dim) normalised embeddings, e.g. from embed()
+        :return: Identity id
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        vectors = vectors.reshape(-1, vectors.shape[-1])
+        with self.lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self.matrix = np.empty((0, self.dim), dtype=np.float32)
+            identity = self.ids.get(name)
+            if identity is None:
+                identity = self.ids[name] = self.next_id
+                self.names[identity] = name
+                self.next_id += 1
+            if len(vectors):
+                self._reserve(len(vectors))
+                self.matrix[self.size:self.size + len(vectors)] = vectors
+                self.labels[self.size:self.size + len(vectors)] = identity
+                self.size += len(vectors)
+                self._update_index(vectors)
+            return identity
+
+    def remove(self, name):
+        """Drop an identity and all its rows (holes are filled from the tail)."""
+        with self.lock:
+            identity = self.ids.pop(name, None)
+            if identity is None:
+                return False
+            del self.names[identity]
+            self._ensure_writable()
+            for row in sorted(np.flatnonzero(self.labels[:self.size] == identity), reverse=True):
+                last = self.size - 1
+                if row != last:
+                    self.matrix[row] = self.matrix[last]
+                    self.labels[row] = self.labels[last]
+                    if self.index:
+                        self.index.move_row(last, row)
+                self.size -= 1
+            if self.index:
+                self.index.truncate(self.size)
+            return True
+
+    def _update_index(self, new_vectors):
+        if not self.ivf_threshold or self.size < self.ivf_threshold:
+            return
+        if self.index is None or self.size >= 2 * self.index.trained_size:
+            # (Re)train as the gallery doubles; otherwise just bucket the new rows
+            nlist = self.ivf_nlist or max(16, int(np.sqrt(self.size)))
+            self.index = IVFIndex(nlist=nlist, nprobe=self.ivf_nprobe)
+            self.index.train(self.embeddings)
+        else:
+            self.index.add(new_vectors)
+
+    def search(self, queries, k=1):
+        """
+        Find the best-matching identities for each query embedding.
+
+        :param queries: (Q, dim) normalised embeddings
+        :return: List (per query) of up to k (name, cosine similarity) pairs, best first,
+                 one entry per identity.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self.lock:
+            if self.size == 0:
+                return [[] for _ in queries]
+            if self.index is None:
+                scores = queries @ self.embeddings.T           # (Q, N) in one BLAS call
+                return [self._top_k(row, np.arange(self.size), k) for row in scores]
+            matches = []
+            for query in queries:
+                rows = self.index.candidates(query)
+                matches.append(self._top_k(self.matrix[rows] @ query, rows, k))
+            return matches
+
+    def _top_k(self, scores, rows, k):
+        if len(scores) == 0:
+            return []
+        # Over-fetch so several rows of one identity don't crowd out others
+        fetch = min(len(scores), k * 8)
+        top = np.argpartition(-scores, fetch - 1)[:fetch]
+        top = top[np.argsort(-scores[top])]
+        seen, results = set(), []
+        for i in top:
+            identity = int(self.labels[rows[i]])
+            if identity in seen:
+                continue
+            seen.add(identity)
+            results.append((self.names[identity], float(scores[i])))
+            if len(results) == k:
+                break
+        return results
+
+    def identify(self, gray_faces, threshold):
+        """Embed and match face crops; returns (name or "Unknown", similarity) per face."""
+        matches = self.search(self.embed(gray_faces), k=1)
+        return [
+            (best[0][0], best[0][1]) if best and best[0][1] >= threshold else ("Unknown", best[0][1] if best else 0.0)
+            for best in matches
+        ]
@@ -0,0 +1,222 @@
+"""
+Gallery Store - Persists the face gallery between runs.
+
+The embeddings of every Known_faces image are saved as one .npy matrix next
+to a JSON manifest. The manifest records, per image, its SHA-256, size, mtime,
+person and row range. On load, unchanged images reuse their rows from the
+memory-mapped matrix; only new or changed images go through face detection
+and embedding again. A plugin restart (including auto-recovery) then costs a
+directory scan instead of a full rebuild.
+
+The artifact is versioned (format + embedder id); a mismatch triggers a rebuild.
+Every inference worker process loads the gallery at start-up, so loads hold an
+exclusive lock on the cache directory and files are written under unique
+temporary names and renamed into place: one process rebuilds, the others then
+reuse its result.
+
+Author: ItsOji Team
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from core.crash_logger import log_exception
+
+FORMAT_VERSION = 1
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def cache_lock(path):
+    """Hold an exclusive inter-process lock on `path` (created if missing) for the with-block."""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ~10 s; keep waiting for the rebuild
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(path, write):
+    """Write through write(file) into a unique temp file next to `path`, then rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class GalleryStore:
+    def __init__(self, faces_dir, cache_dir, embedder_id="lbp_v1"):
+        self.faces_dir = faces_dir
+        self.cache_dir = cache_dir
+        self.embedder_id = embedder_id
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+
+    def scan(self):
+        """Yield (relative path, person, absolute path, stat) for every image, in a stable order."""
+        if not os.path.isdir(self.faces_dir):
+            return
+        for person in sorted(os.listdir(self.faces_dir)):
+            person_dir = os.path.join(self.faces_dir, person)
+            if not os.path.isdir(person_dir):
+                continue
+            for image_file in sorted(os.listdir(person_dir)):
+                if image_file.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(person_dir, image_file)
+                    yield f"{person}/{image_file}", person, path, os.stat(path)
+
+    def people(self):
+        if not os.path.isdir(self.faces_dir):
+            return []
+        return [p for p in sorted(os.listdir(self.faces_dir)) if os.path.isdir(os.path.join(self.faces_dir, p))]
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log_exception(e, context="Face gallery manifest unreadable; rebuilding")
+            return None
+        if manifest.get("version") != FORMAT_VERSION or manifest.get("embedder") != self.embedder_id:
+            print("[GalleryStore] ⚠️ Gallery artifact is from another version; rebuilding.")
+            return None
+        return manifest
+
+    def _open_matrix(self, manifest):
+        if not manifest or not manifest.get("matrix"):
+            return None
+        try:
+            return np.load(os.path.join(self.cache_dir, manifest["matrix"]), mmap_mode='r')
+        except Exception as e:
+            log_exception(e, context="Face gallery matrix unreadable; rebuilding")
+            return None
+
+    def load(self, gallery, extract_faces):
+        """
+        Fill `gallery` from the artifact, re-embedding only new or changed images.
+
+        :param gallery: FaceGallery to populate (its embed() is used for new images)
+        :param extract_faces: Callable(image_path) → list of grayscale face crops
+        :return: Dict with counts of reused / reprocessed / removed images
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with cache_lock(self.lock_path):
+            return self._load(gallery, extract_faces)
+
+    def _load(self, gallery, extract_faces):
+        started = time.time()
+        manifest = self._load_manifest()
+        matrix = self._open_matrix(manifest)
+        old_images = manifest["images"] if manifest and matrix is not None else {}
+
+        images, pieces, row_names = {}, [], []
+        reused = reprocessed = 0
+        changed = matrix is None
+        row = 0
+        for rel, person, path, stat in self.scan():
+            old = old_images.get(rel)
+            if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                digest = old["sha256"]  # Unchanged on disk; skip re-hashing
+            else:
+                digest = file_sha256(path)
+
+            if old and old["sha256"] == digest and old["person"] == person:
+                vectors = matrix[old["start"]:old["start"] + old["count"]]
+                reused += 1
+                changed |= old["start"] != row or old["mtime_ns"] != stat.st_mtime_ns
+            else:
+                vectors = gallery.embed(extract_faces(path))
+                reprocessed += 1
+                changed = True
+
+            images[rel] = {
+                "sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                "person": person, "start": row, "count": len(vectors)
+            }
+            if len(vectors):
+                pieces.append(vectors)
+                row_names.extend([person] * len(vectors))
+                row += len(vectors)
+
+        removed = len(set(old_images) - set(images))
+        changed |= removed > 0
+
+        if changed:
+            new_matrix = np.concatenate(pieces).astype(np.float32, copy=False) if pieces else None
+            pieces = None
+            matrix = self._save(new_matrix, images, manifest)
+
+        gallery.load_rows(matrix, row_names, names=self.people())
+        stats = {"reused": reused, "reprocessed": reprocessed, "removed": removed,
+                 "elapsed_s": round(time.time() - started, 3)}
+        print(f"[GalleryStore] ✅ Gallery loaded: {stats}")
+        return stats
+
+    def _save(self, matrix, images, old_manifest):
+        """Write a new matrix generation and switch the manifest to it; returns the mmapped matrix."""
+        generation = (old_manifest or {}).get("generation", 0) + 1
+        matrix_name = f"embeddings_{generation}.npy" if matrix is not None else None
+        if matrix_name:
+            # New file per generation: the previous one may still be mapped (Windows can't replace it)
+            _write_atomic(os.path.join(self.cache_dir, matrix_name), lambda f: np.save(f, matrix))
+
+        manifest = {
+            "version": FORMAT_VERSION, "embedder": self.embedder_id, "generation": generation,
+            "matrix": matrix_name, "dim": int(matrix.shape[1]) if matrix is not None else None,
+            "images": images
+        }
+        _write_atomic(self.manifest_path, lambda f: f.write(json.dumps(manifest, indent=1).encode('utf-8')))
+
+        for name in os.listdir(self.cache_dir):
+            # Under the lock no other save is in progress, so .tmp_ files are crash leftovers
+            if (name.startswith("embeddings_") and name != matrix_name) or name.startswith(".tmp_"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass  # Still mapped by another process; cleaned up on a later save
+        return self._open_matrix(manifest)
@@ -190,74 +190,86 @@ import random
 import time
 import cv2
 import os
-import numpy as np
 from datetime import datetime
 from plugins.base_plugin import BasePlugin
-from core.log_manager import LogManager
+from core.frame_cache import FrameContext, get_cascade
+from plugins.face_recognition.gallery import FaceGallery
+from plugins.face_recognition.gallery_store import GalleryStore
+from plugins.face_recognition.tracker import FaceTracker
+
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 class Plugin(BasePlugin):
     """Face Recognition Plugin."""
 
+    # Cosine similarity a face must reach against the gallery to be named
+    match_threshold = 0.8
+    # Tracked faces keep their identity; re-run recognition on them every N frames
+    reidentify_every = 10
+    cascade_name = 'haarcascade_frontalface_default.xml'
+
     def __init__(self):
         super().__init__()
         self.model = None
-        self.logger = LogManager()
         self.plugin_name = "face_recognition"
-        self.last_logged_result = None
-        self.face_recognizer = cv2.face.LBPHFaceRecognizer_create()
-        self.known_faces = []  # To store names of known faces
-        self.face_images = []  # To store face images for training
-        self.face_labels = []  # To store labels corresponding to known faces
+        self.gallery = FaceGallery()  # Embedding matrix of every known face, searched with one matmul
+        get_cascade(self.cascade_name)  # Fail fast if the cascade file is missing
+        self.store = GalleryStore(
+            faces_dir=os.path.join(PLUGIN_DIR, "Known_faces"),
+            cache_dir=os.path.join(PLUGIN_DIR, "gallery_cache")
+        )
+        self.trackers = {}  # camera_id → FaceTracker
         self.load_model()
 
+    @property
+    def face_cascade(self):
+        """The calling thread's cascade; gallery rebuilds and plugin calls run on different threads."""
+        return get_cascade(self.cascade_name)
+
     def load_model(self):
-        """Load and train the face recognition model with images from the Known_faces directory."""
-        print("[FaceRecognitionPlugin] Loading and training model with known faces.")
+        """Load the persisted face gallery, re-embedding only new or changed Known_faces images."""
+        print("[FaceRecognitionPlugin] Loading face gallery.")
 
-        known_faces_path = r"C:\Users\musta\OneDrive\Desktop\app\face-detection-ipcam\plugins\face_recognition\Known_faces"
-        
-        # Loop through the directories (one for each person) in Known_faces
-        for person_folder in os.listdir(known_faces_path):
-            person_folder_path = os.path.join(known_faces_path, person_folder)
-
-            # Ensure it's a directory
-            if not os.path.isdir(person_folder_path):
-                continue
-
-            # Loop through all images of that person
-            for image_file in os.listdir(person_folder_path):
-                # Read the image (only if it ends with an image extension)
-                if image_file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                    image_path = os.path.join(person_folder_path, image_file)
-                    image = cv2.imread(image_path)
-                    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-                    # Detect faces in the image using Haar Cascade
-                    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                    faces = face_cascade.detectMultiScale(gray_image, scaleFactor=1.1, minNeighbors=5)
-
-                    # Process detected faces and prepare data for training
-                    for (x, y, w, h) in faces:
-                        face_image = gray_image[y:y+h, x:x+w]
-                        self.face_images.append(face_image)
-                        self.face_labels.append(len(self.known_faces))  # Label based on position in known_faces
-
-            # Add person name to known faces list (folder name)
-            self.known_faces.append(person_folder)
-
-        # Train the face recognizer with the collected data
-        self.face_labels = np.array(self.face_labels)
-        if len(self.face_images) > 0:
-            self.face_recognizer.train(self.face_images, self.face_labels)
+        # Identity name is the person's folder name under Known_faces
+        self.gallery_stats = self.store.load(self.gallery, self._extract_faces)
+
+        if len(self.gallery) > 0:
             self.model = True
-            print("[FaceRecognitionPlugin] Model loaded and trained with known faces.")
+            print(f"[FaceRecognitionPlugin] Gallery ready: {len(self.gallery.ids)} people, {len(self.gallery)} faces.")
         else:
-            print("[FaceRecognitionPlugin] No faces found to train the model.")
+            print("[FaceRecognitionPlugin] No faces found to build the gallery.")
+
+    def _extract_faces(self, image_path):
+        """Grayscale face crops found in one Known_faces image."""
+        image = cv2.imread(image_path)
+        if image is None:
+            return []
+        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        # Detect faces in the image using Haar Cascade
+        faces = self.face_cascade.detectMultiScale(gray_image, scaleFactor=1.1, minNeighbors=5)
+        return [gray_image[y:y+h, x:x+w] for (x, y, w, h) in faces]
+
+    def adopt(self, previous):
+        """Keep live tracks and, if Known_faces is unchanged, the in-memory gallery with runtime identities."""
+        self.trackers = getattr(previous, "trackers", self.trackers)
+        stats = getattr(self, "gallery_stats", None) or {}
+        if type(getattr(previous, "gallery", None)) is type(self.gallery) and not (
+                stats.get("reprocessed") or stats.get("removed")):
+            self.gallery = previous.gallery
+            self.model = previous.model
+
+    def add_identity(self, name, gray_faces):
+        """Add (or extend) a watchlist identity from grayscale face crops; no retraining needed."""
+        self.gallery.add(name, self.gallery.embed(gray_faces))
+
+    def remove_identity(self, name):
+        return self.gallery.remove(name)
 
     def process(self, frame, camera_id=None):
         """
-        Process a video frame, simulate face recognition, and log the results.
+        Process a video frame and recognize the faces in it (logging is done by PluginManager).
 
         Args:
             frame (ndarray): Video frame from the camera.
@@ -266,40 +278,50 @@ class Plugin(BasePlugin):
         Returns:
             dict: Result of face recognition containing recognized status, person name, confidence, etc.
         """
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        faces = face_cascade.detectMultiScale(gray_frame, scaleFactor=1.1, minNeighbors=5)
+        return self.process_contexts([FrameContext(frame, camera_id)])[0]
+
+    def process_contexts(self, contexts):
+        """Recognize faces using the grayscale frame shared with the other plugins."""
+        return [self._recognize(ctx.gray, ctx.camera_id) for ctx in contexts]
+
+    def _tracker(self, camera_id):
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            tracker = self.trackers[camera_id] = FaceTracker(reidentify_every=self.reidentify_every)
+        return tracker
+
+    def _recognize(self, gray_frame, camera_id):
+        faces = self.face_cascade.detectMultiScale(gray_frame, scaleFactor=1.1, minNeighbors=5)
+        tracks = self._tracker(camera_id).update(faces)
+
+        # Only new tracks (and tracks due a refresh) go to the gallery, in one batched search
+        pending = self._tracker(camera_id).pending(tracks) if len(self.gallery) > 0 else []
+        if pending:
+            crops = [gray_frame[y:y+h, x:x+w] for (x, y, w, h) in (tracks[i].box for i in pending)]
+            for i, (person_name, similarity) in zip(pending, self.gallery.identify(crops, self.match_threshold)):
+                tracks[i].set_identity(person_name, round(similarity * 100, 2))
+
+        faces_out = [
+            {
+                "track_id": track.track_id,
+                "box": list(track.box),
+                "person_name": track.person_name or "Unknown",
+                "confidence": track.confidence
+            }
+            for track in tracks
+        ]
+        # Headline fields: the most confident named face, else the most confident face
+        best = max(faces_out, key=lambda f: (f["person_name"] != "Unknown", f["confidence"]), default=None)
 
         result = {
-            "face_recognized": False,
-            "person_name": "Unknown",
-            "confidence": 0.0,
+            "face_recognized": bool(faces_out),
+            "person_name": best["person_name"] if best else "Unknown",
+            "confidence": best["confidence"] if best else 0.0,
+            "face_count": len(faces_out),
+            "faces": faces_out,
             "camera_id": camera_id,
             "timestamp_ms": int(time.time() * 1000)
         }
-
-        # If faces are detected in the frame
-        if len(faces) > 0:
-            for (x, y, w, h) in faces:
-                face_image = gray_frame[y:y+h, x:x+w]
-                label, confidence = self.face_recognizer.predict(face_image)
-
-                person_name = self.known_faces[label] if confidence < 100 else "Unknown"
-                result["face_recognized"] = True
-                result["person_name"] = person_name
-                result["confidence"] = round(100 - confidence, 2)
-
-        # Smart logging
-        log_cfg = self.logger.get_plugin_config(self.plugin_name)
-        if log_cfg:
-            trigger_filter = log_cfg.get("log_trigger_filter", "")
-            distinct_only = trigger_filter == "distinct_only"
-
-            # Log if needed (only log if distinct or if the result is different from the last one)
-            if not distinct_only or (self.last_logged_result != result):
-                self.logger.log(self.plugin_name, result)
-                self.last_logged_result = result
-
         return result
 
     def release(self):
@@ -0,0 +1,115 @@
+"""
+Face Tracker - Lightweight IoU tracker so faces are not re-identified every frame.
+
+Detections are matched to existing tracks by box overlap (greedy on the IoU
+matrix, falling back to centroid distance for fast movers). A track keeps the
+identity it was given; the recognizer only runs for new tracks and then again
+every `reidentify_every` frames, so a crowd that stays in view costs one
+gallery search per person per N frames instead of one per face per frame.
+
+Author: ItsOji Team
+"""
+
+import itertools
+
+import numpy as np
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU of (N, 4) and (M, 4) boxes given as x, y, w, h."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    ax2, ay2 = a[:, 0] + a[:, 2], a[:, 1] + a[:, 3]
+    bx2, by2 = b[:, 0] + b[:, 2], b[:, 1] + b[:, 3]
+    w = np.clip(np.minimum(ax2[:, None], bx2) - np.maximum(a[:, 0, None], b[:, 0]), 0, None)
+    h = np.clip(np.minimum(ay2[:, None], by2) - np.maximum(a[:, 1, None], b[:, 1]), 0, None)
+    inter = w * h
+    union = (a[:, 2] * a[:, 3])[:, None] + b[:, 2] * b[:, 3] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+class Track:
+    __slots__ = ("track_id", "box", "person_name", "confidence", "since_identify", "missed")
+
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box
+        self.person_name = None       # None until the recognizer has seen it
+        self.confidence = 0.0
+        self.since_identify = 0
+        self.missed = 0
+
+    def needs_identify(self, reidentify_every):
+        return self.person_name is None or self.since_identify >= reidentify_every
+
+    def set_identity(self, person_name, confidence):
+        self.person_name = person_name
+        self.confidence = confidence
+        self.since_identify = 0
+
+
+class FaceTracker:
+    def __init__(self, iou_threshold=0.3, centroid_ratio=0.5, max_missed=5, reidentify_every=10):
+        """
+        :param iou_threshold: Minimum overlap to continue a track
+        :param centroid_ratio: Else, match if centroids are within this fraction of the box size
+        :param max_missed: Frames a track survives without a matching detection
+        :param reidentify_every: Re-run recognition on a live track every N updates
+        """
+        self.iou_threshold = iou_threshold
+        self.centroid_ratio = centroid_ratio
+        self.max_missed = max_missed
+        self.reidentify_every = reidentify_every
+        self.tracks = []
+        self._ids = itertools.count(1)
+
+    def update(self, boxes):
+        """
+        Match this frame's detections to tracks.
+
+        :param boxes: Sequence of (x, y, w, h)
+        :return: List of Track, one per box, in the same order
+        """
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+        assigned = [None] * len(boxes)
+        unmatched_tracks = set(range(len(self.tracks)))
+
+        if self.tracks and boxes:
+            track_boxes = np.array([t.box for t in self.tracks], dtype=np.float32)
+            det_boxes = np.array(boxes, dtype=np.float32)
+            scores = iou_matrix(track_boxes, det_boxes)
+
+            # Centroid fallback: distance relative to box size, scored below any IoU match
+            t_centre = track_boxes[:, :2] + track_boxes[:, 2:] / 2
+            d_centre = det_boxes[:, :2] + det_boxes[:, 2:] / 2
+            dist = np.linalg.norm(t_centre[:, None] - d_centre[None], axis=2)
+            scale = np.maximum(track_boxes[:, None, 2:].max(axis=2), 1.0)
+            close = (scores < self.iou_threshold) & (dist < self.centroid_ratio * scale)
+            scores = np.where(close, self.iou_threshold * 0.5, scores)
+            scores[(scores < self.iou_threshold) & ~close] = 0
+
+            # Greedy matching, best pair first
+            for flat in np.argsort(-scores, axis=None):
+                ti, di = divmod(int(flat), scores.shape[1])
+                if scores[ti, di] <= 0:
+                    break
+                if ti in unmatched_tracks and assigned[di] is None:
+                    track = self.tracks[ti]
+                    track.box, track.missed = boxes[di], 0
+                    track.since_identify += 1
+                    assigned[di] = track
+                    unmatched_tracks.discard(ti)
+
+        for ti in unmatched_tracks:
+            self.tracks[ti].missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+
+        for di, box in enumerate(boxes):
+            if assigned[di] is None:
+                assigned[di] = Track(next(self._ids), box)
+                self.tracks.append(assigned[di])
+        return assigned
+
+    def pending(self, tracks):
+        """Indices of tracks that need the recognizer this frame."""
+        return [i for i, track in enumerate(tracks) if track.needs_identify(self.reidentify_every)]
@@ -6,21 +6,25 @@ Author: ItsOji Team
 
 import random
 import time
-import hashlib
 from datetime import datetime
 from plugins.base_plugin import BasePlugin
-from core.log_manager import LogManager
 
 class Plugin(BasePlugin):
     """Fire Detection Plugin (Enterprise-Ready)"""
 
+    # Served by the shared inference engine; simulated when the model is absent
+    model_spec = {
+        "path": "models/fire_detection.onnx",
+        "input_size": (640, 640),
+        "conf_threshold": 0.4,
+        "iou_threshold": 0.45,
+        "output_format": "yolov8"
+    }
+
     def __init__(self):
         super().__init__()
         self.model = None
-        self.logger = LogManager()
         self.plugin_name = "fire_detection"
-        self.last_logged_hash = None
-        self.model_path = "models/fire_detection.onnx"  # Optional if used in Phase 2.2
 
     def load_model(self):
         try:
@@ -32,6 +36,9 @@ class Plugin(BasePlugin):
             self.model = None
 
     def process(self, frame, camera_id=None):
+        if self.model_handle:
+            return self.process_batch([frame], [camera_id])[0]
+
         # Simulated inference result
         fire_detected = random.choice([True, False])
         confidence = round(random.uniform(0.75, 0.98), 2)
@@ -43,27 +50,25 @@ class Plugin(BasePlugin):
             "camera_id": camera_id,
             "timestamp_ms": timestamp_ms
         }
-
-        # 🔐 Plugin log config (Phase 1)
-        log_cfg = self.logger.get_plugin_config(self.plugin_name)
-        if log_cfg:
-            trigger_filter = log_cfg.get("log_trigger_filter", "")
-            distinct_only = trigger_filter == "distinct_only"
-
-            # ✅ Better comparison via hash
-            result_hash = self._hash_result(result)
-            if not distinct_only or (self.last_logged_hash != result_hash):
-                self.logger.log(self.plugin_name, result)
-                self.last_logged_hash = result_hash
-        else:
-            print(f"[{self.plugin_name}] ⚠️ Missing plugin config.")
-
         return result
 
-    def _hash_result(self, result_dict):
-        """Create a stable hash to detect unique results."""
-        base_str = f"{result_dict['fire_detected']}_{result_dict['confidence']}_{result_dict['camera_id']}"
-        return hashlib.sha256(base_str.encode()).hexdigest()
+    def process_batch(self, frames, camera_ids):
+        if not self.model_handle:
+            return super().process_batch(frames, camera_ids)
+
+        # One ONNX run for every camera in the batch
+        timestamp_ms = int(time.time() * 1000)
+        results = []
+        for detections, camera_id in zip(self.model_handle.detect(frames), camera_ids):
+            result = {
+                "fire_detected": len(detections) > 0,
+                "confidence": round(float(detections[:, 4].max()), 2) if len(detections) else 0.0,
+                "camera_id": camera_id,
+                "timestamp_ms": timestamp_ms,
+                "boxes": detections[:, :5].round(2).tolist()
+            }
+            results.append(result)
+        return results
 
     def release(self):
         self.model = None
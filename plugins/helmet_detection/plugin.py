@@ -8,16 +8,25 @@ import random
 import time
 from datetime import datetime
 from plugins.base_plugin import BasePlugin
-from core.log_manager import LogManager
 
 class Plugin(BasePlugin):
     """Helmet Detection Plugin."""
 
+    # ONNX export of the bundled model.pt, served by the shared inference engine.
+    # Class 0 = helmet. Detection stays simulated until the export is present.
+    model_spec = {
+        "path": "plugins/helmet_detection/model.onnx",
+        "input_size": (640, 640),
+        "conf_threshold": 0.5,
+        "iou_threshold": 0.45,
+        "output_format": "yolov8",
+        "helmet_class": 0
+    }
+
     def __init__(self):
         super().__init__()
         self.model = None
         self.plugin_name = "helmet_detection"
-        self.logger = LogManager()
 
     def load_model(self):
         print("[HelmetDetectionPlugin] Model loaded (simulated).")
@@ -30,6 +39,9 @@ class Plugin(BasePlugin):
         :param camera_id: Optional camera ID for metadata
         :return: Detection result dictionary
         """
+        if self.model_handle:
+            return self.process_batch([frame], [camera_id])[0]
+
         helmet_detected = random.choice([True, False])
         confidence = round(random.uniform(0.80, 0.99), 2)
         timestamp_ms = int(time.time() * 1000)
@@ -41,11 +53,26 @@ class Plugin(BasePlugin):
             "timestamp_ms": timestamp_ms
         }
 
-        # Log via LogManager (meta-aware, smart)
-        self.logger.log(self.plugin_name, result)
-
         return result
 
+    def process_batch(self, frames, camera_ids):
+        if not self.model_handle:
+            return super().process_batch(frames, camera_ids)
+
+        timestamp_ms = int(time.time() * 1000)
+        results = []
+        for detections, camera_id in zip(self.model_handle.detect(frames), camera_ids):
+            helmets = detections[detections[:, 5] == self.model_spec["helmet_class"]]
+            result = {
+                "helmet_detected": len(helmets) > 0,
+                "confidence": round(float(helmets[:, 4].max()), 2) if len(helmets) else 0.0,
+                "camera_id": camera_id,
+                "timestamp_ms": timestamp_ms,
+                "boxes": detections.round(2).tolist()
+            }
+            results.append(result)
+        return results
+
     def release(self):
         self.model = None
         print("[HelmetDetectionPlugin] Model released.")
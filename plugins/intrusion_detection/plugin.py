@@ -8,7 +8,6 @@ import random
 import time
 from datetime import datetime
 from plugins.base_plugin import BasePlugin
-from core.log_manager import LogManager
 
 class Plugin(BasePlugin):
     """Intrusion Detection Plugin."""
@@ -16,9 +15,7 @@ class Plugin(BasePlugin):
     def __init__(self):
         super().__init__()
         self.model = None
-        self.logger = LogManager()
         self.plugin_name = "intrusion_detection"
-        self.last_logged_result = None
 
     def load_model(self):
         print("[IntrusionDetectionPlugin] Model loaded (simulated).")
@@ -36,16 +33,6 @@ class Plugin(BasePlugin):
             "timestamp_ms": timestamp_ms
         }
 
-        log_cfg = self.logger.get_plugin_config(self.plugin_name)
-        if log_cfg:
-            trigger_filter = log_cfg.get("log_trigger_filter", "")
-            distinct_only = trigger_filter == "distinct_only"
-
-            if not distinct_only or (self.last_logged_result != result):
-                log_line = f"{'🚨' if intrusion_detected else '✅'} Intrusion: {intrusion_detected} | Conf: {confidence} | Cam: {camera_id}"
-                self.logger.log(self.plugin_name, result)
-                self.last_logged_result = result
-
         return result
 
     def release(self):
@@ -7,8 +7,8 @@ if __name__ == "__main__" or __package__ is None:
 import os
 import csv
 import argparse
-from datetime import datetime
-from core.log_manager import LogManager
+from datetime import datetime, timedelta
+from core.log_manager import get_log_manager
 
 EXPORT_FOLDER = "logs/exports"
 os.makedirs(EXPORT_FOLDER, exist_ok=True)
@@ -24,7 +24,7 @@ def parse_log_line(line):
         return [None, None, None, line.strip()]
 
 def export_logs_to_csv(plugin_name=None, output_file=None, limit=100):
-    manager = LogManager()
+    manager = get_log_manager()
     logs = manager.get_recent_logs(plugin_name, limit)
 
     output_path = os.path.join(EXPORT_FOLDER, output_file or f"exported_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
@@ -42,11 +42,44 @@ def export_logs_to_csv(plugin_name=None, output_file=None, limit=100):
     except Exception as e:
         print(f"[Error] Failed to export logs: {e}")
 
+def export_records_to_csv(plugin_name, since, until=None, camera_id=None, output_file=None, limit=None):
+    """Export a time range of a plugin's structured (jsonl) log; no text parsing involved."""
+    manager = get_log_manager()
+    until = until or datetime.now()
+    records = manager.query_logs(plugin_name, since, until, camera_id=camera_id, limit=limit)
+    field_names = []
+    for record in records:
+        field_names.extend(k for k in record.get("fields", {}) if k not in field_names)
+
+    output_path = os.path.join(EXPORT_FOLDER, output_file or f"exported_{plugin_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+
+    try:
+        with open(output_path, mode="w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Timestamp", "Plugin", "Camera", "Log Level"] + field_names)
+
+            for record in records:
+                timestamp = datetime.fromtimestamp(record["ts"] / 1000).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                fields = record.get("fields", {})
+                writer.writerow([timestamp, record.get("plugin"), record.get("camera_id"), record.get("level")]
+                                + [fields.get(k, "") for k in field_names])
+
+        print(f"[✔] {len(records)} records exported to: {output_path}")
+    except Exception as e:
+        print(f"[Error] Failed to export logs: {e}")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Export plugin logs to CSV")
     parser.add_argument("--plugin", type=str, help="Plugin name (optional)", default=None)
     parser.add_argument("--limit", type=int, help="Number of lines", default=100)
     parser.add_argument("--output", type=str, help="CSV output filename", default=None)
+    parser.add_argument("--hours", type=float, default=None,
+                        help="Export the last N hours from the plugin's structured (jsonl) log")
+    parser.add_argument("--camera", type=str, help="Camera ID filter for --hours (optional)", default=None)
     args = parser.parse_args()
 
-    export_logs_to_csv(plugin_name=args.plugin, output_file=args.output, limit=args.limit)
+    if args.hours is not None and args.plugin:
+        export_records_to_csv(args.plugin, datetime.now() - timedelta(hours=args.hours),
+                              camera_id=args.camera, output_file=args.output)
+    else:
+        export_logs_to_csv(plugin_name=args.plugin, output_file=args.output, limit=args.limit)
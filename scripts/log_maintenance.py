@@ -10,14 +10,14 @@ if __name__ == "__main__" or __package__ is None:
     import os, sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from core.log_manager import LogManager
+from core.log_manager import get_log_manager
 from core.crash_logger import log_exception
 
 
 def clean_and_compress_logs():
     print("[LogMaintenance] 🔁 Starting scheduled cleanup...")
     try:
-        manager = LogManager()
+        manager = get_log_manager()
         manager.cleanup_logs()
         print("[LogMaintenance] ✅ Completed log cleanup.")
     except Exception as e:
@@ -0,0 +1,30 @@
+import random
+import unittest
+from core.backoff import ExponentialBackoff
+
+
+class TestExponentialBackoff(unittest.TestCase):
+    def test_delays_stay_under_growing_capped_ceiling(self):
+        backoff = ExponentialBackoff(base=1.0, cap=8.0, rng=random.Random(1))
+        for expected_ceiling in [1, 2, 4, 8, 8, 8]:
+            self.assertEqual(backoff.ceiling(), expected_ceiling)
+            delay = backoff.next_delay()
+            self.assertTrue(0 <= delay <= expected_ceiling)
+
+    def test_jitter_spreads_simultaneous_clients(self):
+        delays = [ExponentialBackoff(base=1.0, cap=60.0, rng=random.Random(i)).next_delay() for i in range(30)]
+        self.assertGreater(len({round(d, 2) for d in delays}), 20)
+
+    def test_reset_and_exhaustion(self):
+        backoff = ExponentialBackoff(base=1.0, cap=10.0, max_attempts=2)
+        backoff.next_delay()
+        self.assertFalse(backoff.exhausted())
+        backoff.next_delay()
+        self.assertTrue(backoff.exhausted())
+        backoff.reset()
+        self.assertFalse(backoff.exhausted())
+        self.assertEqual(backoff.ceiling(), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
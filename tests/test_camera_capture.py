@@ -0,0 +1,178 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from core.backoff import ExponentialBackoff
+from core.camera_manager import CameraStream, resolve_capture_settings
+from core.industrial_camera import CameraStatus
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in that decodes at a fixed native size and stops the stream after `reads`."""
+
+    def __init__(self, stream, shape=(12, 16, 3), reads=5, grab_ok=True):
+        self.stream = stream
+        self.shape = shape
+        self.reads_left = reads
+        self.grab_ok = grab_ok
+        self.reads = 0
+        self.grabs = 0
+        self.targets = []  # `image` argument of every read()
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return False  # Like most RTSP sources: decode size is not honoured
+
+    def grab(self):
+        self.grabs += 1
+        if self.grabs > 1000:
+            self.stream.running = False
+        return self.grab_ok
+
+    def read(self, image=None):
+        self.reads += 1
+        self.targets.append(image)
+        self.reads_left -= 1
+        if self.reads_left <= 0:
+            self.stream.running = False
+        if image is not None and image.shape == self.shape:
+            image[:] = self.reads
+            return True, image
+        return True, np.full(self.shape, self.reads, dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class FlakyStream(CameraStream):
+    """CameraStream whose source fails `failures` opens before it comes up with a FakeCapture."""
+
+    def __init__(self, failures, reads=3, **settings):
+        super().__init__("cam", "file", "fake.avi", buffer_size=3, capture_settings=settings)
+        self.failures = failures
+        self.reads = reads
+        self.opens = 0
+        self.statuses = []
+        self.add_status_listener(lambda _id, old, new: self.statuses.append((new, self.backoff.attempt)))
+
+    def open_capture(self):
+        self.opens += 1
+        if self.opens <= self.failures:
+            return False
+        self.capture = FakeCapture(self, reads=self.reads)
+        return True
+
+
+class CeilingRandom:
+    """random.Random stand-in that always picks the longest backoff delay."""
+
+    def uniform(self, low, high):
+        return high
+
+
+def make_stream(**settings):
+    stream = CameraStream("cam", "file", "fake.avi", buffer_size=3, capture_settings=settings)
+    stream.running = True
+    return stream
+
+
+class TestCaptureSettings(unittest.TestCase):
+    def test_defaults_do_not_cap_or_resize(self):
+        settings = resolve_capture_settings({}, "ip_0")
+        self.assertEqual((settings["decode_width"], settings["max_fps"], settings["grab_skip"]), (0, 0, 0))
+        stream = make_stream()
+        self.assertIsNone(stream.decode_size)
+        self.assertEqual(stream.min_frame_interval, 0.0)
+
+    def test_camera_override_wins_over_default(self):
+        settings = resolve_capture_settings(
+            {"default": {"max_fps": 5}, "cameras": {"ip_1": {"max_fps": 2}}}, "ip_1")
+        self.assertEqual(settings["max_fps"], 2)
+
+
+class TestCameraStreamCapture(unittest.TestCase):
+    def test_native_frames_are_read_into_ring_slots(self):
+        stream = make_stream()
+        stream.capture = FakeCapture(stream, reads=4)
+        stream._stream()
+        self.assertIsNone(stream.capture.targets[0])  # No slot before the first frame fixes the shape
+        self.assertTrue(all(t is not None for t in stream.capture.targets[1:]))
+        self.assertEqual(stream.get_latest().seq, 3)
+
+    def test_downscale_goes_into_ring_slot(self):
+        stream = make_stream(decode_width=8, decode_height=6)
+        stream.capture = FakeCapture(stream, shape=(12, 16, 3), reads=4)
+        stream._stream()
+        packet = stream.get_latest()
+        self.assertEqual(packet.frame.shape, (6, 8, 3))
+        self.assertEqual(int(packet.frame[0, 0, 0]), 4)
+        self.assertTrue(np.shares_memory(packet.frame, stream.buffer.slots))
+        # Native decodes reuse one scratch frame instead of allocating per read
+        scratch = stream.capture.targets[-1]
+        self.assertIs(stream._scratch, scratch)
+        self.assertIs(stream.capture.targets[-2], scratch)
+
+    def test_grab_skip_grabs_between_retrieved_frames(self):
+        stream = make_stream(grab_skip=2)
+        stream.capture = FakeCapture(stream, reads=3)
+        stream._stream()
+        self.assertEqual(stream.capture.reads, 3)
+        self.assertEqual(stream.capture.grabs, 6)
+
+    def test_max_fps_grabs_without_decoding(self):
+        stream = make_stream(max_fps=0.001)
+        stream.capture = FakeCapture(stream, reads=10)
+        stream._stream()
+        self.assertEqual(stream.capture.reads, 1)  # Only the first frame is retrieved
+        self.assertGreater(stream.capture.grabs, 0)
+        self.assertEqual(stream.get_latest().seq, 0)
+
+    def test_failed_grab_under_fps_cap_counts_as_failed_read(self):
+        stream = make_stream(max_fps=0.001)
+        stream.max_failed_reads = 3
+        stream.capture = FakeCapture(stream, reads=10, grab_ok=False)
+        stream._stream()
+        snapshot = stream.metrics.snapshot()
+        self.assertEqual(snapshot["frames_total"], 1)
+        self.assertEqual(snapshot["failed_reads"], 3)
+
+
+class TestReconnectSupervision(unittest.TestCase):
+    def test_failed_opens_back_off_until_stream_comes_up(self):
+        stream = FlakyStream(failures=3, reconnect_base_s=0.001, reconnect_cap_s=0.002)
+        stream.running = True
+        stream.update_frames()
+
+        states = [status for status, _ in stream.statuses]
+        self.assertEqual(states, [CameraStatus.RECONNECTING, CameraStatus.CONNECTED,
+                                  CameraStatus.STREAMING, CameraStatus.DISCONNECTED])
+        self.assertEqual(stream.opens, 4)
+        self.assertEqual(stream.reconnect_count, 3)
+        self.assertEqual(dict(stream.statuses)[CameraStatus.CONNECTED], 3)
+        # The first frame resets the backoff, so the next outage starts from the base delay
+        self.assertEqual(stream.backoff.attempt, 0)
+        self.assertEqual(stream.get_latest().seq, 2)
+
+    def test_stop_interrupts_backoff_wait(self):
+        stream = FlakyStream(failures=1000, reconnect_base_s=60, reconnect_cap_s=60)
+        stream.backoff = ExponentialBackoff(base=60, cap=60, rng=CeilingRandom())
+        reconnecting = threading.Event()
+        stream.add_status_listener(
+            lambda _id, old, new: new == CameraStatus.RECONNECTING and reconnecting.set())
+        stream.start()
+        self.assertTrue(reconnecting.wait(5))
+
+        started = time.monotonic()
+        stream.stop()
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertFalse(stream.thread.is_alive())
+        self.assertEqual(stream.status, CameraStatus.DISCONNECTED)
+        self.assertEqual(stream.opens, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import camera_manager
+from core.camera_manager import CameraManager, CameraStream
+from core.industrial_camera import CameraStatus
+
+
+class FakeCapture:
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class FakeStream(CameraStream):
+    """Opens after `delay` seconds with result `ok`; never starts a capture thread."""
+
+    def __init__(self, source_id, source_type, source_value, ok=True, delay=0.0):
+        super().__init__(source_id, source_type, source_value, capture_settings={})
+        self.ok, self.delay = ok, delay
+
+    def open_capture(self):
+        time.sleep(self.delay)
+        if self.ok:
+            self.capture = FakeCapture()
+        return self.ok
+
+    def start(self):
+        pass
+
+
+class FakeManager(CameraManager):
+    def __init__(self, behaviour):
+        super().__init__(capture_settings={})
+        self.behaviour = behaviour  # source_id → (ok, delay)
+
+    def _create_stream(self, source_id, source_type, source_value, open_timeout=10.0):
+        ok, delay = self.behaviour.get(source_id, (True, 0.0))
+        return FakeStream(source_id, source_type, source_value, ok, delay)
+
+
+class TestCameraDiscovery(unittest.TestCase):
+    def test_startup_report_statuses(self):
+        manager = FakeManager({"ip_0": (True, 0.0), "ip_1": (False, 0.0), "usb_0": (False, 0.0)})
+        report = manager.connect_async(
+            [("ip_0", "ip", "rtsp://a"), ("ip_1", "ip", "rtsp://b"), ("usb_0", "usb", 0)],
+            timeout=1.0, wait_for_all=True)
+        self.assertEqual({cid: entry["status"] for cid, entry in report.items()},
+                         {"ip_0": "attached", "ip_1": "retrying", "usb_0": "failed"})
+        # Unreachable IP cameras stay attached and reconnect; dead USB indexes are dropped
+        self.assertEqual(sorted(manager.cameras), ["ip_0", "ip_1"])
+        self.assertEqual(manager.cameras["ip_1"].status, CameraStatus.RECONNECTING)
+        self.assertIsNotNone(report["ip_0"]["elapsed_s"])
+
+    def test_sources_connect_concurrently(self):
+        sources = [(f"ip_{i}", "ip", f"rtsp://{i}") for i in range(4)]
+        manager = FakeManager({cid: (True, 0.3) for cid, _, _ in sources})
+        started = time.time()
+        manager.connect_async(sources, timeout=2.0, wait_for_all=True)
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(len(manager.cameras), 4)
+
+    def test_slow_source_is_reported_then_attaches_late(self):
+        manager = FakeManager({"ip_0": (True, 1.5)})
+        report = manager.connect_async([("ip_0", "ip", "rtsp://slow")], timeout=0.2, wait_for_all=True)
+        self.assertEqual(report["ip_0"]["status"], "timeout")
+        deadline = time.time() + 3
+        while time.time() < deadline and "ip_0" not in manager.cameras:
+            time.sleep(0.05)
+        self.assertEqual(report["ip_0"]["status"], "attached")
+
+    def test_auto_initialize_numbers_working_webcams_in_order(self):
+        manager = FakeManager({})
+        with mock.patch.object(camera_manager, "find_working_webcams", return_value=[2, 5]) as probe, \
+                mock.patch.object(camera_manager, "load_ip_cameras_from_config", return_value=["rtsp://a"]):
+            manager.auto_initialize_all_cameras(webcam_max=6, timeout=1.0)
+        probe.assert_called_once_with(6, 1.0)
+        self.assertEqual(sorted(manager.cameras), ["ip_0", "usb_0", "usb_1"])
+        self.assertEqual(manager.cameras["usb_1"].source_value, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from core.camera_manager import CameraManager, CameraStream
+from core.capture_metrics import CaptureMetrics
+from core.industrial_camera import CameraStatus
+
+
+class TestCaptureMetrics(unittest.TestCase):
+    def test_empty_snapshot(self):
+        snapshot = CaptureMetrics().snapshot()
+        self.assertEqual(snapshot["frames_total"], 0)
+        self.assertEqual(snapshot["decode_fps"], 0.0)
+        self.assertIsNone(snapshot["read_p50_ms"])
+        self.assertIsNone(snapshot["frame_age_s"])
+
+    def test_snapshot_counts_and_percentiles(self):
+        metrics = CaptureMetrics(window=200)
+        for i in range(1, 101):
+            metrics.record_read(i / 1000.0, True, nbytes=1234)
+        metrics.record_read(0.5, False)
+        metrics.frame_times = type(metrics.frame_times)([0.0, 10.0], maxlen=200)  # 1 frame per 10 s
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["frames_total"], 100)
+        self.assertEqual(snapshot["failed_reads"], 1)
+        self.assertEqual(snapshot["bytes_per_frame"], 1234)
+        self.assertEqual(snapshot["read_p50_ms"], 51.0)
+        self.assertEqual(snapshot["read_p99_ms"], 100.0)
+        self.assertEqual(snapshot["decode_fps"], 0.1)
+        self.assertIsNotNone(snapshot["frame_age_s"])
+
+    def test_latency_window_is_bounded(self):
+        metrics = CaptureMetrics(window=4)
+        for i in range(10):
+            metrics.record_read(float(i), True)
+        self.assertEqual(list(metrics.read_latencies), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(metrics.frames_total, 10)
+
+
+class TestCameraManagerMetrics(unittest.TestCase):
+    def setUp(self):
+        self.manager = CameraManager(capture_settings={})
+        cam = CameraStream("ip_0", "ip", "rtsp://a", capture_settings={})
+        cam._set_status(CameraStatus.RECONNECTING)
+        cam.reconnect_count = 2
+        cam.metrics.record_read(0.01, True, nbytes=10)
+        self.manager.cameras["ip_0"] = cam
+
+    def test_get_metrics_adds_status_and_reconnects(self):
+        metrics = self.manager.get_metrics()["ip_0"]
+        self.assertEqual(metrics["status"], "RECONNECTING")
+        self.assertEqual(metrics["reconnects"], 2)
+        self.assertEqual(metrics["frames_total"], 1)
+
+    def test_get_status(self):
+        status = self.manager.get_status()["ip_0"]
+        self.assertEqual(status["status"], "RECONNECTING")
+        self.assertEqual(status["reconnects"], 2)
+        self.assertIsNotNone(status["since"])
+
+
+if __name__ == "__main__":
+    unittest.main()
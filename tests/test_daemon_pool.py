@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import threading
+import unittest
+
+from core.daemon_pool import DaemonThreadPool
+
+
+class TestDaemonThreadPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = DaemonThreadPool(max_workers=2, thread_name_prefix="test")
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True, timeout=2)
+
+    def test_results_and_exceptions_reach_the_future(self):
+        self.assertEqual(self.pool.submit(sum, [1, 2, 3]).result(timeout=2), 6)
+        with self.assertRaises(ZeroDivisionError):
+            self.pool.submit(lambda: 1 / 0).result(timeout=2)
+        self.assertTrue(all(thread.daemon for thread in self.pool.threads))
+
+    def test_threads_are_reused_and_capped(self):
+        for _ in range(10):
+            self.pool.submit(int).result(timeout=2)
+        self.assertEqual(len(self.pool.threads), 1)
+
+        gate = threading.Event()
+        blocked = [self.pool.submit(gate.wait, 2) for _ in range(3)]
+        self.assertEqual(len(self.pool.threads), 2)
+        gate.set()
+        self.assertTrue(all(future.result(timeout=2) for future in blocked))
+
+    def test_shutdown_cancels_queued_calls(self):
+        gate = threading.Event()
+        running = [self.pool.submit(gate.wait, 2) for _ in range(2)]
+        queued = self.pool.submit(int)
+        self.pool.shutdown(cancel_futures=True)
+        gate.set()
+        self.assertTrue(queued.cancelled())
+        self.assertTrue(all(future.result(timeout=2) for future in running))
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(int)
+
+    def test_hung_call_does_not_block_interpreter_exit(self):
+        script = (
+            "import threading\n"
+            "from core.daemon_pool import DaemonThreadPool\n"
+            "DaemonThreadPool(1).submit(threading.Event().wait)\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", script], timeout=20)
+        self.assertEqual(proc.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
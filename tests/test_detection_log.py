@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from core import detection_log
+from core.log_manager import LogManager
+from core.log_writer import AsyncLogWriter
+
+
+class TestDetectionLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.writer = AsyncLogWriter({"max_queue": 100000, "flush_lines": 500, "flush_interval_s": 0.05,
+                                      "idle_close_s": 60.0})
+        self.day = datetime(2025, 5, 6, 8, 0, 0)
+        self.start_ms = int(self.day.timestamp() * 1000)
+        self.path = detection_log.day_path(self.tmp.name, self.day)
+        # One record every 100 ms for 10 minutes, alternating cameras
+        for i in range(6000):
+            ts = self.start_ms + i * 100
+            record = detection_log.make_record("fire_detection", ts, f"cam{i % 2}", "INFO", "FIRE",
+                                               {"fire_detected": i % 7 == 0, "seq": i})
+            self.writer.write_record(self.path, ts, record)
+        self.writer.flush()
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def test_index_is_sparse_and_points_at_lines(self):
+        timestamps, offsets = detection_log.read_index(self.path)
+        self.assertEqual(len(timestamps), 600)  # One entry per second of log time
+        with open(self.path, 'rb') as f:
+            f.seek(offsets[42])
+            self.assertEqual(json.loads(f.readline())["ts"], timestamps[42])
+
+    def test_range_query_matches_full_scan(self):
+        start, end = self.start_ms + 123_400, self.start_ms + 125_000
+        records = detection_log.query(self.tmp.name, start, end)
+        self.assertEqual([r["fields"]["seq"] for r in records], list(range(1234, 1251)))
+
+        cam1 = detection_log.query(self.tmp.name, start, end, camera_id="cam1")
+        self.assertTrue(all(r["camera_id"] == "cam1" for r in cam1))
+        self.assertEqual(len(cam1), 8)
+
+    def test_tail_and_torn_last_line(self):
+        with open(self.path, 'ab') as f:
+            f.write(b'{"ts": 1, "plug')
+        records = detection_log.tail(self.path, limit=3)
+        self.assertEqual([r["fields"]["seq"] for r in records], [5997, 5998, 5999])
+        self.assertIn(":: fire_detected:", detection_log.format_text(records[0]))
+
+    def test_log_manager_writes_and_queries_jsonl(self):
+        config_path = os.path.join(self.tmp.name, "logging_config.json")
+        with open(config_path, 'w') as f:
+            json.dump({"helmet_detection": {"enabled": True, "log_format": "jsonl", "log_trigger_filter": "all",
+                                            "output_path": os.path.join(self.tmp.name, "helmet"),
+                                            "meta_fields": ["helmet_detected"]}}, f)
+        manager = LogManager(config_path, log_dir=self.tmp.name)
+        manager.writer = self.writer
+        before = datetime.now()
+        manager.log("helmet_detection", {"helmet_detected": True, "timestamp_ms": 1}, camera_id="ip_1")
+
+        records = manager.query_logs("helmet_detection", before, datetime.now())
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["camera_id"], "ip_1")
+        self.assertEqual(records[0]["fields"], {"helmet_detected": True})
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "helmet", f"{before:%Y-%m-%d}.log")))
+        self.assertEqual(len(manager.get_recent_logs("helmet_detection")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
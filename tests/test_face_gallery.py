@@ -0,0 +1,62 @@
+import time
+import unittest
+import numpy as np
+from plugins.face_recognition.gallery import FaceGallery, lbp_embedding
+
+
+def random_unit(n, dim, seed):
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestFaceGallery(unittest.TestCase):
+    def test_lbp_embedding_is_unit_length(self):
+        face = np.random.default_rng(0).integers(0, 255, (80, 70), dtype=np.uint8)
+        vector = lbp_embedding(face)
+        self.assertEqual(vector.shape, (4 * 4 * 59,))
+        self.assertAlmostEqual(float(np.linalg.norm(vector)), 1.0, places=5)
+
+    def test_search_finds_nearest_identity(self):
+        gallery = FaceGallery()
+        people = random_unit(3, 32, seed=1)
+        for i, vector in enumerate(people):
+            gallery.add(f"person_{i}", vector[None])
+        query = people[1] + 0.05 * random_unit(1, 32, seed=2)[0]
+        matches = gallery.search(query[None] / np.linalg.norm(query), k=2)[0]
+        self.assertEqual(matches[0][0], "person_1")
+        self.assertEqual(len(matches), 2)
+
+    def test_incremental_add_and_remove(self):
+        gallery = FaceGallery()
+        vectors = random_unit(4, 16, seed=3)
+        gallery.add("a", vectors[:2])
+        gallery.add("b", vectors[2:3])
+        gallery.add("c", vectors[3:])
+        self.assertTrue(gallery.remove("a"))
+        self.assertEqual(len(gallery), 2)
+        self.assertEqual(gallery.search(vectors[3:], k=1)[0][0][0], "c")
+        self.assertIn(gallery.search(vectors[:1], k=5)[0][0][0], ("b", "c"))
+        self.assertFalse(gallery.remove("a"))
+
+    def test_identify_applies_threshold(self):
+        gallery = FaceGallery(embedder=lambda face: face.ravel().astype(np.float32))
+        gallery.add("known", gallery.embed([np.array([[1.0, 0.0]])]))
+        names = gallery.identify([np.array([[1.0, 0.1]]), np.array([[0.0, 1.0]])], threshold=0.9)
+        self.assertEqual([name for name, _ in names], ["known", "Unknown"])
+
+    def test_ivf_index_on_large_gallery(self):
+        gallery = FaceGallery(ivf_threshold=2000, ivf_nprobe=8)
+        vectors = random_unit(5000, 64, seed=4)
+        for start in range(0, 5000, 500):
+            for i in range(start, start + 500):
+                gallery.add(f"id_{i}", vectors[i:i + 1])
+        self.assertIsNotNone(gallery.index)
+        started = time.perf_counter()
+        matches = gallery.search(vectors[:50], k=1)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        hits = sum(m[0][0] == f"id_{i}" for i, m in enumerate(matches))
+        self.assertGreaterEqual(hits, 45)
+
+
+if __name__ == "__main__":
+    unittest.main()
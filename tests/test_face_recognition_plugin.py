@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from plugins.face_recognition.gallery import FaceGallery
+from plugins.face_recognition.plugin import Plugin
+
+
+class StubCascade:
+    """detectMultiScale stand-in that always finds the same boxes."""
+
+    def __init__(self, boxes):
+        self.boxes = np.array(boxes)
+
+    def detectMultiScale(self, image, scaleFactor=1.1, minNeighbors=5):
+        return self.boxes
+
+
+class StubbedPlugin(Plugin):
+    """Face plugin without the Haar cascade file or Known_faces on disk."""
+
+    face_cascade = None
+
+    def __init__(self, boxes, gallery):
+        self.plugin_name = "face_recognition"
+        self.face_cascade = StubCascade(boxes)
+        self.gallery = gallery
+        self.model = True
+        self.trackers = {}
+
+
+class TestFaceRecognitionPlugin(unittest.TestCase):
+    def setUp(self):
+        # Bright face on the left, dark face on the right; the embedding only sees brightness
+        self.frame = np.zeros((120, 200, 3), dtype=np.uint8)
+        self.frame[10:50, 10:50] = 200
+        gallery = FaceGallery(embedder=lambda face: np.array([face.mean() + 1.0, 1.0]))
+        gallery.add("alice", gallery.embed([np.full((40, 40), 200, dtype=np.uint8)]))
+        self.plugin = StubbedPlugin([[10, 10, 40, 40], [120, 50, 40, 40]], gallery)
+
+    def test_every_face_is_reported(self):
+        result = self.plugin.process(self.frame, camera_id="cam1")
+
+        self.assertTrue(result["face_recognized"])
+        self.assertEqual(result["face_count"], 2)
+        faces = sorted(result["faces"], key=lambda face: face["box"][0])
+        self.assertEqual([face["box"] for face in faces], [[10, 10, 40, 40], [120, 50, 40, 40]])
+        self.assertEqual([face["person_name"] for face in faces], ["alice", "Unknown"])
+        self.assertNotEqual(faces[0]["track_id"], faces[1]["track_id"])
+
+    def test_headline_fields_come_from_best_named_face(self):
+        result = self.plugin.process(self.frame, camera_id="cam1")
+
+        self.assertEqual(result["person_name"], "alice")
+        self.assertAlmostEqual(result["confidence"], 100.0, places=1)
+        self.assertEqual(result["camera_id"], "cam1")
+
+    def test_no_faces(self):
+        self.plugin.face_cascade = StubCascade(np.empty((0, 4)))
+        result = self.plugin.process(self.frame, camera_id="cam1")
+
+        self.assertFalse(result["face_recognized"])
+        self.assertEqual((result["person_name"], result["confidence"], result["faces"]), ("Unknown", 0.0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from plugins.face_recognition.tracker import FaceTracker, iou_matrix
+
+
+class TestFaceTracker(unittest.TestCase):
+    def test_iou_matrix(self):
+        ious = iou_matrix([(0, 0, 10, 10)], [(0, 0, 10, 10), (5, 0, 10, 10), (50, 50, 5, 5)])
+        self.assertAlmostEqual(float(ious[0, 0]), 1.0)
+        self.assertAlmostEqual(float(ious[0, 1]), 50 / 150)
+        self.assertEqual(float(ious[0, 2]), 0.0)
+
+    def test_tracks_persist_across_frames(self):
+        tracker = FaceTracker()
+        first = tracker.update([(0, 0, 40, 40), (100, 100, 40, 40)])
+        second = tracker.update([(102, 101, 40, 40), (2, 1, 40, 40)])
+        self.assertIs(second[0], first[1])
+        self.assertIs(second[1], first[0])
+
+    def test_recognition_only_for_new_or_stale_tracks(self):
+        tracker = FaceTracker(reidentify_every=3)
+        tracks = tracker.update([(0, 0, 40, 40)])
+        self.assertEqual(tracker.pending(tracks), [0])
+        tracks[0].set_identity("alice", 90.0)
+
+        calls = 0
+        for step in range(1, 7):
+            tracks = tracker.update([(step, 0, 40, 40), (200, 200, 30, 30)] if step == 4 else [(step, 0, 40, 40)])
+            for i in tracker.pending(tracks):
+                calls += 1
+                tracks[i].set_identity("someone", 50.0)
+        # Refreshes at updates 3 and 6, plus the one new face at update 4
+        self.assertEqual(calls, 3)
+
+    def test_lost_tracks_expire(self):
+        tracker = FaceTracker(max_missed=1)
+        tracker.update([(0, 0, 40, 40)])
+        tracker.update([])
+        tracker.update([])
+        self.assertEqual(tracker.tracks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from core.frame_buffer import FrameRingBuffer
+
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = FrameRingBuffer(capacity=3)
+
+    def _frame(self, value):
+        return np.full((4, 6, 3), value, dtype=np.uint8)
+
+    def test_empty_buffer_returns_none(self):
+        self.assertIsNone(self.buffer.get_latest())
+        self.assertIsNone(self.buffer.get_frame())
+
+    def test_sequence_ids_are_monotonic(self):
+        seqs = [self.buffer.put(self._frame(i)) for i in range(5)]
+        self.assertEqual(seqs, [0, 1, 2, 3, 4])
+        packet = self.buffer.get_latest()
+        self.assertEqual(packet.seq, 4)
+        self.assertEqual(int(packet.frame[0, 0, 0]), 4)
+
+    def test_since_seq_skips_already_processed(self):
+        seq = self.buffer.put(self._frame(1))
+        self.assertIsNone(self.buffer.get_latest(since_seq=seq))
+        self.buffer.put(self._frame(2))
+        self.assertEqual(self.buffer.get_latest(since_seq=seq).seq, seq + 1)
+
+    def test_read_into_slot_reuses_memory(self):
+        self.buffer.put(self._frame(0))
+        slot = self.buffer.next_slot()
+        slot[:] = 7
+        self.buffer.commit(slot)
+        packet = self.buffer.get_latest()
+        self.assertTrue(np.shares_memory(packet.frame, self.buffer.slots))
+        self.assertEqual(int(packet.frame[0, 0, 0]), 7)
+
+    def test_resolution_change_reallocates(self):
+        self.buffer.put(self._frame(1))
+        self.buffer.put(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertEqual(self.buffer.get_frame().shape, (8, 8, 3))
+
+    def test_view_is_rechecked_after_writer_laps_it(self):
+        self.buffer.put(self._frame(1))
+        packet = self.buffer.get_latest()
+        self.assertTrue(self.buffer.is_current(packet.seq))
+        for i in range(self.buffer.capacity):
+            self.buffer.put(self._frame(10 + i))
+        self.assertFalse(self.buffer.is_current(packet.seq))
+
+    def test_get_frame_returns_private_copy(self):
+        self.buffer.put(self._frame(1))
+        frame = self.buffer.get_frame()
+        self.assertFalse(np.shares_memory(frame, self.buffer.slots))
+        self.assertIsNotNone(self.buffer.get_latest(copy=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import threading
+import unittest
+from unittest import mock
+import cv2
+import numpy as np
+from core.frame_cache import FrameContext, get_cascade
+
+
+class TestFrameContext(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.random.randint(0, 255, (36, 64, 3), dtype=np.uint8)
+        self.ctx = FrameContext(self.frame, "cam_a")
+
+    def test_derived_variants_are_computed_once(self):
+        self.assertIs(self.ctx.gray, self.ctx.gray)
+        self.assertEqual(self.ctx.gray.shape, (36, 64))
+        self.assertIs(self.ctx.equalized, self.ctx.equalized)
+
+    def test_resized_is_cached_per_size(self):
+        small = self.ctx.resized((32, 18))
+        self.assertEqual(small.shape, (18, 32, 3))
+        self.assertIs(small, self.ctx.resized((32, 18)))
+        self.assertIs(self.ctx.resized((64, 36)), self.frame)
+
+    def test_custom_factory(self):
+        calls = []
+        factory = lambda ctx: calls.append(1) or ctx.frame.mean()
+        self.ctx.get("mean", factory)
+        self.ctx.get("mean", factory)
+        self.assertEqual(len(calls), 1)
+
+
+class FakeCascade:
+    def __init__(self, path):
+        self.path = path
+
+    def empty(self):
+        return False
+
+
+class TestCascadePerThread(unittest.TestCase):
+    def test_each_thread_gets_its_own_cascade(self):
+        with mock.patch.object(cv2, "CascadeClassifier", FakeCascade):
+            mine = get_cascade("fake_cascade.xml")
+            self.assertIs(get_cascade("fake_cascade.xml"), mine)
+            other = []
+            thread = threading.Thread(target=lambda: other.append(get_cascade("fake_cascade.xml")))
+            thread.start()
+            thread.join()
+        self.assertIsInstance(other[0], FakeCascade)
+        self.assertIsNot(other[0], mine)
+
+
+@unittest.skipUnless(os.path.exists(cv2.data.haarcascades + "haarcascade_frontalface_default.xml"),
+                     "OpenCV build ships no Haar cascades")
+class TestCascadeCache(unittest.TestCase):
+    def test_cascade_loaded_once(self):
+        self.assertIs(get_cascade(), get_cascade())
+
+
+if __name__ == "__main__":
+    unittest.main()
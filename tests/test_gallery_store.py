@@ -0,0 +1,106 @@
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from plugins.face_recognition.gallery import FaceGallery
+from plugins.face_recognition.gallery_store import GalleryStore
+
+
+def extract_file(path):
+    """Fake detector: one "face" whose pixels encode the file content."""
+    with open(path, "rb") as f:
+        value = f.read()[0]
+    face = np.zeros((2, 4), dtype=np.float32)
+    face[0, value % 4] = 1.0
+    return [face]
+
+
+def load_in_process(faces_dir, cache_dir, results):
+    gallery = FaceGallery(embedder=lambda face: face.ravel())
+    stats = GalleryStore(faces_dir, cache_dir).load(gallery, extract_file)
+    results.put((stats["reprocessed"], np.asarray(gallery.embeddings).tolist()))
+
+
+class TestGalleryStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.faces_dir = os.path.join(self.root, "Known_faces")
+        self.cache_dir = os.path.join(self.root, "cache")
+        for person, value in (("alice", 1), ("bob", 2)):
+            os.makedirs(os.path.join(self.faces_dir, person))
+            self._write(person, "a.jpg", value)
+        self.extracted = []
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, person, name, value):
+        with open(os.path.join(self.faces_dir, person, name), "wb") as f:
+            f.write(bytes([value]) * 16)
+
+    def _extract(self, path):
+        self.extracted.append(os.path.basename(os.path.dirname(path)))
+        return extract_file(path)
+
+    def _load(self):
+        gallery = FaceGallery(embedder=lambda face: face.ravel())
+        stats = GalleryStore(self.faces_dir, self.cache_dir).load(gallery, self._extract)
+        return gallery, stats
+
+    def test_second_load_reuses_memmapped_artifact(self):
+        first, stats = self._load()
+        self.assertEqual(stats["reprocessed"], 2)
+        self.extracted.clear()
+
+        second, stats = self._load()
+        self.assertEqual(self.extracted, [])
+        self.assertEqual(stats["reused"], 2)
+        self.assertIsInstance(second.matrix, np.memmap)
+        np.testing.assert_array_equal(first.embeddings, second.embeddings)
+        self.assertEqual(second.search(first.embeddings[1:2])[0][0][0], "bob")
+
+    def test_only_new_or_changed_images_are_reprocessed(self):
+        self._load()
+        self.extracted.clear()
+        self._write("bob", "a.jpg", 3)
+        os.makedirs(os.path.join(self.faces_dir, "carol"))
+        self._write("carol", "c.jpg", 1)
+
+        gallery, stats = self._load()
+        self.assertEqual(sorted(self.extracted), ["bob", "carol"])
+        self.assertEqual(stats["reused"], 1)
+        self.assertEqual(sorted(gallery.ids), ["alice", "bob", "carol"])
+
+    def test_removed_person_drops_out(self):
+        self._load()
+        shutil.rmtree(os.path.join(self.faces_dir, "bob"))
+        gallery, stats = self._load()
+        self.assertEqual(stats["removed"], 1)
+        self.assertEqual(list(gallery.ids), ["alice"])
+        gallery.remove("alice")  # Copy-on-write out of the read-only map
+        self.assertEqual(len(gallery), 0)
+
+
+    def test_concurrent_worker_loads_build_once(self):
+        ctx = mp.get_context("spawn")
+        results = ctx.Queue()
+        procs = [ctx.Process(target=load_in_process, args=(self.faces_dir, self.cache_dir, results))
+                 for _ in range(4)]
+        for proc in procs:
+            proc.start()
+        replies = [results.get(timeout=60) for _ in procs]
+        for proc in procs:
+            proc.join(timeout=10)
+            self.assertEqual(proc.exitcode, 0)
+
+        self.assertEqual(sorted(count for count, _ in replies), [0, 0, 0, 2])
+        self.assertTrue(all(rows == replies[0][1] for _, rows in replies))
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), [".lock", "embeddings_1.npy", "manifest.json"])
+        gallery, stats = self._load()
+        self.assertEqual(stats["reused"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
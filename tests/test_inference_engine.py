@@ -0,0 +1,116 @@
+import unittest
+from contextlib import contextmanager
+import numpy as np
+from core.inference_engine import letterbox, preprocess_batch, nms, postprocess_detections, InferenceEngine, ModelHandle
+
+
+class StaticBatchSession:
+    """ONNX session stand-in that, like a fixed-shape export, rejects any other batch size."""
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.calls = []
+
+    def run(self, output_names, feeds):
+        blob = feeds["images"]
+        if blob.shape[0] != self.batch:
+            raise RuntimeError(f"Got invalid dimensions for input: images index: 0 Got: {blob.shape[0]}")
+        self.calls.append(blob.shape[0])
+        # (N, 4 + 1 class, 2 anchors); the box centre encodes the frame's mean so results can be matched
+        output = np.zeros((blob.shape[0], 5, 2), dtype=np.float32)
+        output[:, 0, 0] = output[:, 1, 0] = blob.reshape(blob.shape[0], -1).mean(axis=1) * 10 + 10
+        output[:, 2:4, 0] = 4
+        output[:, 4, 0] = 0.9
+        return [output]
+
+
+class FakeSessionPool:
+    def __init__(self, batch_dim):
+        self.input_name = "images"
+        self.input_shape = [batch_dim, 3, 32, 32]
+        self.session_obj = StaticBatchSession(batch_dim if isinstance(batch_dim, int) else None)
+
+    @contextmanager
+    def session(self):
+        yield self.session_obj
+
+
+class TestPreprocessing(unittest.TestCase):
+    def test_letterbox_keeps_aspect_and_pads(self):
+        image = np.zeros((360, 640, 3), dtype=np.uint8)
+        padded, ratio, (pad_x, pad_y) = letterbox(image, (640, 640))
+        self.assertEqual(padded.shape, (640, 640, 3))
+        self.assertEqual(ratio, 1.0)
+        self.assertEqual((pad_x, pad_y), (0, 140))
+        self.assertEqual(padded[0, 0, 0], 114)
+
+    def test_preprocess_batch_is_nchw_rgb(self):
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        frame[..., 2] = 255  # Red in BGR
+        blob, metas = preprocess_batch([frame, frame], (32, 32))
+        self.assertEqual(blob.shape, (2, 3, 32, 32))
+        self.assertEqual(blob.dtype, np.float32)
+        self.assertAlmostEqual(float(blob[0, 0].mean()), 1.0)
+        self.assertEqual(metas[0], (0.5, (0, 0), (64, 64)))
+
+
+class TestPostprocessing(unittest.TestCase):
+    def test_nms_suppresses_overlaps(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [20, 20, 30, 30]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+        self.assertEqual(nms(boxes, scores, 0.5).tolist(), [0, 2])
+
+    def test_yolov8_decoding_maps_back_to_frame(self):
+        # One frame, 2 classes, 3 anchors: (1, 4 + 2, 3)
+        output = np.zeros((1, 6, 3), dtype=np.float32)
+        output[0, :4, 0] = [320, 320, 100, 100]
+        output[0, 4, 0] = 0.9   # class 0, kept
+        output[0, :4, 1] = [322, 322, 100, 100]
+        output[0, 4, 1] = 0.6   # same class, overlapping → suppressed
+        output[0, :4, 2] = [320, 320, 100, 100]
+        output[0, 5, 2] = 0.8   # other class, same box → kept
+        metas = [(0.5, (0, 140), (720, 1280))]
+        detections = postprocess_detections(output, metas, conf_threshold=0.5)[0]
+        self.assertEqual(len(detections), 2)
+        np.testing.assert_allclose(detections[0, :4], [540, 260, 740, 460])
+        self.assertEqual(sorted(detections[:, 5].tolist()), [0.0, 1.0])
+
+
+class TestInferenceEngine(unittest.TestCase):
+    def test_thread_budget(self):
+        engine = InferenceEngine({"intra_op_threads": 2, "max_concurrent_runs": 0, "sessions_per_model": 0, "inter_op_threads": 1})
+        self.assertEqual(engine.intra_op_threads, 2)
+        self.assertGreaterEqual(engine.max_concurrent_runs, 1)
+        self.assertEqual(engine.sessions_per_model, engine.max_concurrent_runs)
+
+    def test_static_batch_model_gets_frames_in_chunks(self):
+        pool = FakeSessionPool(1)
+        handle = ModelHandle(InferenceEngine({}), pool, {"input_size": (32, 32), "conf_threshold": 0.5})
+        frames = [np.full((32, 32, 3), v, dtype=np.uint8) for v in (0, 51, 102)]
+        detections = handle.detect(frames)
+        self.assertEqual(pool.session_obj.calls, [1, 1, 1])
+        self.assertEqual(len(detections), 3)
+        self.assertEqual([round(float(d[0, 0]) + 2) for d in detections], [10, 12, 14])
+
+    def test_static_batch_pads_last_chunk(self):
+        pool = FakeSessionPool(2)
+        handle = ModelHandle(InferenceEngine({}), pool, {})
+        output = handle.run(np.zeros((3, 3, 32, 32), dtype=np.float32))
+        self.assertEqual(pool.session_obj.calls, [2, 2])
+        self.assertEqual(output.shape[0], 3)
+
+    def test_dynamic_batch_runs_once(self):
+        pool = FakeSessionPool("batch")
+        pool.session_obj.batch = 4
+        handle = ModelHandle(InferenceEngine({}), pool, {})
+        self.assertIsNone(handle.static_batch)
+        handle.run(np.zeros((4, 3, 32, 32), dtype=np.float32))
+        self.assertEqual(pool.session_obj.calls, [4])
+
+    def test_missing_model_returns_none(self):
+        engine = InferenceEngine({})
+        self.assertIsNone(engine.load({"path": "models/does_not_exist.onnx"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
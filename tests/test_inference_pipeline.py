@@ -0,0 +1,178 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from core.frame_buffer import FrameRingBuffer
+from core.inference_pipeline import InferenceEvent, InferencePipeline, ResultBus
+from core.motion_gate import MotionGate
+from core.plugin_manager import PluginManager
+from core.scheduler import InferenceScheduler
+from plugins.base_plugin import BasePlugin
+
+
+class MeanPlugin(BasePlugin):
+    def process(self, frame, camera_id=None):
+        return {"mean": float(frame.mean())}
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.lines = []
+
+    def log(self, plugin_name, result, camera_id=None):
+        self.lines.append((plugin_name, camera_id))
+
+
+class FakeCameraManager:
+    def __init__(self, cam_ids):
+        self.cameras = {cam_id: FrameRingBuffer(3) for cam_id in cam_ids}
+        self.torn = False  # Pretend the writer laps every slot while it is being read
+
+    def put(self, cam_id, value):
+        return self.cameras[cam_id].put(np.full((36, 64, 3), value, dtype=np.uint8))
+
+    def get_latest(self, cam_id, since_seq=-1, copy=False):
+        return self.cameras[cam_id].get_latest(since_seq, copy)
+
+    def describe_buffer(self, cam_id):
+        return {"name": cam_id}
+
+    def is_current(self, cam_id, seq):
+        return not self.torn and self.cameras[cam_id].is_current(seq)
+
+
+class FakeWorkerPool:
+    def __init__(self):
+        self.in_flight = set()
+        self.accept = True
+        self.submitted = []
+        self.finished = []
+
+    def submit(self, camera_id, descriptor, seq, plugin_names=None):
+        if not self.accept or camera_id in self.in_flight:
+            return False
+        self.submitted.append((camera_id, seq, plugin_names))
+        self.in_flight.add(camera_id)
+        return True
+
+    def poll_results(self):
+        finished, self.finished = self.finished, []
+        for camera_id, _, _ in finished:
+            self.in_flight.discard(camera_id)
+        return finished
+
+
+def make_plugin_manager():
+    manager = PluginManager()
+    manager.logger = RecordingLogger()
+    manager.scheduler = InferenceScheduler({"default_camera_fps": 1.0, "cpu_sample_s": 1e9})
+    manager.motion_gate = MotionGate({"enabled": False})
+    manager.plugins["mean"] = MeanPlugin()
+    manager.plugin_locks["mean"] = threading.Lock()
+    manager.plugin_status["mean"] = True
+    return manager
+
+
+class TestResultBus(unittest.TestCase):
+    def test_every_subscriber_gets_each_event(self):
+        bus = ResultBus()
+        alerts, overlay = bus.subscribe("alerts"), bus.subscribe("overlay")
+        self.assertIs(bus.subscribe("alerts"), alerts)
+        bus.publish(InferenceEvent("cam", 1, 0.0, {"mean": {}}))
+        self.assertEqual([e.seq for e in alerts.poll()], [1])
+        self.assertEqual([e.seq for e in overlay.poll()], [1])
+
+    def test_slow_subscriber_drops_oldest(self):
+        bus = ResultBus()
+        sub = bus.subscribe("slow", maxsize=2)
+        for seq in range(5):
+            bus.publish(InferenceEvent("cam", seq, 0.0, {}))
+        self.assertEqual([e.seq for e in sub.poll()], [3, 4])
+        self.assertEqual(sub.dropped, 3)
+
+    def test_unsubscribed_consumer_gets_nothing(self):
+        bus = ResultBus()
+        sub = bus.subscribe("gone")
+        bus.unsubscribe("gone")
+        bus.publish(InferenceEvent("cam", 1, 0.0, {}))
+        self.assertEqual(sub.poll(), [])
+
+
+class TestPipelineDispatch(unittest.TestCase):
+    def setUp(self):
+        self.cameras = FakeCameraManager(["cam1"])
+        self.plugins = make_plugin_manager()
+
+    def test_full_worker_queue_keeps_rate_budget(self):
+        pool = FakeWorkerPool()
+        pool.accept = False
+        pipeline = InferencePipeline(self.cameras, self.plugins, inference_pool=pool)
+        seq = self.cameras.put("cam1", 10)
+
+        pipeline.dispatch_once()
+        self.assertEqual(self.plugins.scheduler.last_run, {})
+        self.assertNotIn("cam1", pipeline.last_seq)
+
+        pool.accept = True
+        pipeline.dispatch_once()  # Same frame, next tick: still due
+        self.assertEqual(pool.submitted, [("cam1", seq, ["mean"])])
+        self.assertIn(("cam1", "mean"), self.plugins.scheduler.last_run)
+        self.assertEqual(pipeline.last_seq["cam1"], seq)
+
+    def test_worker_results_are_published(self):
+        pool = FakeWorkerPool()
+        pipeline = InferencePipeline(self.cameras, self.plugins, inference_pool=pool)
+        sub = pipeline.bus.subscribe("test")
+        seq = self.cameras.put("cam1", 10)
+        pipeline.dispatch_once()
+        pool.finished.append(("cam1", seq, {"mean": {"mean": 10.0}}))
+        pipeline.dispatch_once()
+        events = sub.poll()
+        self.assertEqual([(e.camera_id, e.seq) for e in events], [("cam1", seq)])
+        self.assertNotIn("cam1", pool.in_flight)
+        # Worker results are logged once, here, not by the worker that produced them
+        self.assertEqual(self.plugins.logger.lines, [("mean", "cam1")])
+
+    def test_run_batch_never_logs(self):
+        worker_side = PluginManager()
+        worker_side.plugins["mean"] = MeanPlugin()
+        worker_side.plugin_locks["mean"] = threading.Lock()
+        worker_side.plugin_status["mean"] = True
+        results = worker_side.run_batch([("cam1", np.zeros((4, 4, 3), dtype=np.uint8), None)])
+        self.assertEqual(list(results[0]), ["mean"])
+        self.assertIsNone(worker_side._logger)  # No LogManager (or log writer) in a worker
+
+    def test_thread_mode_runs_batch_and_publishes(self):
+        pipeline = InferencePipeline(self.cameras, self.plugins, workers=1)
+        sub = pipeline.bus.subscribe("test")
+        seq = self.cameras.put("cam1", 20)
+        try:
+            pipeline.dispatch_once()
+            deadline = time.time() + 3
+            events = []
+            while time.time() < deadline and not events:
+                events = sub.poll()
+                time.sleep(0.01)
+        finally:
+            pipeline.stop()
+        self.assertEqual(events[0].seq, seq)
+        self.assertAlmostEqual(events[0].results["mean"]["mean"], 20.0)
+        self.assertEqual(self.plugins.logger.lines, [("mean", "cam1")])
+
+    def test_torn_frame_is_retried_without_spending_budget(self):
+        pipeline = InferencePipeline(self.cameras, self.plugins, workers=1)
+        try:
+            self.cameras.put("cam1", 30)
+            self.cameras.torn = True
+            pipeline.dispatch_once()
+            self.assertEqual(len(self.plugins.batcher), 0)
+            self.assertEqual(self.plugins.scheduler.last_run, {})
+            self.assertNotIn("cam1", pipeline.last_seq)
+        finally:
+            pipeline.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from core.inference_pool import InferenceWorkerPool
+from core.shm_transport import SharedFrameRingBuffer
+
+
+class TestInferenceWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.plugin_dir = tempfile.mkdtemp()  # No plugins: workers reply with {}
+        self.buffer = SharedFrameRingBuffer(capacity=3)
+        self.pool = InferenceWorkerPool(workers=1, plugin_folder=self.plugin_dir)
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.stop()
+        self.buffer.close()
+        shutil.rmtree(self.plugin_dir, ignore_errors=True)
+
+    def _publish(self, value):
+        return self.buffer.put(np.full((8, 8, 3), value, dtype=np.uint8))
+
+    def _wait_for_results(self, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            results = self.pool.poll_results()
+            if results:
+                return results
+            time.sleep(0.05)
+        self.fail("No result from the inference pool")
+
+    def test_camera_resumes_after_worker_dies(self):
+        seq = self._publish(1)
+        self.assertTrue(self.pool.submit("cam1", self.buffer.describe(), seq))
+        self.assertFalse(self.pool.submit("cam1", self.buffer.describe(), seq))
+
+        dead = self.pool.processes[0]
+        dead.kill()
+        dead.join(timeout=5)
+        self.pool.poll_results()
+
+        self.assertNotIn("cam1", self.pool.in_flight)
+        self.assertEqual(self.pool.respawns, 1)
+        self.assertIsNot(self.pool.processes[0], dead)
+        self.assertTrue(self.pool.processes[0].is_alive())
+
+        seq = self._publish(2)
+        self.assertTrue(self.pool.submit("cam1", self.buffer.describe(), seq))
+        self.assertEqual(self._wait_for_results(), [("cam1", seq, {})])
+        self.assertNotIn("cam1", self.pool.in_flight)
+
+    def test_late_reply_of_written_off_job_is_ignored(self):
+        self.pool.outstanding[0]["cam1"] = 5
+        self.pool.in_flight.add("cam1")
+        self.pool.result_queue.put((0, "cam1", 4, {}))
+        time.sleep(0.2)
+
+        self.assertEqual(self.pool.poll_results(), [])
+        self.assertIn("cam1", self.pool.in_flight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core.log_manager import LogManager, dedup_key, get_log_manager
+
+
+class TestLogManagerConfigReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp.name, "logging_config.json")
+        self.write_config({"fire_detection": {"enabled": False}}, mtime_ns=1_000_000_000)
+        self.manager = LogManager(self.config_path, log_dir=os.path.join(self.tmp.name, "logs"), reload_check_s=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_config(self, config, mtime_ns, raw=None):
+        with open(self.config_path, 'w') as f:
+            f.write(raw if raw is not None else json.dumps(config))
+        os.utime(self.config_path, ns=(mtime_ns, mtime_ns))
+
+    def test_config_change_is_picked_up(self):
+        self.assertFalse(self.manager.reload_config())
+        self.write_config({"fire_detection": {"enabled": True}}, mtime_ns=2_000_000_000)
+        self.manager.log("fire_detection", None)  # Any log call checks the mtime
+        self.assertTrue(self.manager.get_plugin_config("fire_detection")["enabled"])
+
+    def test_broken_config_keeps_previous_snapshot(self):
+        before = self.manager.plugin_configs
+        self.write_config(None, mtime_ns=3_000_000_000, raw="{\"fire_detection\": ")
+        self.assertFalse(self.manager.reload_config())
+        self.assertIs(self.manager.plugin_configs, before)
+
+    def test_shared_instance(self):
+        self.assertIs(get_log_manager(), get_log_manager())
+
+
+class TestDistinctOnly(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config_path = os.path.join(self.tmp.name, "logging_config.json")
+        with open(config_path, 'w') as f:
+            json.dump({"fire_detection": {"enabled": True, "log_trigger_filter": "distinct_only",
+                                          "meta_fields": ["fire_detected"]}}, f)
+        self.manager = LogManager(config_path, log_dir=os.path.join(self.tmp.name, "logs"))
+        self.lines = []
+        self.manager.writer = type("Writer", (), {"write": lambda _, path, line: self.lines.append(line)})()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_timestamp_does_not_make_results_distinct(self):
+        self.assertEqual(dedup_key({"fire_detected": True, "timestamp_ms": 1}),
+                         dedup_key({"fire_detected": True, "timestamp_ms": 2}))
+        self.manager.log("fire_detection", {"fire_detected": True, "camera_id": "cam1", "timestamp_ms": 1})
+        self.manager.log("fire_detection", {"fire_detected": True, "camera_id": "cam1", "timestamp_ms": 2})
+        self.assertEqual(len(self.lines), 1)
+
+    def test_cameras_are_deduplicated_separately(self):
+        for camera_id in ("cam1", "cam2", "cam1", "cam2"):
+            self.manager.log("fire_detection", {"fire_detected": True, "camera_id": camera_id, "timestamp_ms": 1})
+        self.assertEqual(len(self.lines), 2)
+
+    def test_only_meta_fields_are_compared(self):
+        self.manager.log("fire_detection", {"fire_detected": True, "confidence": 0.81}, camera_id="cam1")
+        self.manager.log("fire_detection", {"fire_detected": True, "confidence": 0.93}, camera_id="cam1")
+        self.manager.log("fire_detection", {"fire_detected": False, "confidence": 0.93}, camera_id="cam1")
+        self.assertEqual(len(self.lines), 2)
+
+    def test_continuous_rate_limit_is_per_camera(self):
+        self.manager.plugin_configs["fire_detection"].update(
+            {"mode": "continuous", "frequency_ms": 60000, "log_trigger_filter": ""})
+        for camera_id in ("cam1", "cam2", "cam1", "cam2"):
+            self.manager.log("fire_detection", {"fire_detected": True}, camera_id=camera_id)
+        self.assertEqual(len(self.lines), 2)
+
+    def test_idle_camera_state_is_pruned(self):
+        self.manager.log("fire_detection", {"fire_detected": True}, camera_id="gone")
+        self.manager.last_seen[("fire_detection", "gone")] -= self.manager.state_ttl_ms + 1
+        self.manager.next_prune_ms = 0
+        self.manager.log("fire_detection", {"fire_detected": True}, camera_id="cam1")
+        self.assertNotIn(("fire_detection", "gone"), self.manager.last_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+import unittest
+
+from core.log_writer import AsyncLogWriter
+
+
+class TestAsyncLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.writer = AsyncLogWriter({"max_queue": 1000, "flush_lines": 50, "flush_interval_s": 0.05,
+                                      "idle_close_s": 60.0})
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.tmp.name, *parts)
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_lines_reach_their_files_in_order(self):
+        fire, face = self.path("fire", "day.log"), self.path("face", "day.log")
+        for i in range(120):
+            self.writer.write(fire if i % 2 else face, f"line {i}\n")
+        self.assertTrue(self.writer.flush())
+
+        self.assertEqual(self.read(fire), [f"line {i}" for i in range(1, 120, 2)])
+        self.assertEqual(self.read(face), [f"line {i}" for i in range(0, 120, 2)])
+        self.assertEqual(self.writer.get_stats()["open_files"], 2)
+
+    def test_time_threshold_flushes_without_explicit_flush(self):
+        path = self.path("intrusion", "day.log")
+        self.writer.write(path, "alone\n")
+        deadline = time.time() + 2
+        while time.time() < deadline and not (os.path.exists(path) and self.read(path)):
+            time.sleep(0.02)
+        self.assertEqual(self.read(path), ["alone"])
+
+    def test_overflow_drops_oldest(self):
+        writer = AsyncLogWriter({"max_queue": 5, "flush_lines": 10000, "flush_interval_s": 60.0,
+                                 "idle_close_s": 60.0})
+        try:
+            path = self.path("burst.log")
+            for i in range(12):
+                writer.write(path, f"{i}\n")
+            writer.flush(close_files=True)
+            lines = self.read(path)
+            self.assertEqual(lines[-1], "11")
+            self.assertEqual(writer.get_stats()["dropped"] + len(lines), 12)
+            self.assertGreater(writer.get_stats()["dropped"], 0)
+            self.assertEqual(writer.get_stats()["open_files"], 0)
+        finally:
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from core.motion_gate import MotionGate, polygon_mask
+
+
+class TestMotionGate(unittest.TestCase):
+    def setUp(self):
+        self.gate = MotionGate({
+            "hold_s": 2.0,
+            "cameras": {"cam_roi": {"roi": [[0, 0], [0.5, 0], [0.5, 1], [0, 1]]}},
+            "plugins": {"fire_detection": {"idle_fps": 0.1}}
+        })
+        self.static = np.full((360, 640, 3), 80, dtype=np.uint8)
+        self.plugins = ["face_recognition", "fire_detection"]
+
+    def moving(self, x):
+        frame = self.static.copy()
+        frame[100:200, x:x + 100] = 255
+        return frame
+
+    def test_static_scene_closes_gate_after_hold(self):
+        self.assertTrue(self.gate.update("cam", self.static, now=100.0))
+        self.assertTrue(self.gate.update("cam", self.static, now=101.0))
+        self.assertFalse(self.gate.update("cam", self.static, now=103.0))
+        self.assertTrue(self.gate.update("cam", self.moving(300), now=104.0))
+
+    def test_retried_frame_is_not_blended_twice(self):
+        self.gate.update("cam", self.static, now=100.0, seq=1)
+        moving = self.moving(300)
+        self.assertTrue(self.gate.update("cam", moving, now=103.0, seq=2))
+        background = self.gate.cameras["cam"].background.copy()
+        self.assertTrue(self.gate.update("cam", moving, now=103.5, seq=2))
+        np.testing.assert_array_equal(self.gate.cameras["cam"].background, background)
+        self.assertTrue(self.gate.update("cam", moving, now=104.0, seq=3))
+        self.assertFalse(np.array_equal(self.gate.cameras["cam"].background, background))
+
+    def test_idle_plugins_keep_low_rate(self):
+        self.gate.update("cam", self.static, now=100.0)
+        allowed = self.gate.filter_plugins("cam", self.plugins, self.static, now=105.0)
+        self.assertEqual(allowed, ["fire_detection"])
+        self.gate.mark_run("cam", allowed, now=105.0)
+        self.assertEqual(self.gate.filter_plugins("cam", self.plugins, self.static, now=110.0), [])
+        self.assertEqual(self.gate.filter_plugins("cam", self.plugins, self.static, now=115.0), ["fire_detection"])
+
+    def test_roi_ignores_motion_outside_mask(self):
+        self.gate.update("cam_roi", self.static, now=100.0)
+        self.assertFalse(self.gate.update("cam_roi", self.moving(500), now=103.0))
+        self.assertTrue(self.gate.update("cam_roi", self.moving(50), now=104.0))
+
+    def test_disabled_gate_passes_everything(self):
+        gate = MotionGate({"enabled": False})
+        self.assertEqual(gate.filter_plugins("cam", self.plugins, self.static), self.plugins)
+
+    def test_polygon_mask(self):
+        mask = polygon_mask([[0, 0], [0.5, 0], [0.5, 1], [0, 1]], 10, 4)
+        self.assertEqual(mask[:, :4].min(), 255)
+        self.assertEqual(mask[:, 6:].max(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+import numpy as np
+from core.plugin_manager import PluginManager, FrameBatcher
+from core.zones import ZoneMap
+from plugins.base_plugin import BasePlugin
+
+
+class LoopPlugin(BasePlugin):
+    def process(self, frame, camera_id=None):
+        return {"camera_id": camera_id, "mean": float(frame.mean())}
+
+
+class VectorPlugin(BasePlugin):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def process_batch(self, frames, camera_ids):
+        self.batch_sizes.append(len(frames))
+        means = np.stack(frames).reshape(len(frames), -1).mean(axis=1)
+        return [{"camera_id": cid, "mean": float(m)} for cid, m in zip(camera_ids, means)]
+
+
+class SlowPlugin(BasePlugin):
+    timeout = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+
+    def process(self, frame, camera_id=None):
+        self.unblock.wait(2)
+        return {"late": True}
+
+
+class NullLogger:
+    def log(self, plugin_name, result, camera_id=None):
+        pass
+
+
+class TestPluginBatching(unittest.TestCase):
+    def setUp(self):
+        self.manager = PluginManager()
+        self.manager.logger = NullLogger()
+        for name, plugin in (("loop", LoopPlugin()), ("vector", VectorPlugin())):
+            self.manager.plugins[name] = plugin
+            self.manager.plugin_locks[name] = threading.Lock()
+            self.manager.plugin_status[name] = True
+        self.frames = [np.full((4, 4, 3), v, dtype=np.uint8) for v in (10, 20, 30)]
+
+    def test_default_process_batch_loops_process(self):
+        results = LoopPlugin().process_batch(self.frames[:2], ["a", "b"])
+        self.assertEqual([r["camera_id"] for r in results], ["a", "b"])
+        self.assertEqual([r["mean"] for r in results], [10.0, 20.0])
+
+    def test_run_batch_makes_one_call_per_plugin(self):
+        jobs = [("a", self.frames[0], None), ("b", self.frames[1], ["vector"]), ("c", self.frames[2], ["loop"])]
+        results = self.manager.run_batch(jobs)
+        self.assertEqual(self.manager.plugins["vector"].batch_sizes, [2])
+        self.assertEqual(sorted(results[0]), ["loop", "vector"])
+        self.assertEqual(list(results[1]), ["vector"])
+        self.assertEqual(results[1]["vector"]["camera_id"], "b")
+        self.assertEqual(results[2]["loop"]["mean"], 30.0)
+
+    def test_zoned_plugin_gets_native_crop(self):
+        self.manager.zones = ZoneMap({"a": {"loop": [[0, 0], [0.25, 0], [0.25, 0.25], [0, 0.25]]}})
+        frame = np.full((1080, 1920, 3), 50, dtype=np.uint8)
+        results = self.manager.run_batch([self.manager.prepare_job("a", frame, ["loop", "vector"])])[0]
+        self.assertEqual(results["loop"]["zone"], "loop")
+        self.assertNotIn("zone", results["vector"])
+
+    def test_slow_plugin_misses_deadline_without_blocking_others(self):
+        slow = SlowPlugin()
+        self.manager.plugins["slow"] = slow
+        self.manager.plugin_locks["slow"] = threading.Lock()
+        self.manager.plugin_status["slow"] = True
+
+        results = self.manager.run_plugins(self.frames[0], "a")
+        self.assertNotIn("slow", results)
+        self.assertIn("loop", results)
+        self.assertEqual(self.manager.get_execution_stats()["slow"]["deadline_misses"], 1)
+
+        # Still hung past its deadline: the next frame skips it instead of queueing
+        time.sleep(0.15)
+        results = self.manager.run_plugins(self.frames[1], "a")
+        self.assertIn("vector", results)
+        self.assertEqual(self.manager.get_execution_stats()["slow"]["skipped_busy"], 1)
+        slow.unblock.set()
+
+    def test_recovered_plugin_runs_while_old_call_is_hung(self):
+        slow = SlowPlugin()
+        self.manager.plugins["slow"] = slow
+        self.manager.plugin_locks["slow"] = threading.Lock()
+        self.manager.plugin_status["slow"] = True
+        self.manager.run_plugins(self.frames[0], "a")
+        time.sleep(0.15)  # Old call is now hung past its deadline
+
+        fresh = LoopPlugin()
+        fresh.timeout = SlowPlugin.timeout
+        self.manager._create_plugin = lambda name: fresh
+        self.manager.recover_plugin("slow")
+        results = self.manager.run_plugins(self.frames[1], "a")
+        self.assertEqual(results["slow"]["mean"], 20.0)
+        self.assertEqual(self.manager.get_execution_stats()["slow"]["skipped_busy"], 0)
+
+        slow.unblock.set()
+        time.sleep(0.1)
+        self.assertEqual(self.manager.running_since, {})
+
+    def test_run_plugins_is_a_batch_of_one(self):
+        results = self.manager.run_plugins(self.frames[0], "a", only=["vector"])
+        self.assertEqual(results["vector"]["mean"], 10.0)
+
+
+class TestFrameBatcher(unittest.TestCase):
+    def test_flushes_on_window(self):
+        batcher = FrameBatcher(window_ms=50, max_size=8)
+        batcher.add("a", now=100.0)
+        batcher.add("b", now=100.02)
+        self.assertFalse(batcher.ready(now=100.03))
+        self.assertTrue(batcher.ready(now=100.06))
+        self.assertEqual(batcher.drain(), ["a", "b"])
+        self.assertFalse(batcher.ready())
+
+    def test_flushes_when_full(self):
+        batcher = FrameBatcher(window_ms=1000, max_size=2)
+        for item in "abc":
+            batcher.add(item, now=100.0)
+        self.assertTrue(batcher.ready(now=100.0))
+        self.assertEqual(batcher.drain(now=100.0), ["a", "b"])
+        self.assertEqual(len(batcher), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import threading
+import time
+import unittest
+
+from core.plugin_recovery import PluginRecoverySupervisor
+
+
+class FlakyManager:
+    """Fails the first rebuild, then succeeds."""
+
+    def __init__(self):
+        self.calls = []
+        self.recovered = threading.Event()
+
+    def recover_plugin(self, name):
+        self.calls.append(name)
+        if len(self.calls) == 1:
+            raise RuntimeError("model still locked")
+        self.recovered.set()
+
+
+class TestPluginRecoverySupervisor(unittest.TestCase):
+    def setUp(self):
+        self.manager = FlakyManager()
+        self.supervisor = PluginRecoverySupervisor(self.manager, base=0.01, cap=0.05)
+
+    def tearDown(self):
+        self.supervisor.stop()
+
+    def test_request_returns_immediately(self):
+        self.supervisor.base = 10.0
+        started = time.time()
+        self.supervisor.request("fire_detection")
+        self.assertLess(time.time() - started, 0.5)
+        self.assertTrue(self.supervisor.is_pending("fire_detection"))
+
+    def test_failed_rebuild_is_retried_then_cleared(self):
+        self.supervisor.request("fire_detection")
+        self.supervisor.request("fire_detection")  # Duplicate while pending is ignored
+        self.assertTrue(self.manager.recovered.wait(timeout=3))
+        time.sleep(0.05)
+        self.assertEqual(self.manager.calls, ["fire_detection", "fire_detection"])
+        self.assertFalse(self.supervisor.is_pending("fire_detection"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from core.frame_cache import FrameContext
+from core.plugin_manager import PluginManager
+from core.plugin_reloader import PluginHotReloader, reload_plugin_modules
+from plugins.base_plugin import BasePlugin
+
+
+def write(path, text, mtime_ns):
+    with open(path, 'w') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestReloadPluginModules(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.pkg_dir = os.path.join(self.root, "hotpkg")
+        os.makedirs(self.pkg_dir)
+        write(os.path.join(self.pkg_dir, "__init__.py"), "", 1)
+        write(os.path.join(self.pkg_dir, "helper.py"), "class Helper:\n    version = 1\n", 1)
+        write(os.path.join(self.pkg_dir, "store.py"), "class Store:\n    pass\n", 1)
+        write(os.path.join(self.pkg_dir, "plugin.py"),
+              "from hotpkg.helper import Helper\nfrom hotpkg.store import Store\n", 1)
+        sys.path.insert(0, self.root)
+        import hotpkg.plugin  # noqa: F401
+
+    def tearDown(self):
+        sys.path.remove(self.root)
+        for name in [n for n in sys.modules if n == "hotpkg" or n.startswith("hotpkg.")]:
+            del sys.modules[name]
+        shutil.rmtree(self.root)
+
+    def test_only_changed_modules_and_dependents_reload(self):
+        store_class = sys.modules["hotpkg.store"].Store
+        write(os.path.join(self.pkg_dir, "helper.py"), "class Helper:\n    version = 2\n", 2)
+
+        order = reload_plugin_modules("hotpkg", self.pkg_dir, [os.path.join(self.pkg_dir, "helper.py")])
+
+        self.assertEqual(order, ["hotpkg.helper", "hotpkg.plugin"])
+        self.assertEqual(sys.modules["hotpkg.plugin"].Helper.version, 2)
+        self.assertIs(sys.modules["hotpkg.plugin"].Store, store_class)
+
+    def test_model_only_change_reloads_nothing(self):
+        order = reload_plugin_modules("hotpkg", self.pkg_dir, [os.path.join(self.pkg_dir, "model.onnx")])
+        self.assertEqual(order, [])
+
+
+class FakeManager:
+    def __init__(self, plugin_folder):
+        self.plugin_folder = plugin_folder
+        self.plugins = {"demo": object()}
+        self.reloads = []
+
+    def reload_plugin(self, name, changed):
+        self.reloads.append((name, [os.path.basename(p) for p in changed]))
+
+
+class TestPluginHotReloader(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "demo", "__pycache__"))
+        self.source = os.path.join(self.root, "demo", "plugin.py")
+        write(self.source, "x = 1\n", 1)
+        write(os.path.join(self.root, "demo", "__pycache__", "plugin.pyc"), "", 1)
+        self.manager = FakeManager(self.root)
+        self.reloader = PluginHotReloader(self.manager, {"enabled": True})
+        self.reloader.track("demo")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_reload_waits_for_change_to_settle(self):
+        self.assertFalse(self.reloader.poll("demo"))
+        write(self.source, "x = 2\n", 2)
+        self.assertFalse(self.reloader.poll("demo"))  # First sighting: may still be mid-save
+        self.assertTrue(self.reloader.poll("demo"))
+        self.assertEqual(self.manager.reloads, [("demo", ["plugin.py"])])
+        self.assertFalse(self.reloader.poll("demo"))
+
+    def test_busy_plugin_is_retried_on_next_poll(self):
+        attempts = []
+
+        def busy(name, changed):
+            attempts.append(name)
+            if len(attempts) == 1:
+                raise TimeoutError("still busy")
+        self.manager.reload_plugin = busy
+        write(self.source, "x = 2\n", 2)
+        self.reloader.poll("demo")
+        self.assertFalse(self.reloader.poll("demo"))
+        self.assertTrue(self.reloader.poll("demo"))
+        self.assertEqual(len(attempts), 2)
+
+    def test_failed_reload_is_not_retried_until_next_edit(self):
+        def broken(name, changed):
+            raise SyntaxError("half-written plugin")
+        self.manager.reload_plugin = broken
+        write(self.source, "x = (\n", 2)
+        self.reloader.poll("demo")
+        self.assertFalse(self.reloader.poll("demo"))
+        self.assertFalse(self.reloader.poll("demo"))
+        self.assertEqual(self.reloader.snapshots["demo"][self.source], 2)
+
+
+class StatefulPlugin(BasePlugin):
+    """Counts frames in state a reload hands over; `gate` holds a call open."""
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+        self.state = {"frames": 0}
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def adopt(self, previous):
+        self.events.append("adopt")
+        self.state = previous.state
+
+    def process(self, frame, camera_id=None):
+        self.events.append(f"call:{id(self)}")
+        self.gate.wait(2)
+        self.state["frames"] += 1
+        return {"frames": self.state["frames"]}
+
+    def release(self):
+        self.events.append("release")
+
+
+class TestHotReloadHandover(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.manager = PluginManager()
+        self.old = StatefulPlugin(self.events)
+        self.new = StatefulPlugin(self.events)
+        self.manager._install_plugin("stateful", self.old)
+        self.manager._create_plugin = lambda name: self.new
+        self.lock = self.manager.plugin_locks["stateful"]
+        self.contexts = [FrameContext(None, "cam1")]
+
+    def test_handover_waits_for_running_call_and_keeps_lock(self):
+        self.old.gate.clear()
+        call = threading.Thread(target=self.manager._call_plugin,
+                                args=("stateful", self.old, self.lock, self.contexts))
+        call.start()
+        while not self.events:
+            time.sleep(0.01)
+        reload = threading.Thread(target=self.manager.reload_plugin, args=("stateful",))
+        reload.start()
+        time.sleep(0.1)
+        self.assertIs(self.manager.plugins["stateful"], self.old)  # Still waiting for the call
+        self.old.gate.set()
+        call.join(2)
+        reload.join(2)
+
+        self.assertEqual(self.events, [f"call:{id(self.old)}", "adopt", "release"])
+        self.assertIs(self.manager.plugins["stateful"], self.new)
+        self.assertIs(self.manager.plugin_locks["stateful"], self.lock)
+        self.assertIs(self.new.state, self.old.state)
+        self.assertEqual(self.new.state["frames"], 1)
+
+    def test_call_queued_on_old_instance_runs_on_new_one(self):
+        self.manager.reload_plugin("stateful")
+        results = self.manager._call_plugin("stateful", self.old, self.lock, self.contexts)
+        self.assertEqual(self.events[-1], f"call:{id(self.new)}")
+        self.assertEqual(results, [{"frames": 1}])
+
+    def test_busy_old_instance_defers_reload(self):
+        self.manager.scheduler.settings["plugin_timeouts"] = {"stateful": 0.05}
+        with self.lock:
+            with self.assertRaises(TimeoutError):
+                self.manager.reload_plugin("stateful")
+        self.assertIs(self.manager.plugins["stateful"], self.old)
+        self.assertNotIn("release", self.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
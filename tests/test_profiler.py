@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from core.profiler import LatencyHistogram, Profiler
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        samples = sorted(rng.randint(200, 2_000_000) for _ in range(5000))
+        histogram = LatencyHistogram(precision_bits=5)
+        for value in samples:
+            histogram.record(value)
+
+        for pct in (50, 90, 99):
+            exact = samples[int(round(len(samples) * pct / 100.0)) - 1]
+            self.assertAlmostEqual(histogram.percentile(pct), exact, delta=exact * 0.04)
+        self.assertEqual(histogram.max_us, samples[-1])
+        self.assertEqual(histogram.min_us, samples[0])
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in (3, 3, 7):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 3)
+        self.assertEqual(histogram.percentile(100), 7)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(1000)
+        b.record(5000)
+        a.merge(b)
+        self.assertEqual(a.total, 2)
+        self.assertEqual(a.max_us, 5000)
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler({"enabled": True, "dump_path": ""})
+
+    def test_rows_keyed_by_stage_plugin_camera(self):
+        self.profiler.record("process", 0.020, plugin="fire_detection", camera="cam1")
+        self.profiler.record("process", 0.030, plugin="fire_detection", camera="cam2")
+        self.profiler.record("process", 0.001, plugin="intrusion_detection", camera="cam1")
+        with self.profiler.measure("resize", camera="cam1"):
+            pass
+
+        rows = self.profiler.snapshot(stage="process")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["camera"], "cam2")  # Most total time first
+        by_plugin = self.profiler.totals_by("plugin", stage="process")
+        self.assertEqual(by_plugin["fire_detection"]["count"], 2)
+        self.assertEqual(len(self.profiler.snapshot(camera="cam1")), 3)
+
+    def test_disabled_records_nothing(self):
+        profiler = Profiler({"enabled": False})
+        with profiler.measure("render", camera="cam1"):
+            pass
+        self.assertEqual(profiler.snapshot(), [])
+
+    def test_dump_json(self):
+        self.profiler.record("log", 0.002, plugin="fire_detection", camera="cam1")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.profiler.dump(os.path.join(tmp, "profile.json"))
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(report["rows"][0]["stage"], "log")
+        self.assertEqual(report["rows"][0]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from core.scheduler import InferenceScheduler, has_detection
+
+
+class TestInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = InferenceScheduler({
+            "default_camera_fps": 1.0,
+            "cameras": {"cam_fast": 4.0},
+            "plugins": {"fire_detection": 0.5},
+            "cpu_sample_s": 1e9  # Keep the CPU probe out of these tests
+        })
+        self.plugins = ["face_recognition", "fire_detection"]
+
+    def test_camera_rate_throttles_repeat_calls(self):
+        self.assertEqual(self.scheduler.due_plugins("cam_a", self.plugins, now=100.0), self.plugins)
+        self.assertEqual(self.scheduler.due_plugins("cam_a", self.plugins, now=100.5), [])
+        self.assertEqual(self.scheduler.due_plugins("cam_a", self.plugins, now=101.0), ["face_recognition"])
+        self.assertEqual(self.scheduler.due_plugins("cam_a", self.plugins, now=102.0), self.plugins)
+
+    def test_unmarked_peek_does_not_spend_rate(self):
+        self.assertEqual(self.scheduler.due_plugins("cam_a", ["face_recognition"], now=100.0, mark=False),
+                         ["face_recognition"])
+        self.assertEqual(self.scheduler.due_plugins("cam_a", ["face_recognition"], now=100.1), ["face_recognition"])
+        self.scheduler.mark_run("cam_a", ["face_recognition"], now=100.2)
+        self.assertEqual(self.scheduler.due_plugins("cam_a", ["face_recognition"], now=100.5), [])
+
+    def test_per_camera_override(self):
+        self.scheduler.due_plugins("cam_fast", ["face_recognition"], now=100.0)
+        self.assertEqual(self.scheduler.due_plugins("cam_fast", ["face_recognition"], now=100.25), ["face_recognition"])
+
+    def test_detection_boosts_camera(self):
+        self.scheduler.observe_results("cam_a", {"face_recognition": {"face_recognized": True}}, now=100.0)
+        self.assertEqual(self.scheduler.target_fps("cam_a", "face_recognition", now=101.0), 3.0)
+        self.assertEqual(self.scheduler.target_fps("cam_a", "face_recognition", now=200.0), 1.0)
+
+    def test_load_scale_reduces_rates(self):
+        self.scheduler.load_scale = 0.5
+        self.assertEqual(self.scheduler.target_fps("cam_a", "face_recognition", now=100.0), 0.5)
+
+    def test_has_detection(self):
+        self.assertTrue(has_detection({"fire_detected": True}))
+        self.assertFalse(has_detection({"fire_detected": False, "confidence": 0.9}))
+        self.assertFalse(has_detection(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from core.inference_pool import run_job
+from core.shm_transport import SharedFrameRingBuffer, SharedFrameView
+
+
+class FakePluginManager:
+    """prepare_job/run_batch stand-in; `during_prepare` runs while the frame is being read."""
+
+    def __init__(self):
+        self.during_prepare = None
+        self.batches = []
+
+    def prepare_job(self, camera_id, frame, plugin_names=None):
+        prepared = frame[::2, ::2].copy()
+        if self.during_prepare:
+            self.during_prepare()
+        return (camera_id, prepared, plugin_names)
+
+    def run_batch(self, jobs):
+        self.batches.append(jobs)
+        return [{"fake": {"value": int(job[1][0, 0, 0])}} for job in jobs]
+
+
+class TestSharedFrameTransport(unittest.TestCase):
+    def setUp(self):
+        self.buffer = SharedFrameRingBuffer(capacity=3)
+        self.views = {}
+
+    def tearDown(self):
+        for view in self.views.values():
+            view.close()
+        self.buffer.close()
+
+    def _frame(self, value):
+        return np.full((8, 8, 3), value, dtype=np.uint8)
+
+    def test_view_attaches_and_reads_zero_copy(self):
+        self.assertIsNone(self.buffer.describe())
+        seq = self.buffer.put(self._frame(5))
+        view = self.views["cam"] = SharedFrameView(self.buffer.describe())
+        self.assertEqual(int(view.frame_at(seq)[0, 0, 0]), 5)
+        self.buffer.put(self._frame(6))
+        self.assertEqual(int(view.frame_at(seq + 1)[0, 0, 0]), 6)  # Same slab, no re-attach
+
+    def test_slot_reuse_rejects_stale_seq(self):
+        seq = self.buffer.put(self._frame(1))
+        view = self.views["cam"] = SharedFrameView(self.buffer.describe())
+        for i in range(self.buffer.capacity):
+            self.buffer.put(self._frame(2 + i))
+        self.assertIsNone(view.frame_at(seq))
+        self.assertFalse(view.is_current(seq))
+        self.assertTrue(view.is_current(seq + self.buffer.capacity))
+
+    def test_resolution_change_publishes_new_slab(self):
+        self.buffer.put(self._frame(1))
+        first = self.buffer.describe()["name"]
+        self.buffer.put(np.zeros((4, 4, 3), dtype=np.uint8))
+        self.assertNotEqual(self.buffer.describe()["name"], first)
+        self.assertEqual(self.buffer.describe()["shape"], (4, 4, 3))
+
+    def test_worker_job_runs_plugins_on_current_frame(self):
+        manager = FakePluginManager()
+        seq = self.buffer.put(self._frame(9))
+        reply = run_job(manager, self.views, ("cam", self.buffer.describe(), seq, ["fake"]))
+        self.assertEqual(reply, ("cam", seq, {"fake": {"value": 9}}))
+        self.assertEqual(manager.batches[0][0][2], ["fake"])
+
+    def test_worker_job_drops_frame_lapped_while_reading(self):
+        manager = FakePluginManager()
+        seq = self.buffer.put(self._frame(1))
+        descriptor = self.buffer.describe()
+
+        def lap():
+            for i in range(self.buffer.capacity):
+                self.buffer.put(self._frame(50 + i))
+
+        manager.during_prepare = lap
+        self.assertEqual(run_job(manager, self.views, ("cam", descriptor, seq, None)), ("cam", seq, None))
+        self.assertEqual(manager.batches, [])
+        # Already overwritten before the worker got to it
+        self.assertEqual(run_job(manager, self.views, ("cam", descriptor, seq, None)), ("cam", seq, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from core.zones import ZoneMap, Zone
+
+
+class TestZones(unittest.TestCase):
+    def setUp(self):
+        self.zones = ZoneMap({
+            "cam_a": {
+                "intrusion_detection": {"name": "gate", "polygon": [[0.5, 0.5], [1, 0.5], [1, 1], [0.5, 1]]},
+                "*": [[0, 0], [0.25, 0], [0.25, 0.25], [0, 0.25]]
+            }
+        })
+        self.frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    def test_lookup_with_wildcard(self):
+        self.assertEqual(self.zones.get("cam_a", "intrusion_detection").name, "gate")
+        self.assertEqual(self.zones.get("cam_a", "fire_detection").name, "*")
+        self.assertIsNone(self.zones.get("cam_b", "fire_detection"))
+
+    def test_crop_keeps_native_resolution(self):
+        crops = self.zones.crops("cam_a", self.frame, ["fire_detection", "helmet_detection"], (640, 360))
+        self.assertIs(crops["fire_detection"], crops["helmet_detection"])
+        self.assertEqual(crops["fire_detection"].frame.shape, (271, 481, 3))
+
+    def test_large_crop_is_shrunk_and_mapped_back(self):
+        crop = self.zones.crops("cam_a", self.frame, ["intrusion_detection"], (640, 360))["intrusion_detection"]
+        self.assertLessEqual(crop.frame.shape[1], 640)
+        self.assertLessEqual(crop.frame.shape[0], 360)
+        # Crop origin maps to the zone's corner in prepared-frame (640x360) coordinates
+        x0, y0, _, _ = crop.zone.bbox(1920, 1080)
+        x, y = crop.map_point(0, 0)
+        self.assertAlmostEqual(x, x0 * 640 / 1920, places=3)
+        self.assertAlmostEqual(y, y0 * 360 / 1080, places=3)
+        mapped = crop.map_result({"boxes": [[0, 0, crop.frame.shape[1], crop.frame.shape[0], 0.9]]})
+        self.assertEqual(mapped["zone"], "gate")
+        self.assertAlmostEqual(mapped["boxes"][0][2], 640, delta=1)
+        self.assertEqual(mapped["boxes"][0][4], 0.9)
+
+    def test_pixels_outside_polygon_are_blanked(self):
+        frame = np.full((100, 100, 3), 200, dtype=np.uint8)
+        zones = ZoneMap({"cam": {"*": [[0, 0], [1, 0], [0, 1]]}})
+        crop = zones.crops("cam", frame, ["x"], (100, 100))["x"]
+        self.assertEqual(crop.frame[5, 5, 0], 200)
+        self.assertEqual(crop.frame[95, 95, 0], 0)
+
+    def test_bbox_clipped(self):
+        self.assertEqual(Zone("z", [[-0.5, 0], [2, 1]]).bbox(100, 50), (0, 0, 100, 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,8 +5,9 @@ from PyQt5.QtWidgets import (
     QDialog, QTextEdit, QScrollArea
 )
 from PyQt5.QtCore import Qt, QTimer
-from core.log_manager import LogManager
+from core.log_manager import get_log_manager
 from core.watchdog import get_plugin_health
+from core.profiler import get_profiler
 from datetime import datetime
 
 
@@ -82,15 +83,92 @@ class PluginStatusWindow(QDialog):
                 label.setStyleSheet(f"color: {color}; font-weight: bold;")
 
 
+class ProfilerWindow(QDialog):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Latency Profile")
+        self.resize(820, 500)
+        self.profiler = get_profiler()
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.table_output = QTextEdit()
+        self.table_output.setReadOnly(True)
+        self.table_output.setStyleSheet("font-family: monospace;")
+        layout.addWidget(self.table_output)
+
+        buttons = QHBoxLayout()
+        self.dump_btn = QPushButton("Dump JSON")
+        self.reset_btn = QPushButton("Reset")
+        self.dump_btn.clicked.connect(self.dump_profile)
+        self.reset_btn.clicked.connect(self.reset_profile)
+        buttons.addWidget(self.dump_btn)
+        buttons.addWidget(self.reset_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh_profile)
+        self.timer.start(2000)
+
+        self.refresh_profile()
+
+    def refresh_profile(self):
+        rows = self.profiler.snapshot()
+        if not rows:
+            self.table_output.setText("No samples recorded yet.")
+            return
+        lines = [f"{'stage':<8} {'plugin':<22} {'camera':<12} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for row in rows[:60]:
+            lines.append(
+                f"{row['stage']:<8} {row['plugin'] or '-':<22} {row['camera'] or '-':<12} {row['count']:>7} "
+                f"{row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['max_ms']:>8.2f}"
+            )
+        self.table_output.setText("\n".join(lines))
+
+    def dump_profile(self):
+        path = self.profiler.dump()
+        if path:
+            self.table_output.append(f"\nSaved to {path}")
+
+    def reset_profile(self):
+        self.profiler.reset()
+        self.refresh_profile()
+
+
 class Dashboard(QWidget):
     def __init__(self, alerts_page=None):
         super().__init__()
         self.alerts_page = alerts_page
-        self.log_manager = LogManager()
+        self.log_manager = get_log_manager()
         self.plugin_status_labels = {}
         self.last_heartbeat_time = None
         self.init_ui()
 
+    def set_camera_manager(self, camera_manager):
+        self.camera_manager = camera_manager
+        self.camera_metrics_timer = QTimer(self)
+        self.camera_metrics_timer.timeout.connect(self.update_camera_metrics)
+        self.camera_metrics_timer.start(2000)
+
+    def update_camera_metrics(self):
+        try:
+            metrics = self.camera_manager.get_metrics()
+        except Exception:
+            self.camera_metrics_label.setText("Camera metrics unavailable")
+            return
+        lines = []
+        for cam_id, m in metrics.items():
+            age = f"{m['frame_age_s']:.1f}s" if m["frame_age_s"] is not None else "--"
+            p50 = m["read_p50_ms"] if m["read_p50_ms"] is not None else "--"
+            p99 = m["read_p99_ms"] if m["read_p99_ms"] is not None else "--"
+            lines.append(
+                f"{cam_id}: {m['status']} | {m['decode_fps']:.1f} fps | read p50 {p50} ms / p99 {p99} ms | "
+                f"failed {m['failed_reads']} | {m['bytes_per_frame'] // 1024} KB/frame | age {age}"
+            )
+        self.camera_metrics_label.setText("\n".join(lines) or "No cameras attached")
+
     def set_monitor(self, monitor):
         self.monitor = monitor
         self.monitor_timer = QTimer(self)
@@ -139,6 +217,14 @@ class Dashboard(QWidget):
         cameras_group.setLayout(cameras_layout)
         main_layout.addWidget(cameras_group)
 
+        # Camera Capture Metrics
+        metrics_group = QGroupBox("Camera Capture Metrics")
+        metrics_layout = QVBoxLayout()
+        self.camera_metrics_label = QLabel("No cameras attached")
+        metrics_layout.addWidget(self.camera_metrics_label)
+        metrics_group.setLayout(metrics_layout)
+        main_layout.addWidget(metrics_group)
+
         # Alerts Overview
         alerts_group = QGroupBox("Recent Alerts")
         alerts_layout = QVBoxLayout()
@@ -155,12 +241,14 @@ class Dashboard(QWidget):
         self.settings_btn = QPushButton("System Settings")
         self.plugin_logs_btn = QPushButton("View Plugin Logs")
         self.plugin_status_btn = QPushButton("Plugin Health")
+        self.profiler_btn = QPushButton("Latency Profile")
 
         self.plugin_logs_btn.clicked.connect(self.open_plugin_logs_window)
         self.plugin_status_btn.clicked.connect(self.open_plugin_status_window)
+        self.profiler_btn.clicked.connect(self.open_profiler_window)
 
         for btn in [self.liveview_btn, self.reports_btn, self.settings_btn,
-                    self.plugin_logs_btn, self.plugin_status_btn]:
+                    self.plugin_logs_btn, self.plugin_status_btn, self.profiler_btn]:
             actions_layout.addWidget(btn)
         actions_group.setLayout(actions_layout)
         main_layout.addWidget(actions_group)
@@ -175,6 +263,10 @@ class Dashboard(QWidget):
         self.status_window = PluginStatusWindow()
         self.status_window.show()
 
+    def open_profiler_window(self):
+        self.profiler_window = ProfilerWindow()
+        self.profiler_window.show()
+
     def update_plugin_status_label(self, plugin_name, is_enabled):
         label = self.plugin_status_labels.get(plugin_name)
         if label:
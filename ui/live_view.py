@@ -12,6 +12,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QMetaObject
 from PyQt5.QtGui import QImage, QPixmap
 from core.crash_logger import log_exception
+from core.profiler import get_profiler
 from core.watchdog import get_plugin_health
 from datetime import datetime, timedelta
 
@@ -19,40 +20,40 @@ from datetime import datetime, timedelta
 class FrameProcessor(QThread):
     frame_processed = pyqtSignal(str, np.ndarray)
 
-    def __init__(self, plugin_manager):
+    def __init__(self, result_cache):
         super().__init__()
-        self.plugin_manager = plugin_manager
+        self.result_cache = result_cache  # LiveView.latest_results, fed by the inference pipeline
         self.running = True
         self.queue = Queue(maxsize=1)
-        self.last_valid_results = {}  # {cam_id: {plugin_name: (result, timestamp)}}
+        self.last_seqs = {}  # {cam_id: last processed frame seq}
+        self.profiler = get_profiler()
 
     def run(self):
         while self.running:
             try:
                 try:
-                    cam_id, frame = self.queue.get(timeout=0.5)
+                    cam_id, seq, frame = self.queue.get(timeout=0.5)
                 except queue.Empty:
                     time.sleep(0.1)
                     continue
 
-                now = time.time()
-                results = self.plugin_manager.apply_plugins(frame, cam_id)
-
-                if cam_id not in self.last_valid_results:
-                    self.last_valid_results[cam_id] = {}
-
-                for plugin_name in self.plugin_manager.plugins:
-                    result = results.get(plugin_name)
-                    if result is not None:
-                        self.last_valid_results[cam_id][plugin_name] = (result, now)
+                if seq <= self.last_seqs.get(cam_id, -1):
+                    continue  # Already rendered this frame
+                self.last_seqs[cam_id] = seq
 
-                display_results = {}
-                for plugin_name, (cached_result, ts) in self.last_valid_results[cam_id].items():
-                    if now - ts <= 5:
-                        display_results[plugin_name] = cached_result
-
-                processed = self._apply_results(frame.copy(), display_results)
-                self.frame_processed.emit(cam_id, processed)
+                # Overlay-only: inference already ran once in the shared pipeline
+                now = time.time()
+                cached = self.result_cache.get(cam_id, {}).copy()
+                display_results = {
+                    plugin_name: cached_result
+                    for plugin_name, (cached_result, ts) in cached.items()
+                    if now - ts <= 5
+                }
+
+                with self.profiler.measure("render", camera=cam_id):
+                    processed = self._apply_results(frame, display_results)
+                with self.profiler.measure("emit", camera=cam_id):
+                    self.frame_processed.emit(cam_id, processed)
 
             except Exception as e:
                 log_exception(e, context="FrameProcessor run loop")
@@ -77,7 +78,8 @@ class FrameProcessor(QThread):
         if "face_recognized" in data:
             name = data.get("person_name", "Unknown")
             conf = round(data.get("confidence", 0) * 100)
-            return f"{name} ({conf}%)"
+            others = data.get("face_count", 1) - 1
+            return f"{name} ({conf}%)" + (f" +{others}" if others > 0 else "")
         if "helmet_detected" in data:
             return "✅" if data["helmet_detected"] else "❌"
         if "fire_detected" in data:
@@ -103,7 +105,10 @@ class LiveView(QWidget):
         self.grid_size = (2, 2)
 
         self.frame_processors = []
+        self.result_subscription = None
+        self.latest_results = {}  # {cam_id: {plugin_name: (result, timestamp)}}
         self.last_frame_times = {}
+        self.last_frame_seqs = {}  # {cam_id: seq of the last frame handed to display}
 
         self.init_ui()
         self.setLayout(self.main_layout)
@@ -189,28 +194,43 @@ class LiveView(QWidget):
                 loading_bar.hide()
             self.grid_layout.addWidget(container, row, col)
 
+    def drain_results(self):
+        """Pull pipeline results into the overlay cache (runs on the Qt thread)."""
+        if not self.result_subscription:
+            return
+        now = time.time()
+        for event in self.result_subscription.poll():
+            cam_results = self.latest_results.setdefault(event.camera_id, {})
+            for plugin_name, result in event.results.items():
+                if result is not None:
+                    cam_results[plugin_name] = (result, now)
+
     def update_frames(self):
+        self.drain_results()
         if not self.camera_manager or not self.camera_labels:
             return
         current_time = time.time()
         for cam_id, label in self.camera_labels.items():
             if current_time - self.last_frame_times.get(cam_id, 0) < 0.1:
                 continue
-            frame = self.camera_manager.get_frame(cam_id)
-            if frame is None:
-                self.show_no_signal(label, cam_id)
-                continue
-            if self.plugin_manager and self.frame_processors:
-                self.process_frame_async(cam_id, frame)
+            # A private copy: the frame outlives this tick (queued, drawn on) and the ring slot may be reused
+            packet = self.camera_manager.get_latest(cam_id, self.last_frame_seqs.get(cam_id, -1), copy=True)
+            if packet is None:
+                if self.camera_manager.get_latest(cam_id) is None:
+                    self.show_no_signal(label, cam_id)
+                continue  # Otherwise no new frame since the last tick
+            self.last_frame_seqs[cam_id] = packet.seq
+            if self.frame_processors:
+                self.process_frame_async(cam_id, packet.frame, packet.seq)
             else:
-                self.display_frame(cam_id, frame)
+                self.display_frame(cam_id, packet.frame)
             self.last_frame_times[cam_id] = current_time
 
-    def process_frame_async(self, cam_id, frame):
+    def process_frame_async(self, cam_id, frame, seq=-1):
         queued = False
         for processor in self.frame_processors:
             if not processor.queue.full():
-                processor.queue.put((cam_id, frame.copy()))
+                processor.queue.put((cam_id, seq, frame))
                 queued = True
                 break
         if not queued:
@@ -222,6 +242,7 @@ class LiveView(QWidget):
         label = self.camera_labels[cam_id]
 
         def safe_update():
+            started = time.perf_counter()
             try:
                 frame_rgb = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
                 h, w, ch = frame_rgb.shape
@@ -232,6 +253,7 @@ class LiveView(QWidget):
                 label.setPixmap(pixmap)
                 if cam_id in self.loading_bars:
                     self.loading_bars[cam_id].hide()
+                get_profiler().record("display", time.perf_counter() - started, camera=cam_id)
             except Exception as e:
                 self.show_no_signal(label, cam_id)
 
@@ -276,12 +298,16 @@ class LiveView(QWidget):
 
     def set_plugin_manager(self, manager):
         self.plugin_manager = manager
+
+    def set_result_bus(self, bus):
+        """Subscribe to the inference pipeline; overlays render its results instead of re-running plugins."""
+        self.result_subscription = bus.subscribe("live_view")
         self.init_threads()
 
     def init_threads(self):
-        if self.plugin_manager and not self.frame_processors:
+        if self.result_subscription and not self.frame_processors:
             for _ in range(min(4, QThread.idealThreadCount())):
-                processor = FrameProcessor(self.plugin_manager)
+                processor = FrameProcessor(self.latest_results)
                 processor.frame_processed.connect(self.update_processed_frame)
                 self.frame_processors.append(processor)
                 processor.start()
@@ -94,6 +94,10 @@ class PluginLoggingDialog(QDialog):
 
             meta_edit = QLineEdit(",".join(config.get("meta_fields", [])))
 
+            format_combo = QComboBox()
+            format_combo.addItems(["text", "jsonl", "both"])
+            format_combo.setCurrentText(config.get("log_format", "text"))
+
             group_layout.addRow("Enabled", enabled_checkbox)
             group_layout.addRow("Mode", mode_combo)
             group_layout.addRow("Frequency (ms)", freq_spin)
@@ -103,6 +107,7 @@ class PluginLoggingDialog(QDialog):
             group_layout.addRow("Log Level", level_combo)
             group_layout.addRow("Trigger Filter", trigger_combo)
             group_layout.addRow("Meta Fields (comma-separated)", meta_edit)
+            group_layout.addRow("Log Format", format_combo)
 
             group_box.setLayout(group_layout)
             form_layout.addWidget(group_box)
@@ -116,7 +121,8 @@ class PluginLoggingDialog(QDialog):
                 "retention_days": retention_spin,
                 "log_level": level_combo,
                 "log_trigger_filter": trigger_combo,
-                "meta_fields": meta_edit
+                "meta_fields": meta_edit,
+                "log_format": format_combo
             }
 
         scroll_content.setLayout(form_layout)
@@ -150,17 +156,21 @@ class PluginLoggingDialog(QDialog):
                 "log_trigger_filter": widgets["log_trigger_filter"].currentText(),
                 "meta_fields": [
                     x.strip() for x in widgets["meta_fields"].text().split(",") if x.strip()
-                ]
+                ],
+                "log_format": widgets["log_format"].currentText()
             }
 
         try:
-            with open(self.config_path, 'w') as f:
+            # Write-then-rename so the running LogManager never reads a half-written file
+            tmp_path = self.config_path + ".tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(self.plugin_settings, f, indent=4)
-                try:
-                    from core.log_manager import LogManager
-                    LogManager()._load_config()
-                except Exception as e:
-                    print("[PluginLoggingUI] Could not reload LogManager:", e)
+            os.replace(tmp_path, self.config_path)
+            try:
+                from core.log_manager import get_log_manager
+                get_log_manager().reload_config(force=True)
+            except Exception as e:
+                print("[PluginLoggingUI] Could not reload LogManager:", e)
 
             QMessageBox.information(self, "Saved", "✅ Logging settings saved successfully.")
         except Exception as e:
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (
     QLineEdit, QCheckBox, QTextEdit
 )
 from PyQt5.QtCore import Qt, QTimer
-from core.log_manager import LogManager
+from core.log_manager import get_log_manager
 
 
 class PluginLogWindow(QDialog):
@@ -12,7 +12,7 @@ class PluginLogWindow(QDialog):
         super().__init__()
         self.setWindowTitle("Plugin Logs Viewer")
         self.setMinimumSize(700, 500)
-        self.log_manager = LogManager()
+        self.log_manager = get_log_manager()
         self.init_ui()
         self.load_logs()
 